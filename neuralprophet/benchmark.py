@@ -309,9 +309,7 @@ class Experiment(ABC):
             metric_train_list = []
             metric_test_list = []
 
-            fcst_train = fcst_train.fillna(value=np.nan)
             df_train = df_train.fillna(value=np.nan)
-            fcst_test = fcst_test.fillna(value=np.nan)
             df_test = df_test.fillna(value=np.nan)
 
             for x in range(1, n_yhats_train + 1):
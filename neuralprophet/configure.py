@@ -20,6 +20,11 @@ def from_kwargs(cls, kwargs):
 class Model:
     num_hidden_layers: int
     d_hidden: int
+    ar_rank: int
+
+    def __post_init__(self):
+        if self.ar_rank is not None and self.ar_rank < 1:
+            raise ValueError("ar_rank must be >= 1")
 
 
 @dataclass
@@ -238,8 +243,14 @@ class AllSeason:
 class AR:
     n_lags: int
     ar_sparsity: float
+    ar_lags: list = None
 
     def __post_init__(self):
+        if self.ar_lags is not None:
+            self.ar_lags = utils.lags_to_list(self.ar_lags)
+            if self.n_lags not in [0, max(self.ar_lags)]:
+                log.warning("n_lags is set to {}, the largest of ar_lags.".format(max(self.ar_lags)))
+            self.n_lags = max(self.ar_lags)
         if self.ar_sparsity is not None and self.ar_sparsity < 1:
             assert self.ar_sparsity > 0
             self.reg_lambda = 0.001 * (1.0 / (1e-6 + self.ar_sparsity) - 1.00)
@@ -265,11 +276,31 @@ class Covar:
     reg_lambda: float
     as_scalar: bool
     normalize: (bool, str)
+    lags: list = None
 
     def __post_init__(self):
         if self.reg_lambda is not None:
             if self.reg_lambda < 0:
                 raise ValueError("regularization must be >= 0")
+        if self.lags is not None:
+            if self.as_scalar:
+                raise ValueError("Lags can not be set for a covariate with only_last_value.")
+            self.lags = utils.lags_to_list(self.lags)
+
+    def window_lags(self, n_lags):
+        """Lags of the covariate used as model inputs.
+
+        Args:
+            n_lags (int): number of lags of the model
+
+        Returns:
+            lags (list of int): ascending
+        """
+        if self.as_scalar:
+            return [1]
+        if self.lags is not None:
+            return self.lags
+        return list(range(1, n_lags + 1))
 
 
 @dataclass
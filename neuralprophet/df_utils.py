@@ -1,10 +1,14 @@
 from dataclasses import dataclass
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import pandas as pd
 import numpy as np
 import logging
 import math
 
+from neuralprophet.streaming_stats import StreamingStats
+
 log = logging.getLogger("NP.df_utils")
 
 
@@ -22,6 +26,31 @@ def create_df_list(df):
     return df_list
 
 
+def map_df_list(func, *df_lists, num_workers=1):
+    """Applies func to the dataframes of each series, sequentially or in a pool of processes.
+
+    Processes run the Python code of func in parallel, but pickle the items and results.
+    The results keep the order of the series, independent of the number of workers.
+
+    Args:
+        func (callable): function of one item of each list, e.g. of the dataframe and the events of a series.
+            With workers, func must be picklable: a module-level function or a functools.partial of one.
+        *df_lists (list): lists of equal length
+        num_workers (int): number of worker processes, 1 applies func sequentially
+
+    Returns:
+        list of the results of func
+    """
+    n_items = len(df_lists[0])
+    if num_workers > 1 and n_items > 1:
+        num_workers = min(num_workers, n_items)
+        # a few chunks per process, to limit the number of round trips
+        chunksize = int(np.ceil(n_items / (4 * num_workers)))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(func, *df_lists, chunksize=chunksize))
+    return [func(*items) for items in zip(*df_lists)]
+
+
 def join_dataframes(df_list):
     """Join list of dataframes preserving the episodes so it can be recovered later.
 
@@ -30,14 +59,11 @@ def join_dataframes(df_list):
 
     Returns:
         df_joined: Dataframe with concatenated episodes
-        episodes: list containing episodes of each timestamp
-    """
-    cont = 0
-    episodes = []
-    for i in df_list:
-        s = ["Ep" + str(cont)]
-        episodes = episodes + s * len(i)
-        cont += 1
+        episodes (np.array, int): row offsets of the episodes in df_joined,
+            episode i spans rows episodes[i] to episodes[i + 1], dims: (len(df_list) + 1)
+    """
+    episodes = np.zeros(len(df_list) + 1, dtype=np.int64)
+    np.cumsum([len(df) for df in df_list], out=episodes[1:])
     df_joined = pd.concat(df_list)
     return df_joined, episodes
 
@@ -47,15 +73,12 @@ def recover_dataframes(df_joined, episodes):
 
     Args:
         df_joined (pd.DataFrame): Dataframe concatenated containing column 'ds', 'y' with training data
-        episodes: List containing the episodes from each timestamp
+        episodes (np.array, int): row offsets of the episodes, as returned by join_dataframes
 
     Returns:
         DF: Original dataframe before concatenation
     """
-    df_joined.insert(0, "eps", episodes)
-    df_list = [x for _, x in df_joined.groupby("eps")]
-    df_list = [x.drop(["eps"], axis=1) for x in df_list]
-    return df_list
+    return [df_joined.iloc[start:end] for start, end in zip(episodes[:-1], episodes[1:])]
 
 
 def data_params_definition(df, normalize, covariates_config=None, regressor_config=None, events_config=None):
@@ -93,33 +116,162 @@ def data_params_definition(df, normalize, covariates_config=None, regressor_conf
         scale=df["ds"].max() - df["ds"].min(),
     )
 
-    if "y" in df:
-        data_params["y"] = get_normalization_params(
-            array=df["y"].values,
-            norm_type=normalize,
-        )
+    variables = _normalization_variables(df, normalize, covariates_config, regressor_config, events_config)
+    # statistics of all variables are computed at once, column-wise
+    values = np.empty((len(df), len(variables)), order="F")
+    for i, name in enumerate(variables.keys()):
+        values[:, i] = df[name].values
+    stats = _ArrayStats(values)
+    for i, (name, norm_type) in enumerate(variables.items()):
+        column_stats = stats.column(i)
+        if norm_type == "auto":
+            norm_type = _auto_normalization_setting(column_stats.n_unique())
+        data_params[name] = _normalization_params_from_stats(column_stats, norm_type)
 
+    if events_config is not None:
+        for event in events_config.keys():
+            data_params[event] = ShiftScale()
+    return data_params
+
+
+def _normalization_variables(df, normalize, covariates_config=None, regressor_config=None, events_config=None):
+    """Checks that all configured variables are in df.
+
+    Returns:
+        OrderedDict: normalization type of each numeric variable ('y', covariates and regressors)
+    """
+    variables = OrderedDict({})
+    if "y" in df:
+        variables["y"] = normalize
     if covariates_config is not None:
         for covar in covariates_config.keys():
             if covar not in df.columns:
                 raise ValueError("Covariate {} not found in DataFrame.".format(covar))
-            data_params[covar] = get_normalization_params(
-                array=df[covar].values,
-                norm_type=covariates_config[covar].normalize,
-            )
-
+            variables[covar] = covariates_config[covar].normalize
     if regressor_config is not None:
         for reg in regressor_config.keys():
             if reg not in df.columns:
                 raise ValueError("Regressor {} not found in DataFrame.".format(reg))
-            data_params[reg] = get_normalization_params(
-                array=df[reg].values,
-                norm_type=regressor_config[reg].normalize,
-            )
+            variables[reg] = regressor_config[reg].normalize
     if events_config is not None:
         for event in events_config.keys():
             if event not in df.columns:
                 raise ValueError("Event {} not found in DataFrame.".format(event))
+    return variables
+
+
+def local_data_params_definition(df_list, normalize, covariates_config=None, regressor_config=None, events_config=None):
+    """Initialize data scaling values of each series, for local normalization.
+
+    The time 'ds' is scaled globally, so that all series share the same time axis (trend and seasonality).
+    All other variables are scaled per series, with the same normalization types as data_params_definition,
+    where 'auto' is resolved per series.
+    The statistics of all series are computed at once on the concatenated values.
+
+    Args:
+        df_list (list of pd.DataFrame): Time series to compute normalization parameters from, each non-empty.
+        see data_params_definition for the other arguments
+
+    Returns:
+        data_params (OrderedDict): scaling values
+            with ShiftScale entries, where 'shift' and 'scale' are np.arrays indexed by series
+            (except for 'ds' and events, which are shared by all series)
+    """
+    variables = None
+    for df in df_list:
+        if len(df) == 0:
+            raise ValueError("Local normalization requires data for each series.")
+        df_variables = _normalization_variables(df, normalize, covariates_config, regressor_config, events_config)
+        if variables is not None and list(df_variables.keys()) != list(variables.keys()):
+            raise ValueError("All series must have the same columns.")
+        variables = df_variables
+
+    data_params = OrderedDict({})
+    ds = pd.concat([df["ds"] for df in df_list])
+    if ds.dtype == np.int64:
+        ds = ds.astype(str)
+    ds = pd.to_datetime(ds)
+    data_params["ds"] = ShiftScale(shift=ds.min(), scale=ds.max() - ds.min())
+
+    lengths = np.array([len(df) for df in df_list])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    for name, norm_type in variables.items():
+        stats = _SeriesStats(np.concatenate([df[name].values for df in df_list]).astype(float), offsets)
+        if norm_type == "auto":
+            n_unique = stats.n_unique()
+            norm_types = np.array([_auto_normalization_setting(n) for n in n_unique])
+        else:
+            norm_types = np.full(len(df_list), norm_type)
+        shift, scale = np.zeros(len(df_list)), np.ones(len(df_list))
+        for series_norm_type in np.unique(norm_types):
+            params = _normalization_params_from_stats(stats, series_norm_type)
+            mask = norm_types == series_norm_type
+            shift[mask] = np.broadcast_to(params.shift, shift.shape)[mask]
+            scale[mask] = np.broadcast_to(params.scale, scale.shape)[mask]
+        data_params[name] = ShiftScale(shift=shift, scale=scale)
+
+    if events_config is not None:
+        for event in events_config.keys():
+            data_params[event] = ShiftScale()
+    return data_params
+
+
+def _data_params_from_chunks(chunks, normalize, covariates_config=None, regressor_config=None, events_config=None):
+    """Initialize data scaling values from a stream of dataframes, with bounded memory.
+
+    Minimum, maximum, mean and standard deviation are exact, the quantiles of 'soft' and 'soft1'
+    normalization are approximated with a streaming quantile sketch (see streaming_stats.QuantileSketch).
+
+    Args:
+        chunks (iterable of pd.DataFrame): parts of the time series, e.g. one per file
+        see data_params_definition for the other arguments
+
+    Returns:
+        data_params (OrderedDict): scaling values
+            with ShiftScale entries containing 'shift' and 'scale' parameters
+    """
+    # variables to normalize, with their label for error messages and their normalization type
+    variables = OrderedDict({})
+    if covariates_config is not None:
+        for covar in covariates_config.keys():
+            variables[covar] = ("Covariate", covariates_config[covar].normalize)
+    if regressor_config is not None:
+        for reg in regressor_config.keys():
+            variables[reg] = ("Regressor", regressor_config[reg].normalize)
+    ds_min, ds_max = None, None
+    stats = None
+    for df in chunks:
+        if stats is None:
+            if "y" in df:
+                variables = OrderedDict([("y", ("Column", normalize))] + list(variables.items()))
+            stats = OrderedDict({name: StreamingStats() for name in variables})
+        for name, (label, _) in variables.items():
+            if name not in df.columns:
+                raise ValueError("{} {} not found in DataFrame.".format(label, name))
+        if events_config is not None:
+            for event in events_config.keys():
+                if event not in df.columns:
+                    raise ValueError("Event {} not found in DataFrame.".format(event))
+        if len(df) == 0:
+            continue
+        ds = df["ds"]
+        if not pd.api.types.is_datetime64_dtype(ds):
+            ds = pd.to_datetime(ds.astype(str) if ds.dtype == np.int64 else ds)
+        ds_min = ds.min() if ds_min is None else min(ds_min, ds.min())
+        ds_max = ds.max() if ds_max is None else max(ds_max, ds.max())
+        for name, name_stats in stats.items():
+            name_stats.update(df[name].values)
+    if ds_min is None:
+        raise ValueError("No data provided to compute the data scaling values.")
+
+    data_params = OrderedDict({})
+    data_params["ds"] = ShiftScale(shift=ds_min, scale=ds_max - ds_min)
+    for name, (_, norm_type) in variables.items():
+        if norm_type == "auto":
+            norm_type = _auto_normalization_setting(stats[name].n_unique())
+        data_params[name] = _normalization_params_from_stats(stats[name], norm_type)
+    if events_config is not None:
+        for event in events_config.keys():
             data_params[event] = ShiftScale()
     return data_params
 
@@ -133,6 +285,8 @@ def init_data_params(
         unlike OG Prophet, which does shift by min and scale by max.
     Args:
         df (pd.DataFrame or list of pd.Dataframe): Time series to compute normalization parameters from.
+            Can also be an iterator of pd.DataFrame chunks of one or several series (e.g. one per file),
+            which are read once with bounded memory, see _data_params_from_chunks.
         normalize (str): Type of normalization to apply to the time series.
             options: ['soft', 'off', 'minmax, 'standardize']
             default: 'soft' scales minimum to 0.1 and the 90th quantile to 0.9
@@ -141,31 +295,27 @@ def init_data_params(
         regressor_config (OrderedDict): extra regressors (with known future values)
             with sub_parameters normalize (bool)
         events_config (OrderedDict): user specified events configs
-        local_modeling (bool): when set to true each episode from list of dataframes will be considered
-        locally (i.e. seasonality, data_params, normalization) - not fully implemented yet.
+        local_modeling (bool): when set to true each episode from list of dataframes is scaled with its own
+            scaling values, see local_data_params_definition.
 
     Returns:
-        data_params (OrderedDict or list of OrderedDict): scaling values
-            with ShiftScale entries containing 'shift' and 'scale' parameters
+        data_params (OrderedDict): scaling values
+            with ShiftScale entries containing 'shift' and 'scale' parameters,
+            as np.arrays indexed by series for local modeling
     """
 
     if isinstance(df, list):
         df_list = df.copy()
         if local_modeling:
             # Local Normalization
-            data_params = list()
-            for df in df_list:
-                data_params.append(
-                    data_params_definition(df, normalize, covariates_config, regressor_config, events_config)
-                )
-                log.debug(
-                    "Global Modeling - Local Normalization - Data Parameters (shift, scale): {}".format(
-                        [(k, (v.shift, v.scale)) for k, v in data_params[-1].items()]
-                    )
-                )
-                log.warning(
-                    "Local normalization will be implemented in the future - list of data_params may break the code"
+            data_params = local_data_params_definition(
+                df_list, normalize, covariates_config, regressor_config, events_config
+            )
+            log.debug(
+                "Global Modeling - Local Normalization - Data Parameters (shift, scale) of {} series: {}".format(
+                    len(df_list), [(k, (v.shift, v.scale)) for k, v in data_params.items()]
                 )
+            )
         else:
             # Global Normalization
             df, _ = join_dataframes(df_list)
@@ -175,6 +325,14 @@ def init_data_params(
                     [(k, (v.shift, v.scale)) for k, v in data_params.items()]
                 )
             )
+    elif not isinstance(df, pd.DataFrame):
+        # Global Normalization, streaming through the chunks
+        data_params = _data_params_from_chunks(df, normalize, covariates_config, regressor_config, events_config)
+        log.debug(
+            "Streaming - Data Parameters (shift, scale): {}".format(
+                [(k, (v.shift, v.scale)) for k, v in data_params.items()]
+            )
+        )
     else:
         data_params = data_params_definition(df, normalize, covariates_config, regressor_config, events_config)
         log.debug(
@@ -184,49 +342,203 @@ def init_data_params(
 
 
 def auto_normalization_setting(array):
-    if len(np.unique(array)) < 2:
+    return _auto_normalization_setting(len(np.unique(array)))
+
+
+def _auto_normalization_setting(n_unique):
+    if n_unique < 2:
         log.error("encountered variable with one unique value")
         raise ValueError
     # elif set(series.unique()) in ({True, False}, {1, 0}, {1.0, 0.0}, {-1, 1}, {-1.0, 1.0}):
-    elif len(np.unique(array)) == 2:
+    elif n_unique == 2:
         return "minmax"  # Don't standardize binary variables.
     else:
         return "soft"  # default setting
 
 
+class _ArrayStats:
+    """Exact statistics of each column of a 2-D array.
+
+    Minimum, maximum and the detection of constant and binary columns are computed for all columns at once
+    when first requested. column(i) gives access to the statistics of one column, with the interface of
+    streaming_stats.StreamingStats, where mean, std and quantiles are only computed for the columns which need them.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values (np.array, float): data, dims: (n_rows, n_columns)
+        """
+        # columns are contiguous in memory, for the reductions along the rows
+        self.values = np.asfortranarray(values, dtype=float)
+        self._min = None
+        self._max = None
+        self._n_unique = None
+
+    def min(self):
+        if self._min is None:
+            self._min = np.min(self.values, axis=0)
+        return self._min
+
+    def max(self):
+        if self._max is None:
+            self._max = np.max(self.values, axis=0)
+        return self._max
+
+    def n_unique(self):
+        """Number of distinct values of each column, counted up to 3."""
+        if self._n_unique is None:
+            lowest, highest = self.min(), self.max()
+            self._n_unique = np.where(lowest == highest, 1, 3)
+            # most columns are ruled out as binary by their first rows, only the others are checked in full
+            binary = np.all((self.values[:100] == lowest) | (self.values[:100] == highest), axis=0)
+            binary &= self._n_unique == 3
+            if binary.any():
+                values = self.values[:, binary]
+                binary[binary] = np.all((values == lowest[binary]) | (values == highest[binary]), axis=0)
+            self._n_unique[binary] = 2
+        return self._n_unique
+
+    def column(self, i):
+        return _ColumnStats(self, i)
+
+
+class _ColumnStats:
+    """Statistics of one column of an _ArrayStats."""
+
+    def __init__(self, stats, i):
+        self.stats = stats
+        self.i = i
+
+    def min(self):
+        return self.stats.min()[self.i]
+
+    def max(self):
+        return self.stats.max()[self.i]
+
+    def mean(self):
+        return np.mean(self.stats.values[:, self.i])
+
+    def std(self):
+        return np.std(self.stats.values[:, self.i])
+
+    def quantile(self, q):
+        """Like np.quantile(column, q, interpolation="higher").
+
+        Note: partitions the column in place, which does not change its other statistics.
+        """
+        if np.isnan(self.max()):
+            return np.nan
+        column = self.stats.values[:, self.i]
+        idx = int(math.ceil((len(column) - 1) * q))
+        column.partition(idx)
+        return column[idx]
+
+    def n_unique(self):
+        return self.stats.n_unique()[self.i]
+
+
+class _SeriesStats:
+    """Exact statistics of several series of one variable, stored one after the other.
+
+    Each statistic is computed for all series at once and returned as an array indexed by series,
+    with the interface of streaming_stats.StreamingStats.
+    """
+
+    def __init__(self, values, offsets):
+        """
+        Args:
+            values (np.array, float): concatenated values of all series
+            offsets (np.array, int): index of the first value of each series, followed by the number of values.
+                Each series must have at least one value.
+        """
+        self.values = values
+        self.starts = offsets[:-1]
+        self.lengths = np.diff(offsets)
+        self.series = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        self._min = None
+        self._max = None
+
+    def min(self):
+        if self._min is None:
+            self._min = np.minimum.reduceat(self.values, self.starts)
+        return self._min
+
+    def max(self):
+        if self._max is None:
+            self._max = np.maximum.reduceat(self.values, self.starts)
+        return self._max
+
+    def mean(self):
+        return np.add.reduceat(self.values, self.starts) / self.lengths
+
+    def std(self):
+        deviations = self.values - self.mean()[self.series]
+        return np.sqrt(np.add.reduceat(deviations ** 2, self.starts) / self.lengths)
+
+    def quantile(self, q):
+        """Quantile of each series, like np.quantile(series_values, q, interpolation="higher")."""
+        order = np.lexsort((self.values, self.series))
+        idx = self.starts + np.ceil((self.lengths - 1) * q).astype(int)
+        return np.where(np.isnan(self.max()), np.nan, self.values[order[idx]])
+
+    def n_unique(self):
+        """Number of distinct values of each series, counted up to 3."""
+        lowest, highest = self.min()[self.series], self.max()[self.series]
+        binary = np.logical_and.reduceat((self.values == lowest) | (self.values == highest), self.starts)
+        return np.where(self.min() == self.max(), 1, np.where(binary, 2, 3))
+
+
 def get_normalization_params(array, norm_type):
+    stats = _ArrayStats(np.array(array, dtype=float).reshape(-1, 1)).column(0)
     if norm_type == "auto":
-        norm_type = auto_normalization_setting(array)
+        norm_type = _auto_normalization_setting(stats.n_unique())
+    return _normalization_params_from_stats(stats, norm_type)
+
+
+def _normalization_params_from_stats(stats, norm_type):
+    """Compute shift and scale of a variable from its statistics.
+
+    Args:
+        stats (_ColumnStats, _SeriesStats or StreamingStats): statistics of the variable
+        norm_type (str): type of normalization, not 'auto'
+
+    Returns:
+        ShiftScale, with np.array entries for _SeriesStats
+    """
     shift = 0.0
     scale = 1.0
     if norm_type == "soft":
-        lowest = np.min(array)
-        q95 = np.quantile(array, 0.95, interpolation="higher")
-        width = q95 - lowest
-        if math.isclose(width, 0):
-            width = np.max(array) - lowest
+        lowest = stats.min()
+        q95 = stats.quantile(0.95)
+        width = _replace_zero(q95 - lowest, stats.max() - lowest)
         shift = lowest
         scale = width
     elif norm_type == "soft1":
-        lowest = np.min(array)
-        q90 = np.quantile(array, 0.9, interpolation="higher")
-        width = q90 - lowest
-        if math.isclose(width, 0):
-            width = (np.max(array) - lowest) / 1.25
+        lowest = stats.min()
+        q90 = stats.quantile(0.9)
+        width = _replace_zero(q90 - lowest, (stats.max() - lowest) / 1.25)
         shift = lowest - 0.125 * width
         scale = 1.25 * width
     elif norm_type == "minmax":
-        shift = np.min(array)
-        scale = np.max(array) - shift
+        shift = stats.min()
+        scale = stats.max() - shift
     elif norm_type == "standardize":
-        shift = np.mean(array)
-        scale = np.std(array)
+        shift = stats.mean()
+        scale = stats.std()
     elif norm_type != "off":
         log.error("Normalization {} not defined.".format(norm_type))
     return ShiftScale(shift, scale)
 
 
-def _normalization(df, data_params):
+def _replace_zero(width, fallback):
+    """Replaces a width of zero by the fallback width, for scalars and arrays."""
+    if np.ndim(width) == 0:
+        return fallback if math.isclose(width, 0) else width
+    return np.where(width == 0, fallback, width)
+
+
+def _normalization(df, data_params, series=None):
     """Apply data scales.
 
     Applies data scaling factors to df using data_params.
@@ -235,6 +547,7 @@ def _normalization(df, data_params):
         df (pd.DataFrame): with columns 'ds', 'y', (and potentially more regressors)
         data_params (OrderedDict): scaling values,as returned by init_data_params
             with ShiftScale entries containing 'shift' and 'scale' parameters
+        series (int): index of the series, to select its scaling values with local normalization
     Returns:
         df: pd.DataFrame, normalized
     """
@@ -246,11 +559,63 @@ def _normalization(df, data_params):
             new_name = "t"
         if name == "y":
             new_name = "y_scaled"
-        df[new_name] = df[name].sub(data_params[name].shift).div(data_params[name].scale)
+        shift, scale = data_params[name].shift, data_params[name].scale
+        if np.ndim(shift) > 0:
+            if series is None:
+                if len(shift) > 1:
+                    raise ValueError("Locally normalized data requires the position of the series.")
+                series = 0
+            shift, scale = shift[series], scale[series]
+        if name == "ds":
+            shift, scale = pd.Timestamp(shift).to_datetime64(), pd.Timedelta(scale).to_timedelta64()
+        df[new_name] = (df[name].values - shift) / scale
     return df
 
 
-def normalize(df, data_params, local_modeling=False):
+def n_series_of(data_params):
+    """Number of series with their own scaling values, 1 unless locally normalized.
+
+    Args:
+        data_params (OrderedDict): scaling values, as returned by init_data_params
+
+    Returns:
+        int
+    """
+    for params in data_params.values():
+        if np.ndim(params.shift) > 0:
+            return len(params.shift)
+    return 1
+
+
+def data_params_of_series(data_params, series=None):
+    """Scaling values of a single series.
+
+    Args:
+        data_params (OrderedDict): scaling values, as returned by init_data_params
+        series (int): position of the series among the locally normalized series it was fitted with,
+            may be None if there is only one. Ignored if the scaling values are shared by all series.
+
+    Returns:
+        data_params (OrderedDict): with ShiftScale entries containing scalar 'shift' and 'scale' parameters
+    """
+    n_series = n_series_of(data_params)
+    if not any(np.ndim(params.shift) > 0 for params in data_params.values()):
+        return data_params
+    if series is None:
+        if n_series > 1:
+            raise ValueError("Locally normalized models require the position of the series among the fitted series.")
+        series = 0
+    elif not 0 <= series < n_series:
+        raise ValueError("Series position {} out of range for {} fitted series.".format(series, n_series))
+    series_params = OrderedDict({})
+    for name, params in data_params.items():
+        if np.ndim(params.shift) > 0:
+            params = ShiftScale(shift=params.shift[series], scale=params.scale[series])
+        series_params[name] = params
+    return series_params
+
+
+def normalize(df, data_params, local_modeling=False, series=None, num_workers=1):
     """Apply data scales.
 
     Applies data scaling factors to df using data_params.
@@ -259,30 +624,30 @@ def normalize(df, data_params, local_modeling=False):
         df (pd.DataFrame or list of pd.Dataframe): with columns 'ds', 'y', (and potentially more regressors)
         data_params (OrderedDict): scaling values,as returned by init_data_params
             with ShiftScale entries containing 'shift' and 'scale' parameters
-        local_modeling (bool): when set to true each episode from list of dataframes will be considered
-        locally (i.e. seasonality, data_params, normalization) - not fully implemented yet.
+        local_modeling (bool): when set to true each episode from list of dataframes is scaled with
+            the scaling values of the series at its position in the list.
+        series (int): position of a single df among the locally normalized series it was fitted with
+        num_workers (int): number of worker processes normalizing the dataframes of a list, see map_df_list
     Returns:
         df: pd.DataFrame or list of pd.DataFrame, normalized
     """
 
     if isinstance(df, list):
         df_list = df.copy()
+        data_params_list = [data_params] * len(df_list)
         if local_modeling:
-            # Local Normalization
-            log.warning(
-                "Local normalization will be implemented in the future - list of data_params may break the code"
-            )
-            df_list_norm = list()
-            for df, df_data_params in zip(df_list, data_params):
-                df_list_norm.append(_normalization(df, df_data_params))
-            df = df_list_norm
+            # Local Normalization: scaling values of each series, by its position in the list
+            n_series = n_series_of(data_params)
+            if len(df_list) != n_series:
+                raise ValueError(
+                    "Locally normalized data requires the list of all {} series, in the fitted order.".format(n_series)
+                )
+            df = map_df_list(_normalization, df_list, data_params_list, list(range(n_series)), num_workers=num_workers)
         else:
-            # Global Normalization
-            df_joined, episodes = join_dataframes(df_list)
-            df = _normalization(df_joined, data_params)
-            df = recover_dataframes(df, episodes)
+            # Global Normalization: shared data_params, applied to each episode without joining them
+            df = map_df_list(_normalization, df_list, data_params_list, num_workers=num_workers)
     else:
-        df = _normalization(df, data_params)
+        df = _normalization(df, data_params, series=series)
     return df
 
 
@@ -315,8 +680,11 @@ def _check_dataframe(df, check_y, covariates, regressors, events):
     if df["ds"].dt.tz is not None:
         raise ValueError("Column ds has timezone specified, which is not supported. Remove timezone.")
 
+    # dates which are strictly increasing are sorted and unique, as usual for clean data
+    ds = df["ds"].values
+    ds_sorted = bool(np.all(ds[1:] > ds[:-1]))
     # FIX Issue #53: Data: fail with specific error message when data contains duplicate date entries.
-    if len(df.ds.unique()) != len(df.ds):
+    if not ds_sorted and len(df.ds.unique()) != len(df.ds):
         raise ValueError("Column ds has duplicate values. Please remove duplicates.")
     # END FIX
 
@@ -341,23 +709,28 @@ def _check_dataframe(df, check_y, covariates, regressors, events):
     for name in columns:
         if name not in df:
             raise ValueError("Column {name!r} missing from dataframe".format(name=name))
-        if df.loc[df.loc[:, name].notnull()].shape[0] < 1:
-            raise ValueError("Dataframe column {name!r} only has NaN rows.".format(name=name))
         if not np.issubdtype(df[name].dtype, np.number):
             df.loc[:, name] = pd.to_numeric(df.loc[:, name])
-        if np.isinf(df.loc[:, name].values).any():
-            df.loc[:, name] = df[name].replace([np.inf, -np.inf], np.nan)
-        if df.loc[df.loc[:, name].notnull()].shape[0] < 1:
+    if len(columns) > 0:
+        # check all columns in one pass over their values
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        no_values = ~np.isfinite(values).any(axis=0)
+        if no_values.any():
+            name = columns[int(np.argmax(no_values))]
             raise ValueError("Dataframe column {name!r} only has NaN rows.".format(name=name))
+        for name, has_inf in zip(columns, np.isinf(values).any(axis=0)):
+            if has_inf:
+                df.loc[:, name] = df[name].replace([np.inf, -np.inf], np.nan)
 
     if df.index.name == "ds":
         df.index.name = None
-    df = df.sort_values("ds")
+    if not ds_sorted:
+        df = df.sort_values("ds")
     df = df.reset_index(drop=True)
     return df
 
 
-def check_dataframe(df, check_y=True, covariates=None, regressors=None, events=None):
+def check_dataframe(df, check_y=True, covariates=None, regressors=None, events=None, num_workers=1):
     """Performs basic data sanity checks and ordering
 
     Prepare dataframe for fitting or predicting.
@@ -368,18 +741,166 @@ def check_dataframe(df, check_y=True, covariates=None, regressors=None, events=N
         covariates (list or dict): covariate column names
         regressors (list or dict): regressor column names
         events (list or dict): event column names
+        num_workers (int): number of worker processes checking the dataframes of a list, see map_df_list
 
     Returns:
         pd.DataFrame or list of pd.DataFrame
     """
     df_list = create_df_list(df)
-    checked_df = list()
-    for df in df_list:
-        checked_df.append(_check_dataframe(df, check_y, covariates, regressors, events))
-    df = checked_df
+    check = functools.partial(
+        _check_dataframe, check_y=check_y, covariates=covariates, regressors=regressors, events=events
+    )
+    df = map_df_list(check, df_list, num_workers=num_workers)
     return df[0] if len(df) == 1 else df
 
 
+def _handle_missing_data(
+    df,
+    freq,
+    predicting,
+    n_lags,
+    n_forecasts,
+    impute_missing=True,
+    impute_limit_linear=5,
+    impute_rolling=20,
+    covariates=None,
+    regressors=None,
+    events=None,
+):
+    """Adds missing dates and imputes missing values of a single series.
+
+    A module-level function, so that it can be run in a pool of processes.
+
+    Args:
+        df (pd.DataFrame): raw data with columns 'ds' and 'y'
+        freq (str): data frequency
+        predicting (bool): when no lags, allow NA values in 'y' of forecast series or 'y' to miss completely
+        n_lags (int): identical to NeuralProphet
+        n_forecasts (int): identical to NeuralProphet
+        impute_missing (bool): whether to impute missing dates and values, else raise a ValueError
+        impute_limit_linear (int): maximal number of missing values imputed linearly, on each side of a gap
+        impute_rolling (int): maximal number of missing values imputed by a rolling average
+        covariates (dict): covariate configs, by column name
+        regressors (dict): regressor configs, by column name
+        events (dict): event configs, by column name
+
+    Returns:
+        pre-processed df
+    """
+    if n_lags == 0 and not predicting:
+        # we can drop rows with NA in y
+        sum_na = sum(df["y"].isna())
+        if sum_na > 0:
+            df = df[df["y"].notna()]
+            log.info("dropped {} NAN row in 'y'".format(sum_na))
+
+    # add missing dates for autoregression modelling
+    if n_lags > 0:
+        df, missing_dates = add_missing_dates_nan(df, freq=freq)
+        if missing_dates > 0:
+            if impute_missing:
+                log.info("{} missing dates added.".format(missing_dates))
+            else:
+                raise ValueError(
+                    "{} missing dates found. Please preprocess data manually or set impute_missing to True.".format(
+                        missing_dates
+                    )
+                )
+
+    if regressors is not None:
+        # if future regressors, check that they are not nan at end, else drop
+        # we ignore missing events, as those will be filled in with zeros.
+        reg_nan_at_end = int(np.max(count_nan_at_end(df[list(regressors.keys())].values)))
+        if reg_nan_at_end > 0:
+            # drop rows at end due to missing future regressors
+            df = df[:-reg_nan_at_end]
+            log.info("Dropped {} rows at end due to missing future regressor values.".format(reg_nan_at_end))
+
+    df_end_to_append = None
+    nan_at_end = int(count_nan_at_end(df[["y"]].values)[0])
+    if nan_at_end > 0:
+        if predicting:
+            # allow nans at end - will re-add at end
+            if n_forecasts > 1 and n_forecasts < nan_at_end:
+                # check that not more than n_forecasts nans, else drop surplus
+                df = df[: -(nan_at_end - n_forecasts)]
+                # correct new length:
+                nan_at_end = n_forecasts
+                log.info(
+                    "Detected y to have more NaN values than n_forecast can predict. "
+                    "Dropped {} rows at end.".format(nan_at_end - n_forecasts)
+                )
+            df_end_to_append = df[-nan_at_end:]
+            df = df[:-nan_at_end]
+        else:
+            # training - drop nans at end
+            df = df[:-nan_at_end]
+            log.info(
+                "Dropped {} consecutive nans at end. "
+                "Training data can only be imputed up to last observation.".format(nan_at_end)
+            )
+
+    # impute missing values
+    data_columns = []
+    if n_lags > 0:
+        data_columns.append("y")
+    if covariates is not None:
+        data_columns.extend(covariates.keys())
+    if regressors is not None:
+        data_columns.extend(regressors.keys())
+    if events is not None:
+        data_columns.extend(events.keys())
+    sum_na = df[data_columns].isnull().sum().values if len(data_columns) > 0 else []
+    na_columns = [column for column, column_na in zip(data_columns, sum_na) if column_na > 0]
+    if len(na_columns) > 0:
+        if not impute_missing:  # fail because set to not impute missing
+            raise ValueError("Missing values found. Please preprocess data manually or set impute_missing to True.")
+        # use 0 substitution for holidays and events missing values
+        event_columns = [column for column in na_columns if events is not None and column in events]
+        if len(event_columns) > 0:
+            df[event_columns] = df[event_columns].fillna(0)
+        # impute all other columns at once
+        remaining_na = OrderedDict({column: 0 for column in event_columns})
+        impute_columns = [column for column in na_columns if column not in remaining_na]
+        if len(impute_columns) > 0:
+            values, impute_remaining_na = impute_linear_then_rolling_avg(
+                df[impute_columns].to_numpy(dtype=float, na_value=np.nan),
+                limit_linear=impute_limit_linear,
+                rolling=impute_rolling,
+            )
+            # replacing the columns as one block is much faster than assigning them one by one
+            filled = pd.DataFrame(values, columns=impute_columns, index=df.index)
+            df = pd.concat((df.drop(columns=impute_columns), filled), axis=1)[list(df.columns)]
+            remaining_na.update(zip(impute_columns, impute_remaining_na))
+        for column, column_na in zip(data_columns, sum_na):
+            if column_na == 0:
+                continue
+            log.info("{} NaN values in column {} were auto-imputed.".format(column_na - remaining_na[column], column))
+            if remaining_na[column] > 0:
+                raise ValueError(
+                    "More than {} consecutive missing values encountered in column {}. "
+                    "{} NA remain. Please preprocess data manually.".format(
+                        2 * impute_limit_linear + impute_rolling, column, remaining_na[column]
+                    )
+                )
+    if df_end_to_append is not None:
+        df = pd.concat((df, df_end_to_append))
+    return df
+
+
+def _crossvalidation_fold_sizes(n_rows, n_lags, n_forecasts, k, fold_pct, fold_overlap_pct):
+    """Number of samples of the series, of each validation fold and of the overlap between the folds."""
+    if n_lags == 0:
+        assert n_forecasts == 1
+    total_samples = n_rows - n_lags + 2 - (2 * n_forecasts)
+    samples_fold = max(1, int(fold_pct * total_samples))
+    samples_overlap = int(fold_overlap_pct * samples_fold)
+    assert samples_overlap < samples_fold
+    min_train = total_samples - samples_fold - (k - 1) * (samples_fold - samples_overlap)
+    assert min_train >= samples_fold
+    return total_samples, samples_fold, samples_overlap
+
+
 def crossvalidation_split_df(df, n_lags, n_forecasts, k, fold_pct, fold_overlap_pct=0.0):
     """Splits data in k folds for crossvalidation.
 
@@ -397,25 +918,54 @@ def crossvalidation_split_df(df, n_lags, n_forecasts, k, fold_pct, fold_overlap_
             df_train (pd.DataFrame):  training data
             df_val (pd.DataFrame): validation data
     """
-    if n_lags == 0:
-        assert n_forecasts == 1
-    total_samples = len(df) - n_lags + 2 - (2 * n_forecasts)
-    samples_fold = max(1, int(fold_pct * total_samples))
-    samples_overlap = int(fold_overlap_pct * samples_fold)
-    assert samples_overlap < samples_fold
-    min_train = total_samples - samples_fold - (k - 1) * (samples_fold - samples_overlap)
-    assert min_train >= samples_fold
+    _, samples_fold, samples_overlap = _crossvalidation_fold_sizes(
+        len(df), n_lags, n_forecasts, k, fold_pct, fold_overlap_pct
+    )
     folds = []
-    df_fold = df.copy(deep=True)
+    # the folds are slices of df, only the returned frames are copies
+    df_fold = df
     for i in range(k, 0, -1):
         df_train, df_val = split_df(df_fold, n_lags, n_forecasts, valid_p=samples_fold, inputs_overbleed=True)
         folds.append((df_train, df_val))
         split_idx = len(df_fold) - samples_fold + samples_overlap
-        df_fold = df_fold.iloc[:split_idx].reset_index(drop=True)
+        df_fold = df_fold.iloc[:split_idx]
     folds = folds[::-1]
     return folds
 
 
+def crossvalidation_split_indices(n_rows, n_lags, n_forecasts, k, fold_pct, fold_overlap_pct=0.0):
+    """Splits the samples of a series in k folds for crossvalidation, like crossvalidation_split_df.
+
+    The indices refer to the samples of the whole series, as tabularized by
+    time_dataset.tabularize_univariate_datetime, so that all folds can share one dataset.
+    Sample i has its inputs in rows i to i + n_lags - 1 and its targets in the following n_forecasts rows.
+
+    Args:
+        n_rows (int): number of rows of the series
+        n_lags (int): identical to NeuralProhet
+        n_forecasts (int): identical to NeuralProhet
+        k (int): number of CV folds
+        fold_pct (float): percentage of overall samples to be in each fold
+        fold_overlap_pct (float): percentage of overlap between the validation folds.
+            default: 0.0
+
+    Returns:
+        list of k tuples [(train_samples, val_samples), ...] where:
+            train_samples (np.array, int): indices of the training samples
+            val_samples (np.array, int): indices of the validation samples
+    """
+    total_samples, samples_fold, samples_overlap = _crossvalidation_fold_sizes(
+        n_rows, n_lags, n_forecasts, k, fold_pct, fold_overlap_pct
+    )
+    folds = []
+    for i in range(k - 1, -1, -1):
+        n_train = total_samples - samples_fold - i * (samples_fold - samples_overlap)
+        # as in split_df, no validation target is a training target
+        val_start = n_train + n_forecasts - 1
+        folds.append((np.arange(n_train), np.arange(val_start, val_start + samples_fold)))
+    return folds
+
+
 def double_crossvalidation_split_df(df, n_lags, n_forecasts, k, valid_pct, test_pct):
     """Splits data in two sets of k folds for crossvalidation on validation and test data.
 
@@ -468,38 +1018,83 @@ def _split_df(df, n_lags, n_forecasts, valid_p, inputs_overbleed):
 
     split_idx_train = n_train + n_lags + n_forecasts - 1
     split_idx_val = split_idx_train - n_lags if inputs_overbleed else split_idx_train
-    df_train = df.copy(deep=True).iloc[:split_idx_train].reset_index(drop=True)
-    df_val = df.copy(deep=True).iloc[split_idx_val:].reset_index(drop=True)
+    # reset_index copies the slices
+    df_train = df.iloc[:split_idx_train].reset_index(drop=True)
+    df_val = df.iloc[split_idx_val:].reset_index(drop=True)
     log.debug("{} n_train, {} n_eval".format(n_train, n_samples - n_train))
     return df_train, df_val
 
 
+def _ds_values(df):
+    """Datestamps of df as np.array of datetime64."""
+    values = df["ds"].values
+    if not np.issubdtype(values.dtype, np.datetime64):
+        values = pd.to_datetime(df["ds"]).values
+    return values
+
+
 def find_time_threshold(df_list, n_lags, valid_p, inputs_overbleed):
+    """Finds the datestamp which splits the rows of all series into training and validation data.
+
+    The threshold is the datestamp at position n_train of the datestamps of all series in ascending order.
+    It is selected with a partition of the concatenated datestamps, without joining and sorting the dataframes.
+
+    Args:
+        df_list (list of pd.DataFrame): data
+        n_lags (int): identical to NeuralProhet
+        valid_p (float): fraction (0,1) of data to use for holdout validation set
+        inputs_overbleed (bool): Whether to allow last training targets to be first validation inputs (never targets)
+
+    Returns:
+        pd.Timestamp, first datestamp of the validation data
+    """
     if not 0 < valid_p < 1:
         log.error("Please type a valid value for valid_p (for global modeling it should be between 0 and 1.0)")
-    df_joint, _ = join_dataframes(df_list)
-    df_joint = df_joint.sort_values("ds")
-    df_joint = df_joint.reset_index(drop=True)
-    n_samples = len(df_joint)
+    ds = np.concatenate([_ds_values(df) for df in df_list])
+    n_samples = len(ds)
     n_samples = n_samples if inputs_overbleed else n_samples - n_lags
     n_valid = max(1, int(n_samples * valid_p))
     n_train = n_samples - n_valid
-    threshold_time_stamp = df_joint.loc[n_train, "ds"]
-    log.debug("Time threshold: ", threshold_time_stamp)
+    threshold_time_stamp = pd.Timestamp(np.partition(ds, n_train)[n_train])
+    log.debug("Time threshold: {}".format(threshold_time_stamp))
     return threshold_time_stamp
 
 
 def split_considering_timestamp(df_list, threshold_time_stamp):
+    """Splits each series into the rows before and from the threshold datestamp.
+
+    Series entirely before the threshold are only training data, series entirely after it only validation data.
+    Sorted series are split with a binary search into two slices, others with boolean masks.
+
+    Args:
+        df_list (list of pd.DataFrame): data
+        threshold_time_stamp (pd.Timestamp): first datestamp of the validation data
+
+    Returns:
+        df_train (list of pd.DataFrame): training data
+        df_val (list of pd.DataFrame): validation data
+    """
+    threshold = np.datetime64(threshold_time_stamp, "ns")
     df_train = list()
     df_val = list()
     for df in df_list:
-        if df["ds"].max() < threshold_time_stamp:
+        ds = _ds_values(df)
+        if (ds[1:] >= ds[:-1]).all():
+            split_idx = np.searchsorted(ds, threshold, side="left")
+            if split_idx == len(ds):
+                df_train.append(df)
+            elif split_idx == 0 and ds[0] > threshold:
+                df_val.append(df)
+            else:
+                df_train.append(df.iloc[:split_idx])
+                df_val.append(df.iloc[split_idx:])
+        elif ds.max() < threshold:
             df_train.append(df)
-        elif df["ds"].min() > threshold_time_stamp:
+        elif ds.min() > threshold:
             df_val.append(df)
         else:
-            df_train.append(df[df["ds"] < threshold_time_stamp])
-            df_val.append(df[df["ds"] >= threshold_time_stamp])
+            df_train.append(df[ds < threshold])
+            df_val.append(df[ds >= threshold])
     return df_train, df_val
 
 
@@ -555,7 +1150,7 @@ def make_future_df(
         regressor_config (OrderedDict): configuration for user specified regressors,
         regressors_df (pd.DataFrame): containing column 'ds' and one column for each of the external regressors
     Returns:
-        df2 (pd.DataFrame): input df with 'ds' extended into future, and 'y' set to None
+        df2 (pd.DataFrame): input df with 'ds' extended into future, and 'y' set to NaN
     """
     future_dates = pd.date_range(start=last_date, periods=periods + 1, freq=freq)  # An extra in case we include start
     future_dates = future_dates[future_dates > last_date]  # Drop start if equals last_date
@@ -572,7 +1167,7 @@ def make_future_df(
     for column in df_columns:
         if column not in future_df.columns:
             if column != "t" and column != "y_scaled":
-                future_df[column] = None
+                future_df[column] = np.nan
     future_df.reset_index(drop=True, inplace=True)
     return future_df
 
@@ -633,14 +1228,87 @@ def fill_linear_then_rolling_avg(series, limit_linear, rolling):
     Returns:
         filled df
     """
-    # impute small gaps linearly:
-    series = series.interpolate(method="linear", limit=limit_linear, limit_direction="both")
-    # fill remaining gaps with rolling avg
-    is_na = pd.isna(series)
-    rolling_avg = series.rolling(rolling + 2 * limit_linear, min_periods=2 * limit_linear, center=True).mean()
-    series.loc[is_na] = rolling_avg[is_na]
-    remaining_na = sum(series.isnull())
-    return series, remaining_na
+    values, remaining_na = impute_linear_then_rolling_avg(
+        series.values.astype(float).reshape(-1, 1), limit_linear=limit_linear, rolling=rolling
+    )
+    return pd.Series(values[:, 0], index=series.index, name=series.name), int(remaining_na[0])
+
+
+def impute_linear_then_rolling_avg(values, limit_linear, rolling):
+    """Fills missing values of all columns at once, with linear imputation or a rolling average.
+
+    Identical to pd.Series.interpolate(method="linear", limit=limit_linear, limit_direction="both"),
+    followed by filling the remaining gaps with the centered rolling average of width rolling + 2*limit_linear,
+    with at least 2*limit_linear values, for each column.
+
+    Args:
+        values (np.array, float): data with nan to be filled in, dims: (n_rows, n_columns)
+        limit_linear (int): maximum number of missing values to impute.
+            Note: because imputation is done in both directions, this value is effectively doubled.
+        rolling (int): maximal number of missing values to impute.
+            Note: window width is rolling + 2*limit_linear
+
+    Returns:
+        filled values (np.array, float), dims: (n_rows, n_columns)
+        remaining_na (np.array, int): number of values which could not be filled, per column
+    """
+    # columns are contiguous in memory, for the accumulations along the rows
+    values = np.array(values, dtype=float, order="F")
+    is_na = np.isnan(values)
+    if not is_na.any():
+        return values, np.zeros(values.shape[1], dtype=int)
+    n_rows = values.shape[0]
+    rows = np.arange(n_rows)[:, None]
+    # positions of the last valid value before and the next valid value after each row
+    prev_valid = np.maximum.accumulate(np.where(is_na, -1, rows), axis=0)
+    next_valid = np.minimum.accumulate(np.where(is_na, n_rows, rows)[::-1], axis=0)[::-1]
+    # impute small gaps linearly, in both directions, and constant beyond the first and last valid value
+    na_rows, na_columns = np.nonzero(is_na)
+    prev_valid = prev_valid[na_rows, na_columns]
+    next_valid = next_valid[na_rows, na_columns]
+    has_prev = prev_valid >= 0
+    has_next = next_valid < n_rows
+    fill = (has_prev & (na_rows - prev_valid <= limit_linear)) | (has_next & (next_valid - na_rows <= limit_linear))
+    na_rows, na_columns = na_rows[fill], na_columns[fill]
+    prev_valid, next_valid, has_prev, has_next = prev_valid[fill], next_valid[fill], has_prev[fill], has_next[fill]
+    y_prev = values[np.where(has_prev, prev_valid, next_valid), na_columns]
+    y_next = values[np.where(has_next, next_valid, prev_valid), na_columns]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (y_next - y_prev) / (next_valid - prev_valid)
+        values[na_rows, na_columns] = np.where(has_prev & has_next, slope * (na_rows - prev_valid) + y_prev, y_prev)
+
+    # fill remaining gaps with the centered rolling avg
+    is_na = np.isnan(values)
+    if is_na.any():
+        window = rolling + 2 * limit_linear
+        offset = (window - 1) // 2
+        padded = np.pad(values, ((window - 1 - offset, offset), (0, 0)), constant_values=np.nan)
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+        na_rows, na_columns = np.nonzero(is_na)
+        na_windows = windows[na_rows, na_columns]
+        count = np.sum(~np.isnan(na_windows), axis=1)
+        total = np.nansum(na_windows, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[na_rows, na_columns] = np.where(count >= max(1, 2 * limit_linear), total / count, np.nan)
+    remaining_na = np.sum(np.isnan(values), axis=0)
+    return values, remaining_na
+
+
+def count_nan_at_end(values):
+    """Number of consecutive missing values at the end of each column.
+
+    Args:
+        values (np.array, float): data, dims: (n_rows, n_columns)
+
+    Returns:
+        np.array, int: number of trailing nan per column
+    """
+    is_valid = ~pd.isna(values)
+    n_rows = values.shape[0]
+    if n_rows == 0:
+        return np.zeros(values.shape[1], dtype=int)
+    last_valid = n_rows - 1 - np.argmax(is_valid[::-1], axis=0)
+    return np.where(is_valid.any(axis=0), n_rows - 1 - last_valid, n_rows)
 
 
 def make_list_dataframes(df, episodes):
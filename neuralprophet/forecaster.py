@@ -1,11 +1,17 @@
 import time
+import copy
+import inspect
+import contextlib
+import hashlib
+import functools
 from collections import OrderedDict
 import numpy as np
 import pandas as pd
 
 import torch
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Subset
 import logging
+from multiprocessing.pool import Pool
 from tqdm import tqdm
 
 from neuralprophet import configure
@@ -16,6 +22,8 @@ from neuralprophet import utils
 from neuralprophet.plot_forecast import plot, plot_components
 from neuralprophet.plot_model_parameters import plot_parameters
 from neuralprophet import metrics
+from neuralprophet.numpy_forecaster import NumpyForecaster
+from neuralprophet.online_forecaster import OnlineForecaster
 
 log = logging.getLogger("NP.forecaster")
 
@@ -27,6 +35,31 @@ METRICS = {
 }
 
 
+def _train_fold(args):
+    """Trains the prepared model of one crossvalidation fold on subsets of a shared dataset.
+
+    Args:
+        args (tuple): NeuralProphet model with the data parameters of the fold, dataset of the whole series,
+            training and validation sample indices (np.array, int), number of training rows (int)
+            and the data parameters the dataset was normalized with, if they are not those of the fold
+
+    Returns:
+        df with training and validation metrics
+    """
+    m, dataset, train_samples, val_samples, n_data, data_params = args
+    if data_params is None:
+        train_data, val_data = Subset(dataset, train_samples), Subset(dataset, val_samples)
+    else:
+        # renormalized in the worker, so that only the shared tensors are passed to it
+        rescale = (data_params, m.data_params, m.regressors_config)
+        train_data = time_dataset.RescaledSubset(dataset, train_samples, *rescale)
+        val_data = time_dataset.RescaledSubset(dataset, val_samples, *rescale)
+    loader = m._init_train_loader_from_dataset(train_data, n_data)
+    val_loader = DataLoader(val_data, batch_size=min(1024, len(val_data)), shuffle=False)
+    metrics_df = m._train_with_loaders(loader, val_loader, progress_bar=False, progress_print=False)
+    return metrics_df
+
+
 class NeuralProphet:
     """NeuralProphet forecaster.
 
@@ -52,7 +85,9 @@ class NeuralProphet:
         n_lags=0,
         num_hidden_layers=0,
         d_hidden=None,
+        ar_rank=None,
         ar_sparsity=None,
+        ar_lags=None,
         learning_rate=None,
         epochs=None,
         batch_size=None,
@@ -62,6 +97,7 @@ class NeuralProphet:
         normalize="auto",
         impute_missing=True,
         collect_metrics=True,
+        num_workers=1,
     ):
         """
         Args:
@@ -102,11 +138,18 @@ class NeuralProphet:
             n_lags (int): Previous time series steps to include in auto-regression. Aka AR-order
             ar_sparsity (float): [0-1], how much sparsity to enduce in the AR-coefficients.
                 Should be around (# nonzero components) / (AR order), eg. 3/100 = 0.03
+            ar_lags (int, range or list of int and range): explicit set of lags to use in auto-regression,
+                e.g. [range(1, 25), 168, 336], or a dilated range(24, 8761, 24).
+                Only these lags are gathered as model inputs. n_lags is set to the largest lag.
+                default: None, use all lags from 1 to n_lags
 
             ## Model Config
             n_forecasts (int): Number of steps ahead of prediction time step to forecast.
             num_hidden_layers (int): number of hidden layer to include in AR-Net. defaults to 0.
             d_hidden (int): dimension of hidden layers of the AR-Net. Ignored if num_hidden_layers == 0.
+            ar_rank (int): rank of a low-rank factorization of the input layer of AR-Net and lagged regressor nets.
+                Reduces the parameters for long lag windows. default: None, no factorization.
+                Must be at least 1. Layers with no more inputs or outputs than ar_rank are not factorized.
 
             ## Train Config
             learning_rate (float): Maximum learning rate setting for 1cycle policy scheduler.
@@ -142,7 +185,9 @@ class NeuralProphet:
                     'soft1' scales the minimum value to 0.1 and the 90th quantile to 0.9
             impute_missing (bool): whether to automatically impute missing dates/values
                 imputation follows a linear method up to 10 missing values, more are filled with trend.
-
+            num_workers (int): number of processes preparing the series of a list of dataframes in parallel:
+                checks, imputation and normalization. The dataframes are pickled to and from the processes.
+                Results do not depend on it. default: 1, the series are prepared one after the other.
         """
         kwargs = locals()
 
@@ -155,6 +200,7 @@ class NeuralProphet:
         self.impute_missing = impute_missing
         self.impute_limit_linear = 5
         self.impute_rolling = 20
+        self.num_workers = num_workers
 
         # Training
         self.config_train = configure.from_kwargs(configure.Train, kwargs)
@@ -184,7 +230,7 @@ class NeuralProphet:
         # AR
         self.config_ar = configure.from_kwargs(configure.AR, kwargs)
         self.n_lags = self.config_ar.n_lags
-        if n_lags == 0 and n_forecasts > 1:
+        if self.n_lags == 0 and n_forecasts > 1:
             self.n_forecasts = 1
             log.warning(
                 "Changing n_forecasts to 1. Without lags, the forecast can be "
@@ -217,6 +263,7 @@ class NeuralProphet:
 
         # set during fit()
         self.data_freq = None
+        self.local_modeling = False
 
         # Set during _train()
         self.fitted = False
@@ -224,12 +271,17 @@ class NeuralProphet:
         self.optimizer = None
         self.scheduler = None
         self.model = None
+        self.quantized_model = None
+        self.model_version = 0
 
         # set during prediction
         self.future_periods = None
         # later set by user (optional)
         self.highlight_forecast_step_n = None
         self.true_ar_weights = None
+        self.inference_precision = "float32"
+        self.predict_cache_size = 0
+        self.predict_cache = OrderedDict({})
 
     def _init_model(self):
         """Build Pytorch model with configured hyperparamters.
@@ -248,6 +300,8 @@ class NeuralProphet:
             n_lags=self.n_lags,
             num_hidden_layers=self.config_model.num_hidden_layers,
             d_hidden=self.config_model.d_hidden,
+            ar_rank=self.config_model.ar_rank,
+            ar_lags=self.config_ar.ar_lags,
         )
         log.debug(self.model)
         return self.model
@@ -279,9 +333,10 @@ class NeuralProphet:
                     predict_mode=predict_mode,
                     covar_config=self.config_covar,
                     regressors_config=self.regressors_config,
+                    ar_lags=self.config_ar.ar_lags,
                 )
             )
-        df_time_dataset = time_dataset.GlobalTimeDataset(df_time_dataset)
+        df_time_dataset = time_dataset.GlobalTimeDataset(df_time_dataset, series_ids=self.local_modeling)
         return df_time_dataset
 
     def _handle_missing_data(self, df, freq, predicting):
@@ -295,105 +350,31 @@ class NeuralProphet:
         Returns:
             pre-processed df
         """
-        if self.n_lags == 0 and not predicting:
-            # we can drop rows with NA in y
-            sum_na = sum(df["y"].isna())
-            if sum_na > 0:
-                df = df[df["y"].notna()]
-                log.info("dropped {} NAN row in 'y'".format(sum_na))
+        return self._missing_data_handler(freq, predicting)(df)
 
-        # add missing dates for autoregression modelling
-        if self.n_lags > 0:
-            df, missing_dates = df_utils.add_missing_dates_nan(df, freq=freq)
-            if missing_dates > 0:
-                if self.impute_missing:
-                    log.info("{} missing dates added.".format(missing_dates))
-                else:
-                    raise ValueError(
-                        "{} missing dates found. Please preprocess data manually or set impute_missing to True.".format(
-                            missing_dates
-                        )
-                    )
+    def _missing_data_handler(self, freq, predicting):
+        """Picklable function handling the missing data of a single series with the settings of this model.
 
-        if self.regressors_config is not None:
-            # if future regressors, check that they are not nan at end, else drop
-            # we ignore missing events, as those will be filled in with zeros.
-            reg_nan_at_end = 0
-            for col in self.regressors_config.keys():
-                col_nan_at_end = 0
-                while len(df) > col_nan_at_end and df[col].isnull().iloc[-(1 + col_nan_at_end)]:
-                    col_nan_at_end += 1
-                reg_nan_at_end = max(reg_nan_at_end, col_nan_at_end)
-            if reg_nan_at_end > 0:
-                # drop rows at end due to missing future regressors
-                df = df[:-reg_nan_at_end]
-                log.info("Dropped {} rows at end due to missing future regressor values.".format(reg_nan_at_end))
-
-        df_end_to_append = None
-        nan_at_end = 0
-        while len(df) > nan_at_end and df["y"].isnull().iloc[-(1 + nan_at_end)]:
-            nan_at_end += 1
-        if nan_at_end > 0:
-            if predicting:
-                # allow nans at end - will re-add at end
-                if self.n_forecasts > 1 and self.n_forecasts < nan_at_end:
-                    # check that not more than n_forecasts nans, else drop surplus
-                    df = df[: -(nan_at_end - self.n_forecasts)]
-                    # correct new length:
-                    nan_at_end = self.n_forecasts
-                    log.info(
-                        "Detected y to have more NaN values than n_forecast can predict. "
-                        "Dropped {} rows at end.".format(nan_at_end - self.n_forecasts)
-                    )
-                df_end_to_append = df[-nan_at_end:]
-                df = df[:-nan_at_end]
-            else:
-                # training - drop nans at end
-                df = df[:-nan_at_end]
-                log.info(
-                    "Dropped {} consecutive nans at end. "
-                    "Training data can only be imputed up to last observation.".format(nan_at_end)
-                )
+        Args:
+            freq (str): data frequency
+            predicting (bool): see _handle_missing_data
 
-        # impute missing values
-        data_columns = []
-        if self.n_lags > 0:
-            data_columns.append("y")
-        if self.config_covar is not None:
-            data_columns.extend(self.config_covar.keys())
-        if self.regressors_config is not None:
-            data_columns.extend(self.regressors_config.keys())
-        if self.events_config is not None:
-            data_columns.extend(self.events_config.keys())
-        for column in data_columns:
-            sum_na = sum(df[column].isnull())
-            if sum_na > 0:
-                if self.impute_missing:
-                    # use 0 substitution for holidays and events missing values
-                    if self.events_config is not None and column in self.events_config.keys():
-                        df[column].fillna(0, inplace=True)
-                        remaining_na = 0
-                    else:
-                        df.loc[:, column], remaining_na = df_utils.fill_linear_then_rolling_avg(
-                            df[column],
-                            limit_linear=self.impute_limit_linear,
-                            rolling=self.impute_rolling,
-                        )
-                    log.info("{} NaN values in column {} were auto-imputed.".format(sum_na - remaining_na, column))
-                    if remaining_na > 0:
-                        raise ValueError(
-                            "More than {} consecutive missing values encountered in column {}. "
-                            "{} NA remain. Please preprocess data manually.".format(
-                                2 * self.impute_limit_linear + self.impute_rolling, column, remaining_na
-                            )
-                        )
-                else:  # fail because set to not impute missing
-                    raise ValueError(
-                        "Missing values found. " "Please preprocess data manually or set impute_missing to True."
-                    )
-        if df_end_to_append is not None:
-            df = df.append(df_end_to_append)
-        return df
+        Returns:
+            functools.partial of df_utils._handle_missing_data
+        """
+        return functools.partial(
+            df_utils._handle_missing_data,
+            freq=freq,
+            predicting=predicting,
+            n_lags=self.n_lags,
+            n_forecasts=self.n_forecasts,
+            impute_missing=self.impute_missing,
+            impute_limit_linear=self.impute_limit_linear,
+            impute_rolling=self.impute_rolling,
+            covariates=self.config_covar,
+            regressors=self.regressors_config,
+            events=self.events_config,
+        )
 
     def handle_missing_data(self, df, freq, predicting=False):
         """Checks, auto-imputes and normalizes new data
@@ -407,10 +388,7 @@ class NeuralProphet:
             pre-processed df
         """
         df_list = df_utils.create_df_list(df)
-        df_handled_missing_list = list()
-        for df in df_list:
-            df_handled_missing_list.append(self._handle_missing_data(df, freq, predicting))
-        df = df_handled_missing_list
+        df = df_utils.map_df_list(self._missing_data_handler(freq, predicting), df_list, num_workers=self.num_workers)
         return df[0] if len(df) == 1 else df
 
     def _check_dataframe(self, df, check_y=True, exogenous=True):
@@ -421,9 +399,10 @@ class NeuralProphet:
                 covariates=self.config_covar,
                 regressors=self.regressors_config,
                 events=self.events_config,
+                num_workers=self.num_workers,
             )
         else:
-            df = df_utils.check_dataframe(df, check_y=check_y)
+            df = df_utils.check_dataframe(df, check_y=check_y, num_workers=self.num_workers)
         return df
 
     def _validate_column_name(self, name, events=True, seasons=True, regressors=True, covariates=True):
@@ -485,6 +464,20 @@ class NeuralProphet:
         Returns:
             torch DataLoader
         """
+        df = self._prepare_train_data(df)
+        dataset = self._create_dataset(df, predict_mode=False)  # needs to be called after set_auto_seasonalities
+        n_data = sum([len(x) for x in df]) if isinstance(df, list) else len(df)
+        return self._init_train_loader_from_dataset(dataset, n_data)
+
+    def _prepare_train_data(self, df):
+        """Normalizes training data, initializing the data parameters and data dependent settings when not fitted.
+
+        Args:
+            df (pd.DataFrame): containing column 'ds', 'y' with training data
+
+        Returns:
+            df (pd.DataFrame), normalized
+        """
         if not self.fitted:
             self.data_params = df_utils.init_data_params(
                 df,
@@ -494,7 +487,12 @@ class NeuralProphet:
                 events_config=self.events_config,
                 local_modeling=self.local_modeling,
             )
-        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling)
+        df = df_utils.normalize(
+            df,
+            self.data_params,
+            local_modeling=self.local_modeling,
+            num_workers=self.num_workers,
+        )
         if not self.fitted:  # for now
             if self.config_trend.changepoints is not None:
                 self.config_trend.changepoints = df_utils.normalize(
@@ -505,10 +503,20 @@ class NeuralProphet:
             self.season_config = utils.set_auto_seasonalities(df, season_config=self.season_config)
             if self.country_holidays_config is not None:
                 self.country_holidays_config.init_holidays(df)
-        self.config_train.set_auto_batch_epoch(n_data=sum([len(x) for x in df]) if isinstance(df, list) else len(df))
-        self.config_train.apply_train_speed(batch=True, epoch=True)  # Might be removed from if
-        dataset = self._create_dataset(df, predict_mode=False)  # needs to be called after set_auto_seasonalities
+        return df
+
+    def _init_train_loader_from_dataset(self, dataset, n_data):
+        """Initiates training procedure on a prepared dataset.
+
+        Args:
+            dataset (torch Dataset): training samples, as created by _create_dataset
+            n_data (int): number of rows of the training data, to set batch size and epochs
 
+        Returns:
+            torch DataLoader
+        """
+        self.config_train.set_auto_batch_epoch(n_data=n_data)
+        self.config_train.apply_train_speed(batch=True, epoch=True)  # Might be removed from if
         loader = DataLoader(dataset, batch_size=self.config_train.batch_size, shuffle=True)
         if not self.fitted:
             self.model = self._init_model()  # needs to be called after set_auto_seasonalities
@@ -529,7 +537,12 @@ class NeuralProphet:
         Returns:
             torch DataLoader
         """
-        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling)
+        df = df_utils.normalize(
+            df,
+            self.data_params,
+            local_modeling=self.local_modeling,
+            num_workers=self.num_workers,
+        )
         dataset = self._create_dataset(df, predict_mode=False)
         loader = DataLoader(dataset, batch_size=min(1024, len(dataset)), shuffle=False, drop_last=False)
         return loader
@@ -555,7 +568,10 @@ class NeuralProphet:
             self.scheduler.step()
             if self.metrics is not None:
                 self.metrics.update(
-                    predicted=predicted.detach(), target=targets.detach(), values={"Loss": loss, "RegLoss": reg_loss}
+                    predicted=predicted.detach(),
+                    target=targets.detach(),
+                    values={"Loss": loss, "RegLoss": reg_loss},
+                    series=inputs["series"].numpy() if "series" in inputs else None,
                 )
         if self.metrics is not None:
             return self.metrics.compute(save=True)
@@ -626,7 +642,8 @@ class NeuralProphet:
             self.model.eval()
             for inputs, targets in loader:
                 predicted = self.model.forward(inputs)
-                val_metrics.update(predicted=predicted.detach(), target=targets.detach())
+                series = inputs["series"].numpy() if "series" in inputs else None
+                val_metrics.update(predicted=predicted.detach(), target=targets.detach(), series=series)
             val_metrics = val_metrics.compute(save=True)
         return val_metrics
 
@@ -648,17 +665,39 @@ class NeuralProphet:
                 log.warning("ignoring supplied df_val as no metrics are specified.")
             return self._train_minimal(df=df, progress_bar=progress_bar)
 
-        # set up data loader
+        # set up data loaders
         loader = self._init_train_loader(df)
+        val_loader = self._init_val_loader(df_val) if df_val is not None else None
+        return self._train_with_loaders(
+            loader,
+            val_loader,
+            progress_bar=progress_bar,
+            plot_live_loss=plot_live_loss,
+            progress_print=progress_print,
+        )
+
+    def _train_with_loaders(
+        self, loader, val_loader=None, progress_bar=True, plot_live_loss=False, progress_print=True
+    ):
+        """Execute model training procedure for a configured number of epochs, on initiated data loaders.
 
+        Args:
+            loader (torch DataLoader): Training Dataloader, as returned by _init_train_loader
+            val_loader (torch DataLoader): Validation Dataloader, as returned by _init_val_loader
+            progress_bar (bool): display updating progress bar
+            plot_live_loss (bool): plot live training loss,
+                requires [live] install or livelossplot package installed.
+            progress_print (bool): if no progress_bar, whether to print out progress
+        Returns:
+            df with metrics
+        """
         # set up Metrics
         if self.highlight_forecast_step_n is not None:
             self.metrics.add_specific_target(target_pos=self.highlight_forecast_step_n - 1)
         if not self.normalize == "off":
             self.metrics.set_shift_scale((self.data_params["y"].shift, self.data_params["y"].scale))
-        val = df_val is not None
+        val = val_loader is not None
         if val:
-            val_loader = self._init_val_loader(df_val)
             val_metrics = metrics.MetricsCollection([m.new() for m in self.metrics.batch_metrics])
 
         # set up printing and plotting
@@ -888,6 +927,87 @@ class NeuralProphet:
 
         return folds_val, folds_test
 
+    def crossvalidate(self, df, freq, k=5, fold_pct=0.1, fold_overlap_pct=0.5, num_processes=1):
+        """Trains and evaluates a model on each of k crossvalidation folds.
+
+        The folds are those of crossvalidation_split_df, but the series is checked, imputed and tabularized
+        only once, and each fold trains on a subset of the samples of the shared dataset.
+        As when fitting each fold, the data parameters, automatic seasonalities and holidays of a fold are set
+        from its training data. The shared samples are renormalized to the data parameters of each fold,
+        folds with other seasonalities or holidays than the largest fold get their own dataset.
+        The model is not fitted, it is the template of the fold models.
+
+        Args:
+            df (pd.DataFrame): data
+            freq (str):Data step sizes. Frequency of data recording,
+                Any valid frequency for pd.date_range, such as '5min', 'D' or 'MS'
+            k (int): number of CV folds
+            fold_pct (float): percentage of overall samples to be in each fold
+            fold_overlap_pct (float): percentage of overlap between the validation folds.
+            num_processes (int): number of processes training the folds in parallel,
+                which share the tensors of the dataset.
+
+        Returns:
+            list of k metrics dataframes, as returned by fit with a validation_df
+        """
+        if isinstance(df, list):
+            raise NotImplementedError("Crossvalidation not implemented for global modelling")
+        if self.fitted:
+            raise ValueError("Crossvalidation requires an unfitted model.")
+        if self.metrics is None:
+            raise ValueError("Crossvalidation requires metrics to evaluate the folds.")
+        df = self._check_dataframe(df, check_y=True, exogenous=True)
+        df = self.handle_missing_data(df, freq=freq)
+        folds = df_utils.crossvalidation_split_indices(
+            len(df),
+            n_lags=self.n_lags,
+            n_forecasts=self.n_forecasts,
+            k=k,
+            fold_pct=fold_pct,
+            fold_overlap_pct=fold_overlap_pct,
+        )
+        # the model itself is left unchanged, each fold is prepared on a copy with its own training rows
+        template = copy.deepcopy(self)
+        template.local_modeling = False
+        template.data_freq = freq
+        extra_rows = self.n_lags + self.n_forecasts - 1
+        fold_models = list()
+        for train, _ in folds:
+            m = copy.deepcopy(template)
+            m._prepare_train_data(df.iloc[: len(train) + extra_rows].copy())
+            fold_models.append(m)
+
+        def features(m):
+            seasonalities = None
+            if m.season_config is not None:
+                seasonalities = [(name, period.resolution) for name, period in m.season_config.periods.items()]
+            holidays = None if m.country_holidays_config is None else sorted(m.country_holidays_config.holiday_names)
+            return seasonalities, holidays
+
+        # the largest fold has the most features, other folds with the same features share its dataset
+        shared = fold_models[-1]
+        dataset = shared._create_dataset(df_utils.normalize(df.copy(), shared.data_params), predict_mode=False)
+        datasets = [dataset]
+        args = list()
+        for m, (train, val) in zip(fold_models, folds):
+            if m is shared:
+                args.append((m, dataset, train, val, len(train) + extra_rows, None))
+            elif features(m) == features(shared):
+                args.append((m, dataset, train, val, len(train) + extra_rows, shared.data_params))
+            else:
+                fold_dataset = m._create_dataset(df_utils.normalize(df.copy(), m.data_params), predict_mode=False)
+                datasets.append(fold_dataset)
+                args.append((m, fold_dataset, train, val, len(train) + extra_rows, None))
+        if num_processes > 1 and k > 1:
+            # the pool pickles the tensors as handles to shared memory, instead of copying them
+            for fold_dataset in datasets:
+                fold_dataset.share_memory()
+            with Pool(min(num_processes, k)) as pool:
+                folds_metrics = pool.map(_train_fold, args)
+        else:
+            folds_metrics = [_train_fold(fold_args) for fold_args in args]
+        return folds_metrics
+
     def fit(
         self,
         df,
@@ -953,6 +1073,7 @@ class NeuralProphet:
         if epochs is not None:
             self.config_train.epochs = default_epochs
         self.fitted = True
+        self._model_changed()
         return metrics_df
 
     def test(self, df):
@@ -976,12 +1097,11 @@ class NeuralProphet:
             log.warning(
                 "Not extending df into future as no periods specified." "You can call predict directly instead."
             )
-        df = df.copy(deep=True)
-        last_date = pd.to_datetime(df["ds"].copy(deep=True).dropna()).sort_values().max()
+        last_date = pd.to_datetime(df["ds"].dropna()).max()
         if events_df is not None:
-            events_df = events_df.copy(deep=True).reset_index(drop=True)
+            events_df = events_df.reset_index(drop=True)
         if regressors_df is not None:
-            regressors_df = regressors_df.copy(deep=True).reset_index(drop=True)
+            regressors_df = regressors_df.reset_index(drop=True)
         n_lags = 0 if self.n_lags is None else self.n_lags
         if periods is None:
             periods = 1 if n_lags == 0 else self.n_forecasts
@@ -1021,7 +1141,8 @@ class NeuralProphet:
         if (n_historic_predictions + n_lags) == 0:
             df = pd.DataFrame(columns=df.columns)
         else:
-            df = df[-(n_lags + n_historic_predictions) :]
+            # only copy the rows needed, as they are modified when checked
+            df = df.iloc[-(n_lags + n_historic_predictions) :].copy()
 
         if len(df) > 0:
             if len(df.columns) == 1 and "ds" in df:
@@ -1057,7 +1178,7 @@ class NeuralProphet:
                 regressors_df=regressors_df,
             )
             if len(df) > 0:
-                df = df.append(future_df)
+                df = pd.concat((df, future_df), ignore_index=True)
             else:
                 df = future_df
         df.reset_index(drop=True, inplace=True)
@@ -1066,9 +1187,7 @@ class NeuralProphet:
     def _get_maybe_extend_periods(self, df):
         n_lags = 0 if self.n_lags is None else self.n_lags
         periods_add = 0
-        nan_at_end = 0
-        while len(df) > nan_at_end and df["y"].isnull().iloc[-(1 + nan_at_end)]:
-            nan_at_end += 1
+        nan_at_end = int(df_utils.count_nan_at_end(df[["y"]].values)[0])
         if n_lags > 0:
             if self.regressors_config is None:
                 # if dataframe has already been extended into future,
@@ -1085,24 +1204,68 @@ class NeuralProphet:
         if periods_add > 0:
             # This does not include future regressors or events.
             # periods should be 0 if those are configured.
-            last_date = pd.to_datetime(df["ds"].copy(deep=True)).sort_values().max()
+            last_date = pd.to_datetime(df["ds"]).max()
             future_df = df_utils.make_future_df(
                 df_columns=df.columns,
                 last_date=last_date,
                 periods=periods_add,
                 freq=self.data_freq,
             )
-            df = df.append(future_df)
-            df.reset_index(drop=True, inplace=True)
+            df = pd.concat((df, future_df), ignore_index=True)
         return df, periods_add
 
-    def _prepare_dataframe_to_predict(self, df):
-        df = df.copy(deep=True)
+    def _model_columns(self):
+        """Names of the columns of a dataframe which are used by the model.
+
+        Returns:
+            list of str: 'ds', 'y' and the names of lagged regressors, future regressors and events
+        """
+        columns = ["ds", "y"]
+        if self.config_covar is not None:
+            columns.extend(self.config_covar.keys())
+        if self.regressors_config is not None:
+            columns.extend(self.regressors_config.keys())
+        if self.events_config is not None:
+            columns.extend(self.events_config.keys())
+        return columns
+
+    def _series_positions(self, df_list, series=None):
+        """Position of each df among the series the model was fitted with, to select its scaling values.
+
+        Args:
+            df_list (list of pd.DataFrame): dataframes to predict
+            series (int or list of int): positions of the dataframes among the fitted series,
+                defaults to all fitted series in order
+
+        Returns:
+            list of int (or None if the scaling values are shared by all series)
+        """
+        if not self.local_modeling:
+            return [None] * len(df_list)
+        n_series = df_utils.n_series_of(self.data_params)
+        if series is None:
+            if len(df_list) != n_series:
+                raise ValueError(
+                    "Locally normalized data requires the list of all {} series in the fitted order, "
+                    "or the position of each series.".format(n_series)
+                )
+            return list(range(n_series))
+        positions = [series] if np.ndim(series) == 0 else list(series)
+        if len(positions) != len(df_list):
+            raise ValueError("Expected one series position per dataframe, got {}.".format(len(positions)))
+        for position in positions:
+            if not 0 <= position < n_series:
+                raise ValueError("Series position {} out of range for {} fitted series.".format(position, n_series))
+        return [int(position) for position in positions]
+
+    def _prepare_dataframe_to_predict(self, df, series=None):
         # check if received pre-processed df
         if "y_scaled" in df.columns or "t" in df.columns:
             raise ValueError(
                 "DataFrame has already been normalized. " "Please provide raw dataframe or future dataframe."
             )
+        # selecting the used columns copies only those, as they are modified in place below
+        df = df[[name for name in self._model_columns() if name in df.columns]]
 
         # Checks
         n_lags = 0 if self.n_lags is None else self.n_lags
@@ -1118,13 +1281,12 @@ class NeuralProphet:
             # fill in missing nans except for nans at end
             df = self.handle_missing_data(df, freq=self.data_freq, predicting=True)
         # normalize
-        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling)
+        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling, series=series)
         df.reset_index(drop=True, inplace=True)
         return df
 
     def make_future_dataframe(self, df, events_df=None, regressors_df=None, periods=None, n_historic_predictions=False):
         df_list = df_utils.create_df_list(df)
-        df_future_dataframe = list()
         df_list_events = (
             events_df.copy() if isinstance(events_df, list) else df_utils.make_list_dataframes(events_df, len(df_list))
         )
@@ -1133,6 +1295,7 @@ class NeuralProphet:
             if isinstance(regressors_df, list)
             else df_utils.make_list_dataframes(regressors_df, len(df_list))
         )
+        df_future_dataframe = list()
         for (df, events_df, regressors_df) in zip(df_list, df_list_events, df_list_regressors):
             df_future_dataframe.append(
                 self._make_future_dataframe(df, events_df, regressors_df, periods, n_historic_predictions)
@@ -1168,50 +1331,88 @@ class NeuralProphet:
 
         return df_out.reset_index(drop=True)
 
-    def _predict_raw(self, df, include_components=False):
+    def _get_inference_model(self):
+        """Get the model to predict with, according to the configured inference precision.
+
+        Returns:
+            TimeNet model, with dynamically quantized Linear layers if inference_precision is 'int8'
+        """
+        if self.inference_precision != "int8":
+            return self.model
+        if self.quantized_model is None:
+            self.quantized_model = torch.ao.quantization.quantize_dynamic(
+                copy.deepcopy(self.model), {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return self.quantized_model
+
+    def _predict_raw(self, df, include_components=False, series=None):
         """Runs the model to make predictions.
 
         Predictions are returned in raw vector format without decomposition.
         Predictions are given on a forecast origin basis, not on a target basis.
+        The windows of all dataframes in a list are packed into one dataset and predicted in shared batches.
         Args:
-            df (pandas DataFrame): Dataframe with columns 'ds' datestamps, 'y' time series values and
-                other external variables
+            df (pandas DataFrame or list of Dataframes): Dataframe with columns 'ds' datestamps,
+                'y' time series values and other external variables
             include_components (bool): Whether to return individual components of forecast
+            series (list of int): with local normalization, position of each df among the fitted series,
+                defaults to all fitted series in order
 
         Returns:
             dates (pd.Series): timestamps referring to the start of the predictions.
             predicted (np.array): Array containing the forecasts
             components (Dict[np.array]): Dictionary of components containing an array
                 of each components contribution to the forecast
+            (each a list with one entry per dataframe, if df is a list)
         """
-        if "y_scaled" not in df.columns or "t" not in df.columns:
-            raise ValueError("Received unpepared dataframe to predict. " "Please call predict_dataframe_to_predict.")
-        dataset = self._create_dataset(df, predict_mode=True)
-        loader = DataLoader(dataset, batch_size=min(1024, len(df)), shuffle=False, drop_last=False)
-        if self.n_forecasts > 1:
-            dates = df["ds"].iloc[self.n_lags : -self.n_forecasts + 1]
-        else:
-            dates = df["ds"].iloc[self.n_lags :]
+        df_list = df_utils.create_df_list(df)
+        for df_i in df_list:
+            if "y_scaled" not in df_i.columns or "t" not in df_i.columns:
+                raise ValueError(
+                    "Received unpepared dataframe to predict. " "Please call predict_dataframe_to_predict."
+                )
+        dataset = self._create_dataset(df_list, predict_mode=True)
+        batch_size = 1024
         predicted_vectors = list()
         component_vectors = None
 
-        with torch.no_grad():
-            self.model.eval()
-            for inputs, _ in loader:
-                predicted = self.model.forward(inputs)
-                predicted_vectors.append(predicted.detach().numpy())
+        model = self._get_inference_model()
+        if self.inference_precision == "bfloat16":
+            autocast = torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        else:
+            autocast = contextlib.nullcontext()
+        with torch.no_grad(), autocast:
+            model.eval()
+            # slicing the dataset tensors avoids collating the batches sample by sample
+            for start in range(0, len(dataset), batch_size):
+                inputs, _ = dataset[start : start + batch_size]
+                predicted = model.forward(inputs)
+                predicted_vectors.append(predicted.detach().float().numpy())
 
                 if include_components:
-                    components = self.model.compute_components(inputs)
+                    components = model.compute_components(inputs)
                     if component_vectors is None:
-                        component_vectors = {name: [value.detach().numpy()] for name, value in components.items()}
+                        component_vectors = {
+                            name: [value.detach().float().numpy()] for name, value in components.items()
+                        }
                     else:
                         for name, value in components.items():
-                            component_vectors[name].append(value.detach().numpy())
+                            component_vectors[name].append(value.detach().float().numpy())
 
-        predicted = np.concatenate(predicted_vectors)
+        if len(predicted_vectors) > 0:
+            predicted = np.concatenate(predicted_vectors)
+        else:
+            predicted = np.zeros((0, self.n_forecasts))
         scale_y, shift_y = self.data_params["y"].scale, self.data_params["y"].shift
-        predicted = predicted * scale_y + shift_y
+        if np.ndim(scale_y) > 0:
+            # locally normalized: scaling values of the series of each sample
+            positions = np.repeat(self._series_positions(df_list, series), dataset.lengths)
+            scale_y, shift_y = scale_y[positions], shift_y[positions]
+
+        def per_sample(params, values):
+            return np.reshape(params, (-1,) + (1,) * (values.ndim - 1)) if np.ndim(params) > 0 else params
+
+        predicted = predicted * per_sample(scale_y, predicted) + per_sample(shift_y, predicted)
 
         if include_components:
             components = {name: np.concatenate(value) for name, value in component_vectors.items()}
@@ -1233,12 +1434,28 @@ class NeuralProphet:
                     continue
 
                 # scale additive components
-                components[name] = value * scale_y
+                components[name] = value * per_sample(scale_y, value)
                 if "trend" in name:
-                    components[name] += shift_y
+                    components[name] += per_sample(shift_y, value)
         else:
             components = None
-        return dates, predicted, components
+
+        # split the predictions back into the original dataframes
+        offsets = dataset.offsets
+        dates_list, predicted_list, components_list = list(), list(), list()
+        for i, df_i in enumerate(df_list):
+            if self.n_forecasts > 1:
+                dates_list.append(df_i["ds"].iloc[self.n_lags : -self.n_forecasts + 1])
+            else:
+                dates_list.append(df_i["ds"].iloc[self.n_lags :])
+            predicted_list.append(predicted[offsets[i] : offsets[i + 1]])
+            if components is None:
+                components_list.append(None)
+            else:
+                components_list.append({name: value[offsets[i] : offsets[i + 1]] for name, value in components.items()})
+        if isinstance(df, list):
+            return dates_list, predicted_list, components_list
+        return dates_list[0], predicted_list[0], components_list[0]
 
     def _convert_raw_predictions_to_raw_df(self, dates, predicted, components=None):
         """Turns forecast-origin-wise predictions into forecast-target-wise predictions.
@@ -1285,45 +1502,58 @@ class NeuralProphet:
         """
         cols = ["ds", "y"]  # cols to keep from df
         df_forecast = pd.concat((df[cols],), axis=1)
+        n_rows = len(df_forecast)
+        y = df_forecast["y"].values.astype(float)
 
         # create a line for each forecast_lag
         # 'yhat<i>' is the forecast for 'y' at 'ds' from i steps ago.
+        yhats = self._forecast_origin_to_target(predicted, n_rows)
+        data = OrderedDict({})
         for forecast_lag in range(1, self.n_forecasts + 1):
-            forecast = predicted[:, forecast_lag - 1]
-            pad_before = self.n_lags + forecast_lag - 1
-            pad_after = self.n_forecasts - forecast_lag
-            yhat = np.concatenate(([None] * pad_before, forecast, [None] * pad_after))
-            df_forecast["yhat{}".format(forecast_lag)] = yhat
-            df_forecast["residual{}".format(forecast_lag)] = yhat - df_forecast["y"]
-        if components is None:
-            return df_forecast
-
-        # else add components
-        lagged_components = [
-            "ar",
-        ]
-        if self.config_covar is not None:
-            for name in self.config_covar.keys():
-                lagged_components.append("lagged_regressor_{}".format(name))
-        for comp in lagged_components:
-            if comp in components:
-                for forecast_lag in range(1, self.n_forecasts + 1):
-                    forecast = components[comp][:, forecast_lag - 1]
-                    pad_before = self.n_lags + forecast_lag - 1
-                    pad_after = self.n_forecasts - forecast_lag
-                    yhat = np.concatenate(([None] * pad_before, forecast, [None] * pad_after))
-                    df_forecast["{}{}".format(comp, forecast_lag)] = yhat
-
-        # only for non-lagged components
-        for comp in components:
-            if comp not in lagged_components:
-                forecast_0 = components[comp][0, :]
-                forecast_rest = components[comp][1:, self.n_forecasts - 1]
-                yhat = np.concatenate(([None] * self.n_lags, forecast_0, forecast_rest))
-                df_forecast[comp] = yhat
+            data["yhat{}".format(forecast_lag)] = yhats[:, forecast_lag - 1]
+            data["residual{}".format(forecast_lag)] = yhats[:, forecast_lag - 1] - y
+
+        if components is not None:
+            lagged_components = [
+                "ar",
+            ]
+            if self.config_covar is not None:
+                for name in self.config_covar.keys():
+                    lagged_components.append("lagged_regressor_{}".format(name))
+            for comp in lagged_components:
+                if comp in components:
+                    values = self._forecast_origin_to_target(components[comp], n_rows)
+                    for forecast_lag in range(1, self.n_forecasts + 1):
+                        data["{}{}".format(comp, forecast_lag)] = values[:, forecast_lag - 1]
+
+            # only for non-lagged components
+            for comp in components:
+                if comp not in lagged_components:
+                    values = np.full(n_rows, np.nan)
+                    values[self.n_lags : self.n_lags + self.n_forecasts] = components[comp][0, :]
+                    values[self.n_lags + self.n_forecasts :] = components[comp][1:, self.n_forecasts - 1]
+                    data[comp] = values
+        df_forecast = pd.concat((df_forecast, pd.DataFrame(data, index=df_forecast.index)), axis=1)
         return df_forecast
 
-    def predict(self, df, decompose=True, raw=False):
+    def _forecast_origin_to_target(self, values, n_rows):
+        """Shifts forecast-origin-wise values to the rows of their targets.
+
+        Args:
+            values (np.array): forecast-origin-wise values, dims: (n_origins, n_forecasts)
+            n_rows (int): number of rows in the forecast dataframe
+
+        Returns:
+            np.array, float, dims: (n_rows, n_forecasts), where column i holds the i+1 step ahead
+                values at the row of their target, padded with NaN.
+        """
+        shifted = np.full((n_rows, self.n_forecasts), np.nan)
+        steps = np.arange(self.n_forecasts)
+        rows = self.n_lags + np.arange(len(values))[:, None] + steps[None, :]
+        shifted[rows, steps[None, :]] = values
+        return shifted
+
+    def predict(self, df, decompose=True, raw=False, series=None):
         """Runs the model to make predictions.
 
         Expects all data needed to be present in dataframe.
@@ -1336,6 +1566,8 @@ class NeuralProphet:
             decompose (bool): Whether to add individual components of forecast to the dataframe
             raw (bool): Whether return the raw forecasts sorted by forecast start date
                 False (default): returns forecasts sorted by target (highlighting forecast age)
+            series (int or list of int): with local normalization, position of each df among the series
+                the model was fitted with. Defaults to the list of all series, in the fitted order.
         Returns:
             if raw:
                 df_raw (pandas DataFrame): columns 'ds', 'y', and ['step<i>']
@@ -1352,13 +1584,29 @@ class NeuralProphet:
         if self.fitted is False:
             log.error("Model has not been fitted. Predictions will be random.")
         df_list = df_utils.create_df_list(df)
-        df_list_predict = list()
-        for df in df_list:
-            df = df.copy(deep=True)
+        positions = self._series_positions(df_list, series)
+        cache_key = None
+        if self.predict_cache_size > 0:
+            cache_key = self._predict_cache_key(df_list, decompose, raw, positions)
+            if cache_key in self.predict_cache:
+                self.predict_cache.move_to_end(cache_key)
+                df_list_predict = [fcst.copy() for fcst in self.predict_cache[cache_key]]
+                return df_list_predict[0] if len(df_list_predict) == 1 else df_list_predict
+        df_list_prepared = list()
+        periods_added_list = list()
+        for df, series in zip(df_list, positions):
             # to get all forecasteable values with df given, maybe extend into future:
             df, periods_added = self._maybe_extend_df(df)
-            df = self._prepare_dataframe_to_predict(df)
-            dates, predicted, components = self._predict_raw(df, include_components=decompose)
+            df_list_prepared.append(self._prepare_dataframe_to_predict(df, series=series))
+            periods_added_list.append(periods_added)
+        # predict all series at once, in shared batches
+        dates_list, predicted_list, components_list = self._predict_raw(
+            df_list_prepared, include_components=decompose, series=positions
+        )
+        df_list_predict = list()
+        for df, periods_added, dates, predicted, components in zip(
+            df_list_prepared, periods_added_list, dates_list, predicted_list, components_list
+        ):
             if raw:
                 fcst = self._convert_raw_predictions_to_raw_df(dates, predicted, components)
                 if periods_added > 0:
@@ -1368,31 +1616,305 @@ class NeuralProphet:
                 if periods_added > 0:
                     fcst = fcst[:-periods_added]
             df_list_predict.append(fcst)
+        if cache_key is not None:
+            self.predict_cache[cache_key] = [fcst.copy() for fcst in df_list_predict]
+            if len(self.predict_cache) > self.predict_cache_size:
+                self.predict_cache.popitem(last=False)
         df = df_list_predict[0] if len(df_list_predict) == 1 else df_list_predict
         return df
 
-    def _predict_trend(self, df):
+    def predict_latest(self, df, events_df=None, regressors_df=None, decompose=False, series=None):
+        """Predict only the next n_forecasts steps after the end of df.
+
+        Only the last n_lags rows of df are preprocessed and a single forecast is made,
+        so that the latency does not grow with the length of the history.
+        Matches the latest forecast of predict(make_future_dataframe(df, events_df, regressors_df)),
+        but also includes the effect of events which happened up to upper_window steps before the lags.
+        Args:
+            df (pandas DataFrame): history with columns 'ds', 'y' and lagged regressors,
+                and event columns as created by create_df_with_events.
+            events_df (pandas DataFrame): future events, as for make_future_dataframe
+            regressors_df (pandas DataFrame): future values of future regressors, as for make_future_dataframe
+            decompose (bool): Whether to add the individual components of the forecast
+            series (int): with local normalization, position of df among the series the model was fitted with
+
+        Returns:
+            df_forecast (pandas DataFrame): one row per forecast step, with columns 'ds', 'yhat'
+                and the components of the forecast if decompose.
+        """
+        if self.fitted is False:
+            raise ValueError("Model has not been fitted.")
+        positions = self._series_positions([df], series)
+        pad = self._max_events_upper_window()
+        # at least the last row, to extend from its datestamp
+        n_history = min(len(df), max(1, self.n_lags + pad))
+        if n_history < max(1, self.n_lags):
+            raise ValueError("Insufficient data for a prediction")
+        history = df.iloc[len(df) - n_history :]
+        df = self._make_future_dataframe(
+            history,
+            events_df=events_df,
+            regressors_df=regressors_df,
+            periods=None,
+            n_historic_predictions=n_history - self.n_lags,
+        )
+        df = self._prepare_dataframe_to_predict(df, series=positions[0])
+        _, predicted, components = self._predict_raw(df, include_components=decompose, series=positions)
+        df_forecast = pd.DataFrame({"ds": df["ds"].iloc[-self.n_forecasts :].values, "yhat": predicted[-1]})
+        if decompose:
+            for name, value in components.items():
+                df_forecast[name] = value[-1]
+        return df_forecast
+
+    def _max_events_upper_window(self):
+        """Events with an upper window may affect the future from up to upper_window steps before the lags.
+
+        Returns:
+            int, largest upper window of all events and country holidays, 0 if none
+        """
+        pad = 0
+        if self.events_config is not None:
+            pad = max([pad] + [config.upper_window for config in self.events_config.values()])
+        if self.country_holidays_config is not None:
+            pad = max(pad, self.country_holidays_config.upper_window)
+        return pad
+
+    def predict_rollout(self, df, horizon, events_df=None, regressors_df=None, series=None):
+        """Forecast beyond n_forecasts steps, by feeding the forecasts back as lags.
+
+        The forecast of the next n_forecasts steps is used as the most recent lags of the following forecast,
+        until the horizon is reached. All series of a list are forecasted in the same batch per round.
+        The inputs of all rounds are prepared once, the rounds themselves only update the lags.
+        The history must end with observed values, and models with lagged regressors are not supported.
+        Args:
+            df (pandas DataFrame or list of Dataframes): history with columns 'ds', 'y',
+                and event columns as created by create_df_with_events.
+            horizon (int): number of steps to forecast
+            events_df (pandas DataFrame or list of Dataframes): future events, as for make_future_dataframe
+            regressors_df (pandas DataFrame or list of Dataframes): future values of future regressors,
+                with at least horizon rows
+            series (int or list of int): with local normalization, position of each df among the series
+                the model was fitted with. Defaults to the list of all series, in the fitted order.
+
+        Returns:
+            df_forecast (pandas DataFrame or list of Dataframes): one row per forecast step,
+                with columns 'ds' and 'yhat'
+        """
+        if self.fitted is False:
+            raise ValueError("Model has not been fitted.")
+        if self.n_lags == 0:
+            raise ValueError(
+                "Rollout requires auto-regression (n_lags > 0). "
+                "Please use make_future_dataframe with periods instead."
+            )
+        if self.config_covar is not None:
+            raise ValueError("Rollout does not support lagged regressors, as their future values are unknown.")
+        if horizon < 1:
+            raise ValueError("Horizon must be at least one step.")
+        df_list = df_utils.create_df_list(df)
+        series_positions = self._series_positions(df_list, series)
+        df_list_events = (
+            events_df if isinstance(events_df, list) else df_utils.make_list_dataframes(events_df, len(df_list))
+        )
+        df_list_regressors = (
+            regressors_df
+            if isinstance(regressors_df, list)
+            else df_utils.make_list_dataframes(regressors_df, len(df_list))
+        )
+        n_rounds = int(np.ceil(horizon / self.n_forecasts))
+        periods = n_rounds * self.n_forecasts
+        pad = self._max_events_upper_window()
+
+        # prepare the inputs of all rounds at once, with placeholders for the future values of y
+        model_columns = self._model_columns()
+        df_list_prepared = list()
+        starts = list()
+        for df, events_df, regressors_df, series in zip(df_list, df_list_events, df_list_regressors, series_positions):
+            if len(df) < self.n_lags:
+                raise ValueError("Insufficient data for a prediction")
+            history = df.iloc[-(self.n_lags + pad) :]
+            if self.regressors_config is not None:
+                if regressors_df is None or len(regressors_df) < horizon:
+                    raise ValueError("Future values of all user specified regressors needed for the full horizon.")
+                # the steps after the horizon are discarded, their regressors only need to be valid values
+                regressors_df = regressors_df.iloc[:horizon].reset_index(drop=True)
+                regressors_df = regressors_df.reindex(range(periods), method="ffill")
+            future_df = df_utils.make_future_df(
+                df_columns=history.columns,
+                last_date=pd.to_datetime(history["ds"]).max(),
+                periods=periods,
+                freq=self.data_freq,
+                events_config=self.events_config,
+                events_df=events_df,
+                regressor_config=self.regressors_config,
+                regressors_df=regressors_df,
+            )
+            # the history is imputed on its own, so that the future rows do not affect it
+            history = self._prepare_dataframe_to_predict(history, series=series)
+            start = len(history)
+            if start < self.n_lags:
+                raise ValueError("Insufficient data for a prediction")
+            if history["y_scaled"].isnull().values[-self.n_lags :].any():
+                raise ValueError("History to roll out from must not end with missing values.")
+            future_df = future_df[[name for name in model_columns if name in future_df.columns]]
+            future_df = df_utils.normalize(
+                future_df, self.data_params, local_modeling=self.local_modeling, series=series
+            )
+            # placeholders, the lags of each round are replaced by the forecasts of the previous rounds
+            future_df["y_scaled"] = 0.0
+            df_list_prepared.append(pd.concat((history, future_df), ignore_index=True))
+            starts.append(start)
+        dataset = self._create_dataset(df_list_prepared, predict_mode=True)
+
+        # sample of each round and series, and buffer of the past and forecasted values of y_scaled
+        starts = np.array(starts)
+        samples = dataset.offsets[:-1] + starts - self.n_lags
+        samples = samples[None, :] + self.n_forecasts * np.arange(n_rounds)[:, None]
+        y_scaled = np.zeros((len(df_list), self.n_lags + periods))
+        for i, (df, start) in enumerate(zip(df_list_prepared, starts)):
+            y_scaled[i, : self.n_lags] = df["y_scaled"].values[start - self.n_lags : start]
+        positions = utils.lags_to_window_positions(self.model.ar_lags, self.n_lags)
+
+        model = self._get_inference_model()
+        if self.inference_precision == "bfloat16":
+            autocast = torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        else:
+            autocast = contextlib.nullcontext()
+        with torch.no_grad(), autocast:
+            model.eval()
+            for r in range(n_rounds):
+                inputs, _ = dataset[torch.from_numpy(samples[r])]
+                origin = r * self.n_forecasts
+                inputs["lags"] = torch.from_numpy(y_scaled[:, origin + positions]).float()
+                predicted = model.forward(inputs)
+                y_scaled[:, self.n_lags + origin : self.n_lags + origin + self.n_forecasts] = predicted.float().numpy()
+
+        yhat = y_scaled[:, self.n_lags : self.n_lags + horizon]
+        scale_y, shift_y = self.data_params["y"].scale, self.data_params["y"].shift
+        if np.ndim(scale_y) > 0:
+            # locally normalized: scaling values of each series
+            scale_y = np.reshape(scale_y[series_positions], (-1, 1))
+            shift_y = np.reshape(shift_y[series_positions], (-1, 1))
+        yhat = yhat * scale_y + shift_y
+        df_list_forecast = list()
+        for i, (df, start) in enumerate(zip(df_list_prepared, starts)):
+            df_list_forecast.append(pd.DataFrame({"ds": df["ds"].values[start : start + horizon], "yhat": yhat[i]}))
+        return df_list_forecast[0] if len(df_list_forecast) == 1 else df_list_forecast
+
+    def evaluate_trend_and_seasonality(self, dates, series=None):
+        """Evaluate the trend and seasonality components at arbitrary dates.
+
+        The components are closed-form functions of time, evaluated directly from the model parameters,
+        without dataframe checks, normalization or building a dataset. Dates need not be sorted or regular.
+        Args:
+            dates (np.array, pd.Series or pd.DatetimeIndex, datetime-like): dates to evaluate at
+            series (int): with local normalization, position of the series among the series the model
+                was fitted with, to scale the components with its scaling values
+
+        Returns:
+            OrderedDict of np.array, each of len(dates): 'trend' and each seasonality by name.
+                Multiplicative seasonalities are relative to the trend, all others in the scale of 'y'.
+        """
+        if self.model is None:
+            raise ValueError("Model has not been fitted.")
+        dates = np.asarray(dates, dtype="datetime64[ns]").astype(np.int64)
+        components = OrderedDict({"trend": self._trend_at(dates, series=series)})
+        components.update(self._seasonalities_at(dates, series=series))
+        return components
+
+    def _trend_at(self, dates, series=None):
+        """Trend at the given dates.
+
+        The segment of each date is found by binary search on the changepoints,
+        and the rates and offsets of the segments are accumulated once.
+        Args:
+            dates (np.array, int): dates as nanoseconds since epoch
+            series (int): with local normalization, position of the series among the fitted series
+
+        Returns:
+            np.array, float: trend in the scale of 'y'
+        """
+
+        def to_numpy(tensor):
+            return tensor.detach().numpy().astype(np.float64)
+
+        model = self.model
+        shift = pd.Timestamp(self.data_params["ds"].shift).value
+        scale = pd.Timedelta(self.data_params["ds"].scale).value
+        t = (dates - shift) / scale
+        if self.config_trend.growth == "off":
+            trend = np.zeros_like(t)
+        elif int(self.config_trend.n_changepoints) == 0:
+            trend = to_numpy(model.trend_k0) * t
+        else:
+            k0 = to_numpy(model.trend_k0)
+            changepoints_t = to_numpy(model.trend_changepoints_t)[1:]
+            deltas = to_numpy(model.trend_deltas)
+            # compared in float32 as in the model, so that dates at a changepoint fall into the same segment
+            segment_id = np.searchsorted(model.trend_changepoints_t.numpy()[1:], t.astype(np.float32), side="right")
+            k_t = deltas[segment_id]
+            if not model.segmentwise_trend:
+                k_t = k_t + np.concatenate(([0.0], np.cumsum(deltas[:-1])))[segment_id]
+            if self.config_trend.growth != "discontinuous":
+                if model.segmentwise_trend:
+                    deltas = deltas - np.concatenate((k0, deltas[:-1]))
+                gammas = -changepoints_t * deltas[1:]
+                m_t = np.concatenate(([0.0], np.cumsum(gammas)))[segment_id]
+            else:
+                m_t = to_numpy(model.trend_m)[segment_id]
+            trend = (k0 + k_t) * t + m_t
+        trend = trend + to_numpy(model.bias)
+        y_params = df_utils.data_params_of_series(self.data_params, series)["y"]
+        return trend * y_params.scale + y_params.shift
+
+    def _seasonalities_at(self, dates, series=None):
+        """Seasonality components at the given dates.
+
+        Args:
+            dates (np.array, int): dates as nanoseconds since epoch
+            series (int): with local normalization, position of the series among the fitted series
+
+        Returns:
+            OrderedDict of np.array, float: each seasonality by name,
+                additive ones in the scale of 'y', multiplicative ones relative to the trend
+        """
+        seasonalities = OrderedDict({})
+        if self.season_config is None:
+            return seasonalities
+        scale_y = df_utils.data_params_of_series(self.data_params, series)["y"].scale
+        # days since epoch
+        t = dates / (1e9 * 3600 * 24.0)
+        for name, period in self.season_config.periods.items():
+            if period.resolution > 0:
+                features = time_dataset.fourier_series_t(t, period.period, period.resolution)
+                params = self.model.season_params[name].detach().numpy().astype(np.float64)
+                seasonalities[name] = features @ params
+                if self.season_config.mode == "additive":
+                    seasonalities[name] = seasonalities[name] * scale_y
+        return seasonalities
+
+    def _predict_trend(self, df, series=None):
         """Predict only trend component of the model.
 
         Args:
             df (pd.DataFrame): containing column 'ds', prediction dates
+            series (int): with local normalization, position of the series among the fitted series
 
         Returns:
             pd.Dataframe with trend on prediction dates.
 
         """
         df = self._check_dataframe(df, check_y=False, exogenous=False)
-        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling)
-        t = torch.from_numpy(np.expand_dims(df["t"].values, 1))
-        trend = self.model.trend(t).squeeze().detach().numpy()
-        trend = trend * self.data_params["y"].scale + self.data_params["y"].shift
+        trend = self._trend_at(df["ds"].values.astype(np.int64), series=series)
         return pd.DataFrame({"ds": df["ds"], "trend": trend})
 
-    def predict_trend(self, df):
+    def predict_trend(self, df, series=None):
         """Predict only trend component of the model.
 
         Args:
             df (pd.DataFrame): containing column 'ds', prediction dates
+            series (int or list of int): with local normalization, position of each df among the series
+                the model was fitted with. Defaults to the list of all series, in the fitted order.
 
         Returns:
             pd.Dataframe or list of pd.Dataframe with trend on prediction dates.
@@ -1400,51 +1922,33 @@ class NeuralProphet:
         """
         df_list = df_utils.create_df_list(df)
         df_list_predict_trend = list()
-        for df in df_list:
-            df_list_predict_trend.append(self._predict_trend(df))
+        for df, position in zip(df_list, self._series_positions(df_list, series)):
+            df_list_predict_trend.append(self._predict_trend(df, series=position))
         df_forecast = df_list_predict_trend
         return df_forecast[0] if len(df_forecast) == 1 else df_forecast
 
-    def _predict_seasonal_components(self, df):
+    def _predict_seasonal_components(self, df, series=None):
         """Predict seasonality components
 
         Args:
             df (pd.DataFrame): containing column 'ds', prediction dates
+            series (int): with local normalization, position of the series among the fitted series
 
         Returns:
             pd.Dataframe with seasonal components. with columns of name <seasonality component name>
 
         """
         df = self._check_dataframe(df, check_y=False, exogenous=False)
-        df = df_utils.normalize(df, self.data_params, local_modeling=self.local_modeling)
-        dataset = time_dataset.TimeDataset(
-            df,
-            season_config=self.season_config,
-            # n_lags=0,
-            # n_forecasts=1,
-            predict_mode=True,
-        )
-        loader = DataLoader(dataset, batch_size=min(4096, len(df)), shuffle=False, drop_last=False)
-        predicted = OrderedDict()
-        for name in self.season_config.periods:
-            predicted[name] = list()
-        for inputs, _ in loader:
-            for name in self.season_config.periods:
-                features = inputs["seasonalities"][name]
-                y_season = torch.squeeze(self.model.seasonality(features=features, name=name))
-                predicted[name].append(y_season.data.numpy())
-
-        for name in self.season_config.periods:
-            predicted[name] = np.concatenate(predicted[name])
-            if self.season_config.mode == "additive":
-                predicted[name] = predicted[name] * self.data_params["y"].scale
+        predicted = self._seasonalities_at(df["ds"].values.astype(np.int64), series=series)
         return pd.DataFrame({"ds": df["ds"], **predicted})
 
-    def predict_seasonal_components(self, df):
+    def predict_seasonal_components(self, df, series=None):
         """Predict seasonality components
 
         Args:
             df (pd.DataFrame): containing column 'ds', prediction dates
+            series (int or list of int): with local normalization, position of each df among the series
+                the model was fitted with. Defaults to the list of all series, in the fitted order.
 
         Returns:
             pd.Dataframe or list of pd.Dataframe with seasonal components. with columns of name <seasonality component name>
@@ -1452,11 +1956,153 @@ class NeuralProphet:
         """
         df_list = df_utils.create_df_list(df)
         df_list_predict_seasonal_components = list()
-        for df in df_list:
-            df_list_predict_seasonal_components.append(self._predict_seasonal_components(df))
+        for df, position in zip(df_list, self._series_positions(df_list, series)):
+            df_list_predict_seasonal_components.append(self._predict_seasonal_components(df, series=position))
         df_forecast = df_list_predict_seasonal_components
         return df_forecast[0] if len(df_forecast) == 1 else df_forecast
 
+    def export_numpy(self, series=None):
+        """Export the fitted model as a NumPy-only evaluator.
+
+        Only linear models (num_hidden_layers == 0) can be exported.
+        The returned NumpyForecaster can be saved to a .npz file and used for predicting without torch.
+        Args:
+            series (int): with local normalization, position of the series to export the scaling values of
+
+        Returns:
+            NumpyForecaster
+        """
+        return NumpyForecaster.from_neuralprophet(self, series=series)
+
+    def prune_lags(self, threshold=0.01, validation_df=None):
+        """Prune lags with near-zero weights from the fitted AR-Net and lagged regressors.
+
+        Rebuilds smaller input layers which only take the remaining lags, so that predicting
+        gathers and multiplies narrower lag windows. Most effective after fitting with ar_sparsity.
+        The history length n_lags is not changed.
+        Args:
+            threshold (float): [0-1], a lag is removed if all its weights are smaller in magnitude
+                than threshold times the largest weight magnitude of the layer.
+            validation_df (pd.DataFrame): if provided, the model is evaluated on it before and after pruning.
+
+        Returns:
+            pd.DataFrame with the number of lagged inputs, and validation metrics if validation_df is provided,
+                before and after pruning.
+        """
+        if self.fitted is False:
+            raise ValueError("Model has not been fitted.")
+        if self.n_lags == 0:
+            raise ValueError("Model has no lagged inputs to prune.")
+        if not 0 <= threshold <= 1:
+            raise ValueError("threshold must be in [0, 1].")
+
+        def evaluate():
+            n_inputs = len(self.model.ar_lags)
+            if self.config_covar is not None:
+                n_inputs += sum(len(covar.window_lags(self.n_lags)) for covar in self.config_covar.values())
+            stats = pd.DataFrame({"lagged_inputs": [n_inputs]})
+            if validation_df is not None:
+                stats = pd.concat([stats, self.test(validation_df).reset_index(drop=True)], axis=1)
+            return stats
+
+        before = evaluate()
+        remaining = self.model.prune_lagged_inputs(threshold)
+        self.config_ar.ar_lags = self.model.ar_lags
+        self._model_changed()
+        after = evaluate()
+        log.info("Remaining lags after pruning: {}".format(dict(remaining)))
+        report = pd.concat([before, after], ignore_index=True)
+        report.index = ["before", "after"]
+        return report
+
+    def make_online_forecaster(self, df, events_df=None, series=None):
+        """Create a stateful forecaster for a stream of new observations.
+
+        Args:
+            df (pd.DataFrame): history with columns 'ds', 'y' and lagged regressors, with at least n_lags rows
+            events_df (pd.DataFrame): dates of the user specified events, with columns 'event' and 'ds'
+            series (int): with local normalization, position of df among the series the model was fitted with
+
+        Returns:
+            OnlineForecaster, see its update method
+        """
+        return OnlineForecaster(self, df, events_df=events_df, series=series)
+
+    def _flat_model(self, series=None):
+        if self.fitted is False:
+            raise ValueError("Model has not been fitted.")
+        y_params = df_utils.data_params_of_series(self.data_params, series)["y"]
+        return time_net.FlatTimeNet(self.model, y_shift=y_params.shift, y_scale=y_params.scale).eval()
+
+    def make_flat_inputs(self, df, series=None):
+        """Build the flat inputs of an exported model from a raw dataframe.
+
+        Uses the same preprocessing as predict (extension into the future, imputation and normalization).
+        Args:
+            df (pandas DataFrame): Dataframe with columns 'ds' datestamps, 'y' time series values and
+                other external variables
+            series (int): with local normalization, position of df among the series the model was fitted with
+
+        Returns:
+            dates (pd.Series): timestamps referring to the start of the predictions.
+            inputs (OrderedDict): named model inputs (np.array, float32), as documented in time_net.FlatTimeNet
+        """
+        df, _ = self._maybe_extend_df(df)
+        df = self._prepare_dataframe_to_predict(df, series=self._series_positions([df], series)[0])
+        if self.n_forecasts > 1:
+            dates = df["ds"].iloc[self.n_lags : -self.n_forecasts + 1]
+        else:
+            dates = df["ds"].iloc[self.n_lags :]
+        dataset = self._create_dataset(df, predict_mode=True)
+        inputs, _ = next(iter(DataLoader(dataset, batch_size=len(dataset), shuffle=False)))
+        inputs = self._flat_model(series=series).flatten_inputs(inputs)
+        inputs = OrderedDict({name: x.numpy() for name, x in inputs.items()})
+        return dates, inputs
+
+    def export_onnx(self, path, opset_version=17, series=None):
+        """Export the fitted model to ONNX.
+
+        The exported graph takes the flat inputs returned by make_flat_inputs and returns the
+        denormalized forecasts of dims (batch, n_forecasts), identical to the raw predictions.
+        Args:
+            path (str): file to write the ONNX model to
+            opset_version (int): ONNX opset version
+            series (int): with local normalization, position of the series whose forecasts are denormalized,
+                its inputs are made by make_flat_inputs with the same series
+
+        Returns:
+            input_names (list of str): names of the graph inputs, in order
+        """
+        model = self._flat_model(series=series)
+        batch = 2
+        example = OrderedDict({"time": torch.zeros(batch, self.n_forecasts)})
+        if "lags" in model.input_names:
+            example["lags"] = torch.zeros(batch, len(self.model.ar_lags))
+        if "seasonalities" in model.input_names:
+            example["seasonalities"] = torch.zeros(batch, self.n_forecasts, sum(model.season_sizes))
+        if "covariates" in model.input_names:
+            example["covariates"] = torch.zeros(batch, sum(model.covar_sizes))
+        for name in model.input_names:
+            if name not in example:
+                key, mode = name.split("_")
+                params = self.model.event_params if key == "events" else self.model.regressor_params
+                example[name] = torch.zeros(batch, self.n_forecasts, params[mode].shape[0])
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            # newer torch versions default to the dynamo exporter, which does not take dynamic_axes
+            export_kwargs["dynamo"] = False
+        torch.onnx.export(
+            model,
+            tuple(example.values()),
+            path,
+            input_names=model.input_names,
+            output_names=["yhat"],
+            dynamic_axes={name: {0: "batch"} for name in model.input_names + ["yhat"]},
+            opset_version=opset_version,
+            **export_kwargs,
+        )
+        return model.input_names
+
     def set_true_ar_for_eval(self, true_ar_weights):
         """configures model to evaluate closeness of AR weights to true weights.
 
@@ -1465,6 +2111,63 @@ class NeuralProphet:
         """
         self.true_ar_weights = true_ar_weights
 
+    def set_inference_precision(self, precision="float32"):
+        """Set the numerical precision used for predictions.
+
+        Reduced precision speeds up the AR-Net and covariate nets of deep or long-lag models on CPU,
+        at a small loss of accuracy. Training is always done in float32.
+        Args:
+            precision (str): one of
+                'float32' (default): full precision
+                'bfloat16': run the forward pass under bfloat16 autocast
+                'int8': dynamically quantize the Linear layers of AR-Net and covariate nets to int8
+        """
+        if precision not in ["float32", "bfloat16", "int8"]:
+            raise ValueError("Inference precision {} not supported.".format(precision))
+        self.inference_precision = precision
+        self._model_changed()
+        return self
+
+    def set_predict_cache(self, max_size=8):
+        """Cache the results of predict, for repeated calls with identical dataframes.
+
+        Forecasts are keyed by a hash of the columns used by the model, the predict arguments
+        and the model version. The cache is cleared whenever the model changes, e.g. on fit.
+        Args:
+            max_size (int): number of results to keep, least recently used are evicted first.
+                0 disables the cache.
+        """
+        if max_size < 0:
+            raise ValueError("Cache size must not be negative.")
+        self.predict_cache_size = max_size
+        self.predict_cache = OrderedDict({})
+        return self
+
+    def _model_changed(self):
+        """Drop all state derived from the model parameters, after they were changed."""
+        self.quantized_model = None
+        self.model_version += 1
+        self.predict_cache = OrderedDict({})
+
+    def _predict_cache_key(self, df_list, decompose, raw, positions):
+        """Fingerprint of the inputs of predict.
+
+        Args:
+            df_list (list of pd.DataFrame): dataframes to predict
+            decompose (bool): argument of predict
+            raw (bool): argument of predict
+            positions (list of int): series positions, as returned by _series_positions
+
+        Returns:
+            tuple, identical for identical used columns, arguments and model version
+        """
+        fingerprints = []
+        for df in df_list:
+            columns = [name for name in self._model_columns() if name in df.columns]
+            hashed = pd.util.hash_pandas_object(df[columns], index=False).values
+            fingerprints.append((tuple(columns), hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()))
+        return self.model_version, decompose, raw, tuple(positions), tuple(fingerprints)
+
     def highlight_nth_step_ahead_of_each_forecast(self, step_number=None):
         """Set which forecast step to focus on for metrics evaluation and plotting.
 
@@ -1477,7 +2180,7 @@ class NeuralProphet:
         self.highlight_forecast_step_n = step_number
         return self
 
-    def add_lagged_regressor(self, names, regularization=None, normalize="auto", only_last_value=False):
+    def add_lagged_regressor(self, names, regularization=None, normalize="auto", only_last_value=False, lags=None):
         """Add a covariate or list of covariate time series as additional lagged regressors to be used for fitting and predicting.
         The dataframe passed to `fit` and `predict` will have the column with the specified name to be used as
         lagged regressor. When normalize=True, the covariate will be normalized unless it is binary.
@@ -1490,6 +2193,8 @@ class NeuralProphet:
             only_last_value (bool):
                 False (default) use same number of lags as auto-regression
                 True: only use last known value as input
+            lags (int, range or list of int and range): explicit set of lags to use, each at most n_lags.
+                default: None, use all lags from 1 to n_lags
         Returns:
             NeuralProphet object
         """
@@ -1503,11 +2208,15 @@ class NeuralProphet:
             self._validate_column_name(name)
             if self.config_covar is None:
                 self.config_covar = OrderedDict({})
-            self.config_covar[name] = configure.Covar(
+            config = configure.Covar(
                 reg_lambda=regularization,
                 normalize=normalize,
                 as_scalar=only_last_value,
+                lags=lags,
             )
+            if max(config.window_lags(self.n_lags)) > self.n_lags:
+                raise ValueError("Lags of lagged regressor {} must not exceed n_lags.".format(name))
+            self.config_covar[name] = config
         return self
 
     def add_future_regressor(self, name, regularization=None, normalize="auto", mode="additive"):
@@ -1733,7 +2442,7 @@ class NeuralProphet:
             residuals=residuals,
         )
 
-    def plot_parameters(self, weekly_start=0, yearly_start=0, figsize=None):
+    def plot_parameters(self, weekly_start=0, yearly_start=0, figsize=None, series=None):
         """Plot the NeuralProphet forecast components.
 
         Args:
@@ -1743,11 +2452,18 @@ class NeuralProphet:
                 0 (default) starts the year on Jan 1. 1 shifts by 1 day to Jan 2, and so on.
             figsize (tuple):   width, height in inches.
                 None (default):  automatic (10, 3 * npanel)
+            series (int): with local normalization, position of the series to plot the parameters
+                in the scale of
         Returns:
             A matplotlib figure.
         """
+        m = self
+        if self.local_modeling:
+            # a shallow copy with the scaling values of the series, as read by the plotting functions
+            m = copy.copy(self)
+            m.data_params = df_utils.data_params_of_series(self.data_params, series)
         return plot_parameters(
-            m=self,
+            m=m,
             forecast_in_focus=self.highlight_forecast_step_n,
             weekly_start=weekly_start,
             yearly_start=yearly_start,
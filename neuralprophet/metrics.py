@@ -39,10 +39,10 @@ class MetricsCollection:
         for m in self.all:
             m.reset(hard=hard)
 
-    def update_batch(self, predicted, target):
+    def update_batch(self, predicted, target, series=None):
         """update BatchMetrics"""
         for m in self.batch_metrics:
-            m.update(predicted=predicted, target=target)
+            m.update(predicted=predicted, target=target, series=series)
 
     def update_values(self, values, num):
         """update ValueMetrics.
@@ -59,7 +59,7 @@ class MetricsCollection:
         if len(not_updated) > 0:
             raise ValueError("Metrics {} defined but not updated.".format(not_updated))
 
-    def update(self, predicted, target, values=None):
+    def update(self, predicted, target, values=None, series=None):
         """update all metrics.
 
         Args:
@@ -67,8 +67,9 @@ class MetricsCollection:
             target: actual values
             values (dict): dict with matching names to defined ValueMetrics
                 Note: if the correct name is not supplied, the metric is not updated.
+            series (np.array, int): series index of each sample, for locally normalized data
         """
-        self.update_batch(predicted=predicted, target=target)
+        self.update_batch(predicted=predicted, target=target, series=series)
         if values is not None:
             self.update_values(values=values, num=target.shape[0])
 
@@ -133,7 +134,8 @@ class MetricsCollection:
         """Adds data denormalization params to applicable metrics
 
         Args:
-            shift_scale (tuple, float): data shift and scale parameters
+            shift_scale (tuple, float): data shift and scale parameters,
+                or np.arrays of the parameters of each series for locally normalized data
         """
         for m in self.all:
             m.set_shift_scale(shift_scale)
@@ -236,13 +238,14 @@ class BatchMetric(Metric):
             self.name = "{}-{}".format(self.name, str(specific_column + 1))
         self.specific_column = specific_column
 
-    def update(self, predicted, target, **kwargs):
+    def update(self, predicted, target, series=None, **kwargs):
         """Updates the metric's state using the passed batch output.
 
         By default, this is called once for each batch.
         Args:
             predicted: the output from the model's forward function.
             target: actual values
+            series (np.array, int): series index of each sample, for locally normalized data
             kwargs: passed on to function that computes the metric.
         """
         self.total_updates += 1
@@ -250,18 +253,39 @@ class BatchMetric(Metric):
         if self.specific_column is not None:
             predicted = predicted[:, self.specific_column]
             target = target[:, self.specific_column]
-        avg_value = self._update_batch_value(predicted, target, **kwargs)
+        avg_value = self._update_batch_value(predicted, target, series=series, **kwargs)
         self._sum += avg_value * num
         self._num_examples += num
 
+    def _denormalize(self, values, series=None):
+        """Reverts the data normalization if shift_scale is set, with the parameters of each sample's series if local.
+
+        Args:
+            values (np.array): normalized values, first dimension is the sample
+            series (np.array, int): series index of each sample, for locally normalized data
+
+        Returns:
+            np.array of denormalized values
+        """
+        if self.shift_scale is None:
+            return values
+        shift, scale = self.shift_scale
+        if np.ndim(shift) > 0:
+            if series is None:
+                raise ValueError("Series of the samples required to denormalize locally normalized data.")
+            dims = (-1,) + (1,) * (values.ndim - 1)
+            shift, scale = shift[series].reshape(dims), scale[series].reshape(dims)
+        return scale * values + shift
+
     @abstractmethod
-    def _update_batch_value(self, predicted, target, **kwargs):
+    def _update_batch_value(self, predicted, target, series=None, **kwargs):
         """Computes the metrics avg value over the batch.
 
             Called inside update()
         Args:
             predicted: the output from the model's forward function.
             target: actual values
+            series (np.array, int): series index of each sample, for locally normalized data
         """
         pass
 
@@ -288,12 +312,9 @@ class MAE(BatchMetric):
         super(MAE, self).__init__(specific_column=specific_column)
         self.shift_scale = shift_scale
 
-    def _update_batch_value(self, predicted, target, **kwargs):
-        predicted = predicted.numpy()
-        target = target.numpy()
-        if self.shift_scale is not None:
-            predicted = self.shift_scale[1] * predicted + self.shift_scale[0]
-            target = self.shift_scale[1] * target + self.shift_scale[0]
+    def _update_batch_value(self, predicted, target, series=None, **kwargs):
+        predicted = self._denormalize(predicted.numpy(), series)
+        target = self._denormalize(target.numpy(), series)
         absolute_errors = np.abs(predicted - target)
         return np.mean(absolute_errors)
 
@@ -329,12 +350,9 @@ class MSE(BatchMetric):
         super(MSE, self).__init__(specific_column=specific_column)
         self.shift_scale = shift_scale
 
-    def _update_batch_value(self, predicted, target, **kwargs):
-        predicted = predicted.numpy()
-        target = target.numpy()
-        if self.shift_scale is not None:
-            predicted = self.shift_scale[1] * predicted + self.shift_scale[0]
-            target = self.shift_scale[1] * target + self.shift_scale[0]
+    def _update_batch_value(self, predicted, target, series=None, **kwargs):
+        predicted = self._denormalize(predicted.numpy(), series)
+        target = self._denormalize(target.numpy(), series)
         squared_errors = (predicted - target) ** 2
         return np.mean(squared_errors)
 
@@ -370,12 +388,9 @@ class RMSE(BatchMetric):
         super(RMSE, self).__init__(specific_column=specific_column)
         self.shift_scale = shift_scale
 
-    def _update_batch_value(self, predicted, target, **kwargs):
-        predicted = predicted.numpy()
-        target = target.numpy()
-        if self.shift_scale is not None:
-            predicted = self.shift_scale[1] * predicted + self.shift_scale[0]
-            target = self.shift_scale[1] * target + self.shift_scale[0]
+    def _update_batch_value(self, predicted, target, series=None, **kwargs):
+        predicted = self._denormalize(predicted.numpy(), series)
+        target = self._denormalize(target.numpy(), series)
         squared_errors = (predicted - target) ** 2
         return np.sqrt(np.mean(squared_errors))
 
@@ -416,7 +431,7 @@ class LossMetric(BatchMetric):
         super(LossMetric, self).__init__(name=loss_fn.__class__.__name__, specific_column=specific_column)
         self._loss_fn = loss_fn
 
-    def _update_batch_value(self, predicted, target, **kwargs):
+    def _update_batch_value(self, predicted, target, series=None, **kwargs):
         average_loss = self._loss_fn(predicted, target, **kwargs)
         if len(average_loss.shape) != 0:
             raise ValueError("loss_fn did not return the average loss.")
@@ -0,0 +1,403 @@
+import json
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import logging
+
+log = logging.getLogger("NP.numpy_forecaster")
+
+
+class NumpyForecaster:
+    """NumPy-only evaluator of a fitted linear NeuralProphet model.
+
+    A fitted TimeNet without hidden layers is a linear function of the trend segments,
+    Fourier features, lags, covariates, events and regressors. This class holds the
+    exported weights together with the data scaling values and feature layout,
+    and reproduces the forecast of NeuralProphet.predict without requiring torch.
+
+    Note: This module only depends on numpy and pandas.
+    """
+
+    def __init__(self, config, params):
+        """
+        Args:
+            config (dict): json-serializable description of the model layout,
+                as created by from_neuralprophet
+            params (OrderedDict): named np.arrays with model weights and scaling values
+        """
+        self.config = config
+        self.params = params
+        self.n_lags = config["n_lags"]
+        self.n_forecasts = config["n_forecasts"]
+
+    @classmethod
+    def from_neuralprophet(cls, m, series=None):
+        """Export a fitted NeuralProphet model.
+
+        Args:
+            m (NeuralProphet): fitted model without hidden layers
+            series (int): with local normalization, position of the series to export the scaling values of
+
+        Returns:
+            NumpyForecaster
+        """
+        if not m.fitted:
+            raise ValueError("Model has not been fitted. Please fit the model before exporting it.")
+        if m.config_model.num_hidden_layers > 0:
+            raise ValueError("Only linear models (num_hidden_layers == 0) can be exported to numpy.")
+        # imported here to keep this module independent of torch
+        from neuralprophet import df_utils
+
+        data_params = df_utils.data_params_of_series(m.data_params, series)
+
+        def to_numpy(tensor):
+            return tensor.detach().numpy().astype(np.float64)
+
+        model = m.model
+        config = OrderedDict({})
+        params = OrderedDict({})
+        config["n_lags"] = m.n_lags
+        config["n_forecasts"] = m.n_forecasts
+
+        # Data scaling
+        params["ds_shift"] = np.array(pd.Timestamp(data_params["ds"].shift).value, dtype=np.int64)
+        params["ds_scale"] = np.array(pd.Timedelta(data_params["ds"].scale).value, dtype=np.int64)
+        params["y_shift"] = np.array(data_params["y"].shift, dtype=np.float64)
+        params["y_scale"] = np.array(data_params["y"].scale, dtype=np.float64)
+
+        # Trend
+        config["growth"] = m.config_trend.growth
+        config["n_changepoints"] = int(m.config_trend.n_changepoints)
+        params["bias"] = to_numpy(model.bias)
+        if m.config_trend.growth != "off":
+            config["segmentwise_trend"] = bool(model.segmentwise_trend)
+            params["trend_k0"] = to_numpy(model.trend_k0)
+            if config["n_changepoints"] > 0:
+                params["trend_changepoints_t"] = model.trend_changepoints_t.detach().numpy().astype(np.float64)
+                params["trend_deltas"] = to_numpy(model.trend_deltas)
+                if m.config_trend.growth == "discontinuous":
+                    params["trend_m"] = to_numpy(model.trend_m)
+
+        # Seasonalities
+        config["seasonalities"] = []
+        if m.season_config is not None and model.season_dims is not None:
+            config["season_mode"] = m.season_config.mode
+            for name, period in m.season_config.periods.items():
+                config["seasonalities"].append([name, float(period.period), int(period.resolution)])
+                params["season.{}".format(name)] = to_numpy(model.season_params[name])
+
+        # Auto-regression
+        config["ar_lags"] = [int(lag) for lag in model.ar_lags]
+        if m.n_lags > 0:
+            params["ar_weights"] = to_numpy(model.ar_weights)
+
+        # Lagged covariates
+        config["covariates"] = []
+        if m.config_covar is not None:
+            for name, covar in m.config_covar.items():
+                config["covariates"].append([name, [int(lag) for lag in covar.window_lags(m.n_lags)]])
+                params["covar.{}".format(name)] = to_numpy(model.get_covar_weights(name))
+                params["shift.{}".format(name)] = np.array(data_params[name].shift, dtype=np.float64)
+                params["scale.{}".format(name)] = np.array(data_params[name].scale, dtype=np.float64)
+
+        # Future regressors, ordered by their index in the model parameters
+        config["regressors"] = {"additive": [], "multiplicative": []}
+        if model.regressors_dims is not None:
+            for mode in ["additive", "multiplicative"]:
+                names = [name for name, dims in model.regressors_dims.items() if dims["mode"] == mode]
+                names = sorted(names, key=lambda x: model.regressors_dims[x]["regressor_index"])
+                config["regressors"][mode] = names
+                if len(names) > 0:
+                    params["regressors.{}".format(mode)] = to_numpy(model.regressor_params[mode])
+                for name in names:
+                    params["shift.{}".format(name)] = np.array(data_params[name].shift, dtype=np.float64)
+                    params["scale.{}".format(name)] = np.array(data_params[name].scale, dtype=np.float64)
+
+        # Events and country holidays, ordered by their index in the model parameters
+        config["events"] = {"additive": [], "multiplicative": []}
+        config["holidays"] = []
+        if model.events_dims is not None:
+            holiday_names = set()
+            if m.country_holidays_config is not None:
+                holiday_names = set(m.country_holidays_config.holiday_names)
+            for mode in ["additive", "multiplicative"]:
+                features = []
+                for event, dims in model.events_dims.items():
+                    if dims["mode"] != mode:
+                        continue
+                    for delim, index in zip(dims["event_delim"], dims["event_indices"]):
+                        offset = int(delim[len(event) + 1 :])
+                        features.append((index, event, offset, event in holiday_names))
+                config["events"][mode] = [
+                    [event, offset, is_holiday] for _, event, offset, is_holiday in sorted(features)
+                ]
+                if len(features) > 0:
+                    params["events.{}".format(mode)] = to_numpy(model.event_params[mode])
+            if m.country_holidays_config is not None:
+                # imported here to keep this module independent of torch
+                from neuralprophet import time_dataset
+
+                first = pd.Timestamp(data_params["ds"].shift)
+                last = first + pd.Timedelta(data_params["ds"].scale)
+                years = list(range(first.year - 5, last.year + 26))
+                holiday_dates = time_dataset.make_country_specific_holidays_df(years, m.country_holidays_config.country)
+                for holiday in sorted(holiday_names):
+                    config["holidays"].append(holiday)
+                    dates = pd.to_datetime(holiday_dates.get(holiday, [])).values.astype("datetime64[ns]")
+                    params["holiday.{}".format(holiday)] = dates.astype(np.int64)
+        return cls(config=config, params=params)
+
+    def save(self, path):
+        """Save the exported model to a .npz file.
+
+        Args:
+            path (str): file path
+        """
+        np.savez(path, _config=np.array(json.dumps(self.config)), **self.params)
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save.
+
+        Args:
+            path (str): file path
+
+        Returns:
+            NumpyForecaster
+        """
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["_config"]))
+            params = OrderedDict({key: data[key] for key in data.files if key != "_config"})
+        return cls(config=config, params=params)
+
+    def _normalize_column(self, df, name):
+        values = df[name].values.astype(np.float64)
+        return (values - self.params["shift.{}".format(name)]) / self.params["scale.{}".format(name)]
+
+    def _features(self, df):
+        """Computes the model inputs of one series.
+
+        Args:
+            df (pd.DataFrame): clean data without gaps, with columns 'ds', 'y' (if auto-regression),
+                and any covariates, regressors and events of the model.
+
+        Returns:
+            OrderedDict of np.arrays, each with the number of samples as first dimension
+        """
+        n_lags = self.n_lags
+        n_forecasts = self.n_forecasts
+        n_samples = len(df) - n_lags + 1 - n_forecasts
+        if n_samples < 1:
+            raise ValueError("Insufficient data to make predictions.")
+        # indices of forecast targets and of lagged inputs for each sample
+        samples = np.arange(n_samples)
+        target_idx = n_lags + samples[:, None] + np.arange(n_forecasts)[None, :]
+
+        def lag_idx(lags):
+            # window positions of the lags, ordered from oldest to most recent
+            return samples[:, None] + (n_lags - np.array(lags[::-1]))[None, :]
+
+        features = OrderedDict({})
+        ds = pd.to_datetime(df["ds"]).values.astype("datetime64[ns]").astype(np.int64)
+        t = (ds - self.params["ds_shift"]) / float(self.params["ds_scale"])
+        features["time"] = t[target_idx]
+
+        if len(self.config["seasonalities"]) > 0:
+            # days since epoch
+            days = ds / (1e9 * 3600 * 24.0)
+            for name, period, resolution in self.config["seasonalities"]:
+                fourier = fourier_series_t(days, period, resolution)
+                features["season.{}".format(name)] = fourier[target_idx]
+
+        if n_lags > 0:
+            y = pd.to_numeric(df["y"]).values.astype(np.float64)
+            y_scaled = (y - self.params["y_shift"]) / self.params["y_scale"]
+            features["lags"] = y_scaled[lag_idx(self.config["ar_lags"])]
+            if np.isnan(features["lags"]).any():
+                raise ValueError("Input lags contain NaN values in y.")
+            for name, lags in self.config["covariates"]:
+                features["covar.{}".format(name)] = self._normalize_column(df, name)[lag_idx(lags)]
+                if np.isnan(features["covar.{}".format(name)]).any():
+                    raise ValueError("Input lags contain NaN values in {}.".format(name))
+
+        for mode in ["additive", "multiplicative"]:
+            names = self.config["regressors"][mode]
+            if len(names) > 0:
+                regressors = np.column_stack([self._normalize_column(df, name) for name in names])
+                features["regressors.{}".format(mode)] = regressors[target_idx]
+
+        for mode in ["additive", "multiplicative"]:
+            event_features = []
+            for event, offset, is_holiday in self.config["events"][mode]:
+                if is_holiday:
+                    feature = np.isin(ds, self.params["holiday.{}".format(event)]).astype(np.float64)
+                else:
+                    feature = df[event].fillna(0).values.astype(np.float64)
+                event_features.append(_shift(feature, offset))
+            if len(event_features) > 0:
+                features["events.{}".format(mode)] = np.column_stack(event_features)[target_idx]
+        return features
+
+    def _trend(self, t):
+        growth = self.config["growth"]
+        p = self.params
+        if growth == "off":
+            trend = np.zeros_like(t)
+        elif self.config["n_changepoints"] == 0:
+            trend = p["trend_k0"] * t
+        else:
+            trend = piecewise_linear_trend(
+                t,
+                changepoints_t=p["trend_changepoints_t"],
+                k0=p["trend_k0"],
+                deltas=p["trend_deltas"],
+                segmentwise=self.config["segmentwise_trend"],
+                m=p.get("trend_m"),
+            )
+        return p["bias"] + trend
+
+    def _forward(self, features):
+        """Computes the normalized forecast.
+
+        Args:
+            features (OrderedDict): model inputs, as returned by _features
+
+        Returns:
+            np.array of dims (num_samples, n_forecasts)
+        """
+        p = self.params
+        additive = np.zeros_like(features["time"])
+        multiplicative = np.zeros_like(features["time"])
+        if "lags" in features:
+            additive += features["lags"] @ p["ar_weights"].T
+        for name, _ in self.config["covariates"]:
+            additive += features["covar.{}".format(name)] @ p["covar.{}".format(name)].T
+        if len(self.config["seasonalities"]) > 0:
+            season = np.zeros_like(features["time"])
+            for name, _, _ in self.config["seasonalities"]:
+                season += features["season.{}".format(name)] @ p["season.{}".format(name)]
+            if self.config["season_mode"] == "additive":
+                additive += season
+            else:
+                multiplicative += season
+        for component in ["events", "regressors"]:
+            for mode, components in [("additive", additive), ("multiplicative", multiplicative)]:
+                key = "{}.{}".format(component, mode)
+                if key in features:
+                    components += features[key] @ p[key]
+        trend = self._trend(features["time"])
+        return trend + additive + trend * multiplicative
+
+    def predict_raw(self, df):
+        """Computes forecasts on a forecast origin basis.
+
+        Args:
+            df (pd.DataFrame or list of pd.DataFrame): clean data without gaps, as returned by
+                NeuralProphet.make_future_dataframe.
+
+        Returns:
+            np.array or list of np.array: forecasts of dims (num_samples, n_forecasts)
+        """
+        df_list = df if isinstance(df, list) else [df]
+        features_list = [self._features(df_i) for df_i in df_list]
+        # evaluate all series in one vectorized pass
+        lengths = [len(features["time"]) for features in features_list]
+        features = OrderedDict({})
+        for key in features_list[0].keys():
+            features[key] = np.concatenate([x[key] for x in features_list])
+        predicted = self._forward(features)
+        predicted = predicted * self.params["y_scale"] + self.params["y_shift"]
+        predicted = np.split(predicted, np.cumsum(lengths)[:-1])
+        return predicted if isinstance(df, list) else predicted[0]
+
+    def predict(self, df):
+        """Computes forecasts, equivalent to NeuralProphet.predict without decomposition.
+
+        Note: data must be clean and have no gaps.
+            Future dates, regressors and events must already be included,
+            as done by NeuralProphet.make_future_dataframe.
+
+        Args:
+            df (pd.DataFrame or list of pd.DataFrame): with columns 'ds', 'y', and any covariates,
+                regressors and events of the model.
+
+        Returns:
+            pd.DataFrame or list of pd.DataFrame: columns 'ds', 'y' and ['yhat<i>', 'residual<i>']
+                where yhat<i> refers to the i-step-ahead prediction for this row's datetime.
+        """
+        df_list = df if isinstance(df, list) else [df]
+        predicted_list = self.predict_raw(df_list)
+        fcst_list = []
+        for df_i, predicted in zip(df_list, predicted_list):
+            y = pd.to_numeric(df_i["y"]).values.astype(np.float64) if "y" in df_i else np.full(len(df_i), np.nan)
+            fcst = OrderedDict({"ds": pd.to_datetime(df_i["ds"]).values, "y": y})
+            rows = np.arange(predicted.shape[0])
+            for forecast_lag in range(1, self.n_forecasts + 1):
+                yhat = np.full(len(df_i), np.nan)
+                yhat[rows + self.n_lags + forecast_lag - 1] = predicted[:, forecast_lag - 1]
+                fcst["yhat{}".format(forecast_lag)] = yhat
+                fcst["residual{}".format(forecast_lag)] = yhat - y
+            fcst_list.append(pd.DataFrame(fcst))
+        return fcst_list if isinstance(df, list) else fcst_list[0]
+
+
+def fourier_series_t(t, period, series_order):
+    """Provides Fourier series components with the specified frequency and order.
+
+    Note: Identical to time_dataset.fourier_series_t.
+
+    Args:
+        t (np.array, float): containing time as floating point number of days.
+        period (float): Number of days of the period.
+        series_order (int): Number of fourier components.
+
+    Returns:
+        Matrix with seasonality features.
+    """
+    features = np.column_stack(
+        [fun((2.0 * (i + 1) * np.pi * t / period)) for i in range(series_order) for fun in (np.sin, np.cos)]
+    )
+    return features
+
+
+def piecewise_linear_trend(t, changepoints_t, k0, deltas, segmentwise, m=None):
+    """Piecewise linear trend, computed segmentwise or with deltas.
+
+    Note: Identical to TimeNet._piecewise_linear_trend.
+
+    Args:
+        t (np.array, float): normalized time of dimensions (batch, n_forecasts)
+        changepoints_t (np.array, float): normalized changepoint times, including zero
+        k0 (np.array, float): initial growth rate
+        deltas (np.array, float): growth rate (changes) of each segment
+        segmentwise (bool): whether deltas are the rates of each segment
+        m (np.array, float): offsets of each segment, only for discontinuous growth
+
+    Returns:
+        Trend component, same dimensions as input t
+    """
+    past_next_changepoint = t[..., None] >= changepoints_t[1:]
+    segment_id = np.sum(past_next_changepoint, axis=-1)
+    k_t = deltas[segment_id]
+    if not segmentwise:
+        k_t = k_t + np.sum(past_next_changepoint * deltas[:-1], axis=-1)
+    if m is None:
+        if segmentwise:
+            deltas = deltas - np.concatenate((k0, deltas[:-1]))
+        gammas = -changepoints_t[1:] * deltas[1:]
+        m_t = np.sum(past_next_changepoint * gammas, axis=-1)
+    else:
+        m_t = m[segment_id]
+    return (k0 + k_t) * t + m_t
+
+
+def _shift(x, offset):
+    """Shifts array by offset, filling with zeros. Identical to pd.Series.shift(offset, fill_value=0)"""
+    if offset == 0:
+        return x
+    shifted = np.zeros_like(x)
+    if offset > 0:
+        shifted[offset:] = x[:-offset]
+    else:
+        shifted[:offset] = x[-offset:]
+    return shifted
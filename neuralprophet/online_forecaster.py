@@ -0,0 +1,255 @@
+from collections import OrderedDict
+import contextlib
+import logging
+
+import numpy as np
+import pandas as pd
+import torch
+
+from neuralprophet import df_utils
+from neuralprophet import time_dataset
+from neuralprophet import utils
+
+log = logging.getLogger("NP.online_forecaster")
+
+
+class OnlineForecaster:
+    """Stateful forecaster for a stream of new observations of a single series.
+
+    Holds the normalized last n_lags values of 'y' and of each lagged regressor in ring buffers.
+    Each update adds one observation and computes the next n_forecasts steps with a single-sample
+    forward pass, in O(n_lags) and without pandas.
+
+    Note: The features of events and country holidays are computed with pandas for a block of steps
+        when the forecaster is created, covering the dates of events_df, and again for the next block
+        whenever the forecast targets move past it. Updates only slice them.
+        The model is run with the inference precision set when the forecaster is created.
+    """
+
+    # steps of event features computed at once, at least up to the end of events_df
+    EVENTS_BLOCK = 1000
+
+    def __init__(self, m, df, events_df=None, series=None):
+        """
+        Args:
+            m (NeuralProphet): fitted model with auto-regression
+            df (pd.DataFrame): history with columns 'ds', 'y' and lagged regressors,
+                with at least n_lags rows. Only used to initialize the buffers.
+            events_df (pd.DataFrame): dates of the user specified events, with columns 'event' and 'ds',
+                as for create_df_with_events, covering the dates of the stream and its forecasts
+            series (int): with local normalization, position of the series among the series the model was fitted with
+        """
+        if not m.fitted:
+            raise ValueError("Model has not been fitted.")
+        if m.n_lags == 0:
+            raise ValueError("Online forecasting requires auto-regression (n_lags > 0).")
+        series = m._series_positions([df], series)[0]
+        data_params = df_utils.data_params_of_series(m.data_params, series)
+        try:
+            self.step = np.int64(pd.tseries.frequencies.to_offset(m.data_freq).nanos)
+        except ValueError:
+            raise NotImplementedError("Online forecasting requires a fixed data frequency, not {}.".format(m.data_freq))
+
+        self.model = m._get_inference_model()
+        self.bfloat16 = m.inference_precision == "bfloat16"
+        self.n_lags = m.n_lags
+        self.n_forecasts = m.n_forecasts
+        self.ds_shift = np.int64(pd.Timestamp(data_params["ds"].shift).value)
+        self.ds_scale = float(pd.Timedelta(data_params["ds"].scale).value)
+        self.y_shift = float(data_params["y"].shift)
+        self.y_scale = float(data_params["y"].scale)
+        self.seasonalities = []
+        if m.season_config is not None:
+            for name, period in m.season_config.periods.items():
+                if period.resolution > 0:
+                    self.seasonalities.append((name, period.period, period.resolution))
+
+        # events and country holidays, from the dates of the events windows around the forecast targets
+        self.events_config = m.events_config
+        self.country_holidays_config = m.country_holidays_config
+        if self.events_config is not None and events_df is None:
+            log.warning(
+                "Dates of user specified events not supplied. All events being treated as not occurring in future"
+            )
+            events_df = pd.DataFrame({"event": [], "ds": []})
+        self.events_df = None
+        if events_df is not None:
+            self.events_df = events_df.assign(ds=pd.to_datetime(events_df["ds"]))
+        windows = []
+        if self.events_config is not None:
+            windows.extend([(config.lower_window, config.upper_window) for config in self.events_config.values()])
+        if self.country_holidays_config is not None:
+            windows.append((self.country_holidays_config.lower_window, self.country_holidays_config.upper_window))
+        self.events_before = max([0] + [upper for _, upper in windows])
+        self.events_after = max([0] + [-lower for lower, _ in windows])
+        self.regressors_config = m.regressors_config
+        self.regressors_shift_scale = OrderedDict({"additive": [], "multiplicative": []})
+        if self.regressors_config is not None:
+            for name in sorted(self.regressors_config.keys()):
+                shift_scale = (name, float(data_params[name].shift), float(data_params[name].scale))
+                self.regressors_shift_scale[self.regressors_config[name].mode].append(shift_scale)
+
+        # ring buffer positions of the model inputs, relative to the oldest value
+        self.ar_positions = utils.lags_to_window_positions(self.model.ar_lags, self.n_lags)
+        self.covar_shift_scale = OrderedDict({})
+        self.covar_positions = OrderedDict({})
+        if m.config_covar is not None:
+            for name, covar in m.config_covar.items():
+                self.covar_shift_scale[name] = (float(data_params[name].shift), float(data_params[name].scale))
+                self.covar_positions[name] = utils.lags_to_window_positions(covar.window_lags(self.n_lags), self.n_lags)
+
+        # initialize buffers from the history, with the usual preprocessing
+        if len(df) < self.n_lags:
+            raise ValueError("Insufficient data to initialize the online forecaster.")
+        df = m._prepare_dataframe_to_predict(df.iloc[-self.n_lags :], series=series)
+        if len(df) < self.n_lags:
+            raise ValueError("Insufficient data to initialize the online forecaster.")
+        df = df.iloc[-self.n_lags :]
+        self.y = df["y_scaled"].values.astype(np.float64)
+        self.covariates = OrderedDict({name: df[name].values.astype(np.float64) for name in self.covar_positions})
+        if np.isnan(self.y).any() or any(np.isnan(values).any() for values in self.covariates.values()):
+            raise ValueError("History to initialize the online forecaster must not end with missing values.")
+        self.pos = 0
+        self.last_ds = np.int64(pd.Timestamp(df["ds"].iloc[-1]).value)
+
+        # event features by step after the last observation of the history, see _events_inputs
+        self.events_origin = self.last_ds
+        self.events_block = self.EVENTS_BLOCK
+        if self.events_df is not None and len(self.events_df) > 0:
+            events_end = np.int64(self.events_df["ds"].max().value)
+            self.events_block = max(self.events_block, int((events_end - self.events_origin) // self.step) + 1)
+        self.events_start = None
+        self.events_features = None
+        if self.events_config is not None or self.country_holidays_config is not None:
+            self._make_events_features(1)
+
+    def update(self, ds, y, covariates=None, regressors=None):
+        """Add the next observation and forecast the following n_forecasts steps.
+
+        Args:
+            ds (datetime-like): datestamp of the observation, one step after the previous one
+            y (float): observed value
+            covariates (dict): observed values of all lagged regressors, by name
+            regressors (dict): values of all future regressors, by name, see forecast
+
+        Returns:
+            see forecast
+        """
+        ds = np.datetime64(ds, "ns").astype(np.int64)
+        if ds != self.last_ds + self.step:
+            raise ValueError("Observations must be consecutive, expected the next step after the last observation.")
+        if y is None or np.isnan(y):
+            raise ValueError("Observation y must not be missing.")
+        covariates = {} if covariates is None else covariates
+        for name, (shift, scale) in self.covar_shift_scale.items():
+            if name not in covariates:
+                raise ValueError("Value of lagged regressor {} not provided.".format(name))
+            self.covariates[name][self.pos] = (covariates[name] - shift) / scale
+        self.y[self.pos] = (y - self.y_shift) / self.y_scale
+        self.pos = (self.pos + 1) % self.n_lags
+        self.last_ds = ds
+        return self.forecast(regressors)
+
+    def _make_events_features(self, start):
+        """Compute the features of events and country holidays for the next block of steps.
+
+        Args:
+            start (int): first step of the block, counted from the last observation of the history
+        """
+        # events up to upper_window steps before and lower_window steps after a step affect it
+        offsets = np.arange(start - self.events_before, start + self.events_block + self.events_after, dtype=np.int64)
+        df = pd.DataFrame({"ds": (self.events_origin + self.step * offsets).astype("datetime64[ns]")})
+        if self.events_config is not None:
+            df = df_utils.convert_events_to_features(df, self.events_config, self.events_df)
+        additive, multiplicative = time_dataset.make_events_features(
+            df, self.events_config, self.country_holidays_config
+        )
+        rows = slice(self.events_before, self.events_before + self.events_block)
+        self.events_start = start
+        self.events_features = OrderedDict({})
+        if additive is not None:
+            self.events_features["additive"] = additive[rows].astype(np.float32)
+        if multiplicative is not None:
+            self.events_features["multiplicative"] = multiplicative[rows].astype(np.float32)
+
+    def _events_inputs(self):
+        """Features of events and country holidays at the forecast target dates.
+
+        Returns:
+            OrderedDict of the additive and multiplicative features (torch tensor, float),
+                dims: (1, n_forecasts, n_features)
+        """
+        start = int((self.last_ds - self.events_origin) // self.step) + 1
+        if start < self.events_start or start + self.n_forecasts > self.events_start + self.events_block:
+            self._make_events_features(start)
+        rows = slice(start - self.events_start, start - self.events_start + self.n_forecasts)
+        events = OrderedDict({})
+        for mode, features in self.events_features.items():
+            events[mode] = torch.from_numpy(features[rows][None, :, :])
+        return events
+
+    def _regressors_inputs(self, regressors):
+        """Normalized features of the future regressors at the forecast target dates.
+
+        Args:
+            regressors (dict): values of all future regressors, by name, see forecast
+
+        Returns:
+            OrderedDict of the additive and multiplicative features (torch tensor, float),
+                dims: (1, n_forecasts, n_features)
+        """
+        regressors = {} if regressors is None else regressors
+        features = OrderedDict({})
+        for mode, shift_scale in self.regressors_shift_scale.items():
+            if len(shift_scale) == 0:
+                continue
+            values = np.empty((self.n_forecasts, len(shift_scale)), dtype=np.float64)
+            for i, (name, shift, scale) in enumerate(shift_scale):
+                if name not in regressors:
+                    raise ValueError("Future values of regressor {} not provided.".format(name))
+                column = np.asarray(regressors[name], dtype=np.float64)
+                if column.shape != (self.n_forecasts,):
+                    raise ValueError("Regressor {} needs one value for each of the n_forecasts steps.".format(name))
+                values[:, i] = (column - shift) / scale
+            features[mode] = torch.from_numpy(values[None, :, :]).float()
+        return features
+
+    def forecast(self, regressors=None):
+        """Forecast the n_forecasts steps following the last observation.
+
+        Args:
+            regressors (dict): values of all future regressors at the n_forecasts target dates, by name,
+                each an array-like of length n_forecasts. Only needed for models with future regressors.
+
+        Returns:
+            dates (np.array, datetime64[ns]): forecast target dates
+            yhat (np.array, float): forecast for each step
+        """
+        targets = self.last_ds + self.step * np.arange(1, self.n_forecasts + 1, dtype=np.int64)
+        inputs = OrderedDict({})
+        inputs["time"] = torch.from_numpy(((targets - self.ds_shift) / self.ds_scale)[None, :]).float()
+        if len(self.seasonalities) > 0:
+            days = targets / (1e9 * 3600 * 24.0)
+            inputs["seasonalities"] = OrderedDict({})
+            for name, period, resolution in self.seasonalities:
+                features = time_dataset.fourier_series_t(days, period, resolution)
+                inputs["seasonalities"][name] = torch.from_numpy(features[None, :, :]).float()
+        inputs["lags"] = torch.from_numpy(self.y[(self.pos + self.ar_positions) % self.n_lags][None, :]).float()
+        if len(self.covar_positions) > 0:
+            inputs["covariates"] = OrderedDict({})
+            for name, positions in self.covar_positions.items():
+                values = self.covariates[name][(self.pos + positions) % self.n_lags]
+                inputs["covariates"][name] = torch.from_numpy(values[None, :]).float()
+        if self.events_config is not None or self.country_holidays_config is not None:
+            inputs["events"] = self._events_inputs()
+        if self.regressors_config is not None:
+            inputs["regressors"] = self._regressors_inputs(regressors)
+        if self.bfloat16:
+            autocast = torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        else:
+            autocast = contextlib.nullcontext()
+        with torch.no_grad(), autocast:
+            self.model.eval()
+            predicted = self.model.forward(inputs)[0].float().numpy()
+        yhat = predicted.astype(np.float64) * self.y_scale + self.y_shift
+        return targets.astype("datetime64[ns]"), yhat
@@ -38,7 +38,6 @@ def plot(fcst, ax=None, xlabel="ds", ylabel="y", highlight_forecast=None, line_p
     Returns:
         A matplotlib figure.
     """
-    fcst = fcst.fillna(value=np.nan)
     if ax is None:
         fig = plt.figure(facecolor="w", figsize=figsize)
         ax = fig.add_subplot(111)
@@ -108,7 +107,6 @@ def plot_components(m, fcst, forecast_in_focus=None, one_period_per_season=True,
         A matplotlib figure.
     """
     log.debug("Plotting forecast components".format(fcst.head().to_string()))
-    fcst = fcst.fillna(value=np.nan)
 
     # Identify components to be plotted
     # as dict, minimum: {plot_name, comp_name}
@@ -294,7 +292,6 @@ def plot_forecast_component(
     Returns:
         a list of matplotlib artists
     """
-    fcst = fcst.fillna(value=np.nan)
     artists = []
     if not ax:
         fig = plt.figure(facecolor="w", figsize=figsize)
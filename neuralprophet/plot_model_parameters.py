@@ -61,6 +61,7 @@ def plot_parameters(m, forecast_in_focus=None, weekly_start=0, yearly_start=0, f
                 "plot_name": "lagged weights",
                 "comp_name": "AR",
                 "weights": m.model.ar_weights.detach().numpy(),
+                "lags": m.model.ar_lags,
                 "focus": forecast_in_focus,
             }
         )
@@ -117,6 +118,7 @@ def plot_parameters(m, forecast_in_focus=None, weekly_start=0, yearly_start=0, f
                         "plot_name": "lagged weights",
                         "comp_name": 'Lagged Regressor "{}"'.format(name),
                         "weights": m.model.get_covar_weights(name).detach().numpy(),
+                        "lags": m.config_covar[name].window_lags(m.n_lags),
                         "focus": forecast_in_focus,
                     }
                 )
@@ -160,7 +162,9 @@ def plot_parameters(m, forecast_in_focus=None, weekly_start=0, yearly_start=0, f
             else:
                 plot_custom_season(m=m, ax=ax, comp_name=name)
         elif plot_name == "lagged weights":
-            plot_lagged_weights(weights=comp["weights"], comp_name=comp["comp_name"], focus=comp["focus"], ax=ax)
+            plot_lagged_weights(
+                weights=comp["weights"], comp_name=comp["comp_name"], focus=comp["focus"], ax=ax, lags=comp["lags"]
+            )
         else:
             if plot_name == "additive future regressor":
                 weights = additive_future_regressors
@@ -321,7 +325,7 @@ def plot_scalar_weights(weights, plot_name, focus=None, ax=None, figsize=(10, 6)
     return artists
 
 
-def plot_lagged_weights(weights, comp_name, focus=None, ax=None, figsize=(10, 6)):
+def plot_lagged_weights(weights, comp_name, focus=None, ax=None, figsize=(10, 6), lags=None):
     """Make a barplot of the importance of lagged inputs.
 
     Args:
@@ -333,6 +337,8 @@ def plot_lagged_weights(weights, comp_name, focus=None, ax=None, figsize=(10, 6)
             One will be created if this is not provided.
         figsize (tuple): width, height in inches. Ignored if ax is not None.
              default: (10, 6)
+        lags (list of int): ascending lags of the weights.
+            None (default): all lags from 1 to the number of weights
     Returns:
         a list of matplotlib artists
     """
@@ -340,8 +346,9 @@ def plot_lagged_weights(weights, comp_name, focus=None, ax=None, figsize=(10, 6)
     if not ax:
         fig = plt.figure(facecolor="w", figsize=figsize)
         ax = fig.add_subplot(111)
-    n_lags = weights.shape[1]
-    lags_range = list(range(1, 1 + n_lags))[::-1]
+    if lags is None:
+        lags = list(range(1, 1 + weights.shape[1]))
+    lags_range = lags[::-1]
     if focus is None:
         weights = np.sum(np.abs(weights), axis=0)
         weights = weights / np.sum(weights)
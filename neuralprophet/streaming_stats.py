@@ -0,0 +1,158 @@
+import math
+import logging
+
+import numpy as np
+
+log = logging.getLogger("NP.streaming_stats")
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with bounded memory (KLL sketch).
+
+    Values are kept in a hierarchy of compactors, where a value at level h represents 2^h original values.
+    When a level exceeds its capacity, it is sorted and every other value (starting at a random offset)
+    is promoted to the next level. The capacities decrease geometrically towards the lower levels,
+    so the sketch holds at most about 3 * k values, independent of the number of values added.
+
+    Error bounds: as long as at most k values have been added, the sketch is exact.
+    Beyond that, the rank of a returned quantile differs from the requested rank by at most
+    about 2.3 / k^0.97 * n with 99% probability (normalized rank error of KLL sketches),
+    which is below 0.2% of n for the default k=2048.
+    The returned value is always one of the added values.
+
+    Note: Compacting sorted values in one pass introduces at most one unit of rank error per compaction,
+        so adding values in large chunks is as accurate as adding them one by one.
+    """
+
+    def __init__(self, k=2048, seed=0):
+        """
+        Args:
+            k (int): capacity of the top level, controls the accuracy and memory of the sketch
+            seed (int): seed of the random compaction offsets, for reproducible results
+        """
+        if k < 8:
+            raise ValueError("Sketch capacity k must be at least 8.")
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.RandomState(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values):
+        """Add values to the sketch.
+
+        Args:
+            values (np.array, float): values to add, any shape
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self._capacity(level):
+                level += 1
+                continue
+            if level == len(self.levels) - 1:
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # an odd item out stays at its level
+            n_keep = len(items) % 2
+            promoted = items[n_keep + self.rng.randint(2) :: 2]
+            self.levels[level] = items[:n_keep]
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            # capacities of the lower levels shrink as the sketch grows, recheck from the bottom
+            level = 0
+
+    def quantile(self, q):
+        """Approximate quantile, like np.quantile(values, q, interpolation="higher").
+
+        Args:
+            q (float): quantile in [0, 1]
+
+        Returns:
+            float: value at the requested quantile
+        """
+        if self.n == 0:
+            raise ValueError("Quantile of an empty sketch is not defined.")
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** h) for h, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cum_weights = np.cumsum(weights[order])
+        rank = int(math.ceil(q * (self.n - 1)))
+        idx = min(np.searchsorted(cum_weights, rank, side="right"), len(items) - 1)
+        return items[order[idx]]
+
+
+class StreamingStats:
+    """Summary statistics of a stream of values, as needed to compute normalization parameters.
+
+    Tracks count, minimum, maximum, mean and standard deviation exactly,
+    quantiles approximately with a QuantileSketch, and up to three distinct values
+    (to recognize constant and binary variables).
+    """
+
+    def __init__(self, k=2048):
+        """
+        Args:
+            k (int): capacity of the quantile sketch
+        """
+        self.n = 0
+        self._min = np.inf
+        self._max = -np.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.unique = np.empty(0)
+        self.sketch = QuantileSketch(k=k)
+
+    def update(self, values):
+        """Add a chunk of values.
+
+        Args:
+            values (np.array, float): values to add
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        n_chunk = len(values)
+        if n_chunk == 0:
+            return
+        self._min = np.minimum(self._min, np.min(values))
+        self._max = np.maximum(self._max, np.max(values))
+        # combine mean and sum of squared deviations of the chunk (Chan et al.)
+        mean_chunk = np.mean(values)
+        m2_chunk = np.sum((values - mean_chunk) ** 2)
+        n_total = self.n + n_chunk
+        delta = mean_chunk - self._mean
+        self._mean += delta * n_chunk / n_total
+        self._m2 += m2_chunk + delta ** 2 * self.n * n_chunk / n_total
+        self.n = n_total
+        if len(self.unique) < 3:
+            self.unique = np.union1d(self.unique, np.unique(values))[:3]
+        self.sketch.update(values)
+
+    def min(self):
+        return self._min
+
+    def max(self):
+        return self._max
+
+    def mean(self):
+        return self._mean
+
+    def std(self):
+        """Population standard deviation, like np.std."""
+        return math.sqrt(self._m2 / self.n)
+
+    def quantile(self, q):
+        """Approximate quantile, see QuantileSketch.quantile."""
+        return self.sketch.quantile(q)
+
+    def n_unique(self):
+        """Number of distinct values, counted up to 3."""
+        return len(self.unique)
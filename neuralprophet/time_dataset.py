@@ -99,6 +99,21 @@ class TimeDataset(Dataset):
         """Overrides Parent class method to get data length."""
         return self.length
 
+    def share_memory(self):
+        """Moves all tensors to shared memory, so that they are passed to other processes without copies.
+
+        Returns:
+            self
+        """
+        for key, data in self.inputs.items():
+            if isinstance(data, OrderedDict):
+                for features in data.values():
+                    features.share_memory_()
+            else:
+                data.share_memory_()
+        self.targets.share_memory_()
+        return self
+
 
 def tabularize_univariate_datetime(
     df,
@@ -110,6 +125,7 @@ def tabularize_univariate_datetime(
     covar_config=None,
     regressors_config=None,
     predict_mode=False,
+    ar_lags=None,
 ):
     """Create a tabular dataset from univariate timeseries for supervised forecasting.
 
@@ -129,15 +145,17 @@ def tabularize_univariate_datetime(
         regressors_config (OrderedDict): configuration for regressors
         predict_mode (bool): False (default) includes target values.
             True does not include targets but includes entire dataset as input
+        ar_lags (list of int): lags of the series to include as model inputs.
+            None (default): all lags from 1 to n_lags
 
     Returns:
         inputs (OrderedDict): model inputs, each of len(df) but with varying dimensions
             time (np.array, float), dims: (num_samples, 1)
             seasonalities (OrderedDict), named seasonalities, each with features
                 (np.array, float) of dims: (num_samples, n_features[name])
-            lags (np.array, float), dims: (num_samples, n_lags)
+            lags (np.array, float), dims: (num_samples, n_lags or len(ar_lags))
             covariates (OrderedDict), named covariates, each with features
-                (np.array, float) of dims: (num_samples, n_lags)
+                (np.array, float) of dims: (num_samples, number of covariate lags)
             events (OrderedDict), events, each with features
                 (np.array, float) of dims: (num_samples, n_lags)
             regressors (OrderedDict), regressors, each with features
@@ -151,7 +169,9 @@ def tabularize_univariate_datetime(
 
     def _stride_time_features_for_forecasts(x):
         # only for case where n_lags > 0
-        return np.array([x[n_lags + i : n_lags + i + n_forecasts] for i in range(n_samples)])
+        # the features are repeated n_forecasts times, so they are strided in the dtype of the model inputs
+        x = x.astype(np.float32, copy=False)
+        return x[n_lags + np.arange(max(0, n_samples))[:, None] + np.arange(n_forecasts)[None, :]]
 
     # time is the time at each forecast step
     t = df.loc[:, "t"].values
@@ -172,13 +192,16 @@ def tabularize_univariate_datetime(
                 seasonalities[name] = _stride_time_features_for_forecasts(features)
         inputs["seasonalities"] = seasonalities
 
-    def _stride_lagged_features(df_col_name, feature_dims):
+    def _stride_lagged_features(df_col_name, lags):
         # only for case where n_lags > 0
+        # gathers only the given lags of each window, ordered from oldest to most recent
         series = df.loc[:, df_col_name].values
-        return np.array([series[i + n_lags - feature_dims : i + n_lags] for i in range(n_samples)])
+        positions = utils.lags_to_window_positions(lags, n_lags)
+        return series[np.arange(max(0, n_samples))[:, None] + positions[None, :]]
 
     if n_lags > 0 and "y" in df.columns:
-        inputs["lags"] = _stride_lagged_features(df_col_name="y_scaled", feature_dims=n_lags)
+        lags = list(range(1, n_lags + 1)) if ar_lags is None else ar_lags
+        inputs["lags"] = _stride_lagged_features(df_col_name="y_scaled", lags=lags)
         if np.isnan(inputs["lags"]).any():
             raise ValueError("Input lags contain NaN values in y.")
 
@@ -187,10 +210,8 @@ def tabularize_univariate_datetime(
         for covar in df.columns:
             if covar in covar_config:
                 assert n_lags > 0
-                window = n_lags
-                if covar_config[covar].as_scalar:
-                    window = 1
-                covariates[covar] = _stride_lagged_features(df_col_name=covar, feature_dims=window)
+                lags = covar_config[covar].window_lags(n_lags)
+                covariates[covar] = _stride_lagged_features(df_col_name=covar, lags=lags)
                 if np.isnan(covariates[covar]).any():
                     raise ValueError("Input lags contain NaN values in ", covar)
 
@@ -478,21 +499,107 @@ def seasonal_features_from_dates(dates, season_config):
     return seasonalities
 
 
-def merging_dataset(dataset):
-    all_items = []
-    for data in dataset:
-        for i in range(0, len(data)):
-            all_items.append(data[i])
-    return all_items
+class GlobalTimeDataset(TimeDataset):
+    def __init__(self, uncombined_dataset, series_ids=False):
+        """Combine TimeDatasets of several series into one, by concatenating their tensors.
 
+        Args:
+            uncombined_dataset (list of TimeDataset): datasets with identical inputs configuration
+            series_ids (bool): whether to add the input 'series' (torch tensor, long), dims: (1),
+                with the index of the series of each sample, e.g. for locally normalized data
+        """
+        self.two_level_inputs = ["seasonalities", "covariates"]
+        self.lengths = [len(dataset) for dataset in uncombined_dataset]
+        self.length = sum(self.lengths)
+        # series without samples may have tensors of deviating dims
+        datasets = [dataset for dataset in uncombined_dataset if len(dataset) > 0]
+        if len(datasets) == 0:
+            datasets = uncombined_dataset[:1]
+        self.inputs = OrderedDict({})
+        for key, data in datasets[0].inputs.items():
+            if isinstance(data, OrderedDict):
+                self.inputs[key] = OrderedDict(
+                    {name: torch.cat([dataset.inputs[key][name] for dataset in datasets]) for name in data.keys()}
+                )
+            else:
+                self.inputs[key] = torch.cat([dataset.inputs[key] for dataset in datasets])
+        self.targets = torch.cat([dataset.targets for dataset in datasets])
+        if series_ids:
+            self.inputs["series"] = torch.repeat_interleave(
+                torch.arange(len(self.lengths)), torch.tensor(self.lengths, dtype=torch.long)
+            )
+
+    @property
+    def offsets(self):
+        """Index of the first sample of each series, followed by the total number of samples."""
+        return np.concatenate(([0], np.cumsum(self.lengths))).astype(int)
+
+
+class RescaledSubset(Dataset):
+    """Subset of a TimeDataset, renormalized from the scaling values it was created with to others.
+
+    The normalization is affine, so the normalized time, lags, covariates, regressors and targets of the subset
+    are mapped to the other scaling values by a factor and an offset, once when the subset is created.
+    All other inputs, such as seasonalities and events, are fetched from the tensors of the dataset.
+    Lets models with their own scaling values, such as crossvalidation folds, share the tensors of one dataset.
+    """
 
-class GlobalTimeDataset(Dataset):
-    def __init__(self, uncombined_dataset, transform=None):
-        self.combined_timedataset = merging_dataset(uncombined_dataset)
+    def __init__(self, dataset, indices, data_params, new_data_params, regressors_config=None):
+        """
+        Args:
+            dataset (TimeDataset): dataset normalized with data_params
+            indices (np.array, int): indices of the samples of the subset
+            data_params (OrderedDict): scaling values the dataset was normalized with
+            new_data_params (OrderedDict): scaling values to renormalize to
+            regressors_config (OrderedDict): configuration of the future regressors of the dataset
+        """
+        self.dataset = dataset
+        self.indices = indices
+
+        def affine(name):
+            old, new = data_params[name], new_data_params[name]
+            return float(old.scale / new.scale), float((old.shift - new.shift) / new.scale)
+
+        def rescale(values, factor, offset):
+            return values[indices] * factor + offset
+
+        self.inputs = OrderedDict({"time": rescale(dataset.inputs["time"], *affine("ds"))})
+        if "lags" in dataset.inputs:
+            self.inputs["lags"] = rescale(dataset.inputs["lags"], *affine("y"))
+        if "covariates" in dataset.inputs:
+            self.inputs["covariates"] = OrderedDict(
+                {name: rescale(values, *affine(name)) for name, values in dataset.inputs["covariates"].items()}
+            )
+        if "regressors" in dataset.inputs:
+            self.inputs["regressors"] = OrderedDict({})
+            for mode, values in dataset.inputs["regressors"].items():
+                # the columns of each mode are ordered by name, as in make_regressors_features
+                names = sorted([name for name, config in regressors_config.items() if config.mode == mode])
+                factors, offsets = zip(*[affine(name) for name in names])
+                self.inputs["regressors"][mode] = rescale(values, torch.tensor(factors), torch.tensor(offsets))
+        self.targets = rescale(dataset.targets, *affine("y"))
 
-    def __len__(self):
-        return len(self.combined_timedataset)
+    def __getitem__(self, index):
+        """Sample at index of the subset.
+
+        Args:
+            index (int): sample location in the subset
+
+        Returns:
+            sample (OrderedDict): model inputs, as returned by TimeDataset
+            targets (torch tensor, float): targets to be predicted, dims: (n_forecasts)
+        """
+        sample = OrderedDict({})
+        for key, data in self.dataset.inputs.items():
+            if key in self.inputs:
+                data, position = self.inputs[key], index
+            else:
+                position = self.indices[index]
+            if isinstance(data, OrderedDict):
+                sample[key] = OrderedDict({name: values[position] for name, values in data.items()})
+            else:
+                sample[key] = data[position]
+        return sample, self.targets[index]
 
-    def __getitem__(self, idx):
-        sample = self.combined_timedataset[idx]
-        return sample
+    def __len__(self):
+        return len(self.indices)
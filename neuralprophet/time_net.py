@@ -1,4 +1,5 @@
 from collections import OrderedDict
+import copy
 import numpy as np
 import torch
 import torch.nn as nn
@@ -27,6 +28,93 @@ def new_param(dims):
         return nn.Parameter(torch.nn.init.xavier_normal_(torch.randn([1] + dims)).squeeze(0), requires_grad=True)
 
 
+class LowRankLinear(nn.Module):
+    """Linear layer with its weight factorized into two matrices of given rank.
+
+    Reduces the parameters of a (in_features x out_features) layer to rank * (in_features + out_features).
+    """
+
+    def __init__(self, in_features, out_features, rank, bias=True):
+        """
+        Args:
+            in_features (int): size of each input sample
+            out_features (int): size of each output sample
+            rank (int): rank of the factorized weight, lower than in_features and out_features
+            bias (bool): whether to learn an additive bias
+        """
+        super(LowRankLinear, self).__init__()
+        if not 1 <= rank < min(in_features, out_features):
+            raise ValueError(
+                "Rank {} of a low-rank layer must be at least 1 and lower than {}.".format(
+                    rank, min(in_features, out_features)
+                )
+            )
+        self.down = nn.Linear(in_features, rank, bias=False)
+        self.up = nn.Linear(rank, out_features, bias=bias)
+        # same variance of the reconstructed weight as with kaiming_normal_ of a full layer
+        nn.init.kaiming_normal_(self.down.weight, mode="fan_in")
+        nn.init.normal_(self.up.weight, std=1.0 / np.sqrt(rank))
+
+    @property
+    def weight(self):
+        """Reconstructed full weight of dims (out_features, in_features)"""
+        return torch.matmul(self.up.weight, self.down.weight)
+
+    def forward(self, x):
+        return self.up(self.down(x))
+
+
+def lagged_net(d_inputs, d_outputs, num_hidden_layers, d_hidden, rank=None):
+    """Create the layers of an AR-Net for lagged inputs.
+
+    Args:
+        d_inputs (int): number of lagged inputs
+        d_outputs (int): number of outputs, aka n_forecasts
+        num_hidden_layers (int): number of hidden layers
+        d_hidden (int): dimensionality of hidden layers
+        rank (int): if set, the input layer is factorized to this rank (LowRankLinear),
+            unless it is already of lower rank.
+
+    Returns:
+        nn.ModuleList of layers
+    """
+    net = nn.ModuleList()
+    for i in range(num_hidden_layers + 1):
+        d_out = d_hidden if i < num_hidden_layers else d_outputs
+        bias = i < num_hidden_layers
+        if i == 0 and rank is not None and rank < min(d_inputs, d_out):
+            net.append(LowRankLinear(d_inputs, d_out, rank=rank, bias=bias))
+        else:
+            lay = nn.Linear(d_inputs, d_out, bias=bias)
+            nn.init.kaiming_normal_(lay.weight, mode="fan_in")
+            net.append(lay)
+        d_inputs = d_out
+    return net
+
+
+def select_lagged_inputs(net, keep):
+    """Rebuild the input layer of a lagged net to take only a subset of its inputs.
+
+    Args:
+        net (nn.ModuleList): layers, as created by lagged_net
+        keep (list of int): indices of the inputs to keep
+    """
+    layer = net[0]
+    with torch.no_grad():
+        if isinstance(layer, LowRankLinear):
+            new_layer = LowRankLinear(
+                len(keep), layer.up.out_features, rank=layer.down.out_features, bias=layer.up.bias is not None
+            )
+            new_layer.down.weight.copy_(layer.down.weight[:, keep])
+            new_layer.up.load_state_dict(layer.up.state_dict())
+        else:
+            new_layer = nn.Linear(len(keep), layer.out_features, bias=layer.bias is not None)
+            new_layer.weight.copy_(layer.weight[:, keep])
+            if layer.bias is not None:
+                new_layer.bias.copy_(layer.bias)
+    net[0] = new_layer
+
+
 class TimeNet(nn.Module):
     """Linear time regression fun and some not so linear fun.
 
@@ -53,6 +141,8 @@ class TimeNet(nn.Module):
         n_lags=0,
         num_hidden_layers=0,
         d_hidden=None,
+        ar_rank=None,
+        ar_lags=None,
     ):
         """
         Args:
@@ -69,6 +159,10 @@ class TimeNet(nn.Module):
                 0 (default): no hidden layers, corresponds to classic Auto-Regression
             d_hidden (int): dimensionality of hidden layers  (for AR-Net). ignored if no hidden layers.
                 None (default): sets to n_lags + n_forecasts
+            ar_rank (int): rank of the low-rank factorized input layer of AR-Net and covariate nets.
+                None (default): no factorization
+            ar_lags (list of int): lags of the series used as AR inputs.
+                None (default): all lags from 1 to n_lags
         """
         super(TimeNet, self).__init__()
         # General
@@ -146,15 +240,12 @@ class TimeNet(nn.Module):
         self.n_lags = n_lags
         self.num_hidden_layers = num_hidden_layers
         self.d_hidden = n_lags + n_forecasts if d_hidden is None else d_hidden
+        self.ar_rank = ar_rank
+        self.ar_lags = list(range(1, self.n_lags + 1)) if ar_lags is None else ar_lags
         if self.n_lags > 0:
-            self.ar_net = nn.ModuleList()
-            d_inputs = self.n_lags
-            for i in range(self.num_hidden_layers):
-                self.ar_net.append(nn.Linear(d_inputs, self.d_hidden, bias=True))
-                d_inputs = self.d_hidden
-            self.ar_net.append(nn.Linear(d_inputs, self.n_forecasts, bias=False))
-            for lay in self.ar_net:
-                nn.init.kaiming_normal_(lay.weight, mode="fan_in")
+            self.ar_net = lagged_net(
+                len(self.ar_lags), self.n_forecasts, self.num_hidden_layers, self.d_hidden, rank=self.ar_rank
+            )
 
         # Covariates
         self.config_covar = config_covar
@@ -162,17 +253,10 @@ class TimeNet(nn.Module):
             assert self.n_lags > 0
             self.covar_nets = nn.ModuleDict({})
             for covar in self.config_covar.keys():
-                covar_net = nn.ModuleList()
-                d_inputs = self.n_lags
-                if self.config_covar[covar].as_scalar:
-                    d_inputs = 1
-                for i in range(self.num_hidden_layers):
-                    covar_net.append(nn.Linear(d_inputs, self.d_hidden, bias=True))
-                    d_inputs = self.d_hidden
-                covar_net.append(nn.Linear(d_inputs, self.n_forecasts, bias=False))
-                for lay in covar_net:
-                    nn.init.kaiming_normal_(lay.weight, mode="fan_in")
-                self.covar_nets[covar] = covar_net
+                d_inputs = len(self.config_covar[covar].window_lags(self.n_lags))
+                self.covar_nets[covar] = lagged_net(
+                    d_inputs, self.n_forecasts, self.num_hidden_layers, self.d_hidden, rank=self.ar_rank
+                )
 
         ## Regressors
         self.config_regressors = config_regressors
@@ -218,6 +302,38 @@ class TimeNet(nn.Module):
         """sets property auto-regression weights for regularization. Update if AR is modelled differently"""
         return self.ar_net[0].weight
 
+    def prune_lagged_inputs(self, threshold):
+        """Remove lags with near-zero weights from AR-Net and covariate nets.
+
+        An input is removed if all its weights of the input layer are smaller in magnitude than
+        threshold times the largest weight magnitude of the layer. Scalar covariates are not pruned.
+        Args:
+            threshold (float): [0-1], relative to the largest absolute weight
+
+        Returns:
+            OrderedDict of remaining lags (list of int), with keys 'AR' and the covariate names
+        """
+
+        def surviving_lags(weights, lags):
+            importance = torch.max(torch.abs(weights.detach()), dim=0).values
+            keep = torch.nonzero(importance >= threshold * torch.max(importance)).flatten().tolist()
+            # inputs are ordered from oldest to most recent
+            return keep, sorted(lags[::-1][i] for i in keep)
+
+        remaining = OrderedDict({})
+        if self.n_lags > 0:
+            keep, self.ar_lags = surviving_lags(self.ar_weights, self.ar_lags)
+            select_lagged_inputs(self.ar_net, keep)
+            remaining["AR"] = self.ar_lags
+        if self.config_covar is not None:
+            for name, covar in self.config_covar.items():
+                if covar.as_scalar:
+                    continue
+                keep, covar.lags = surviving_lags(self.get_covar_weights(name), covar.window_lags(self.n_lags))
+                select_lagged_inputs(self.covar_nets[name], keep)
+                remaining[name] = covar.lags
+        return remaining
+
     def get_covar_weights(self, name):
         """sets property auto-regression weights for regularization. Update if AR is modelled differently"""
         return self.covar_nets[name][0].weight
@@ -445,36 +561,36 @@ class TimeNet(nn.Module):
         multiplicative_components = torch.zeros_like(inputs["time"])
 
         if "lags" in inputs:
-            additive_components += self.auto_regression(lags=inputs["lags"])
+            additive_components = additive_components + self.auto_regression(lags=inputs["lags"])
         # else: assert self.n_lags == 0
 
         if "covariates" in inputs:
-            additive_components += self.all_covariates(covariates=inputs["covariates"])
+            additive_components = additive_components + self.all_covariates(covariates=inputs["covariates"])
 
         if "seasonalities" in inputs:
             s = self.all_seasonalities(s=inputs["seasonalities"])
             if self.config_season.mode == "additive":
-                additive_components += s
+                additive_components = additive_components + s
             elif self.config_season.mode == "multiplicative":
-                multiplicative_components += s
+                multiplicative_components = multiplicative_components + s
 
         if "events" in inputs:
             if "additive" in inputs["events"].keys():
-                additive_components += self.scalar_features_effects(
+                additive_components = additive_components + self.scalar_features_effects(
                     inputs["events"]["additive"], self.event_params["additive"]
                 )
             if "multiplicative" in inputs["events"].keys():
-                multiplicative_components += self.scalar_features_effects(
+                multiplicative_components = multiplicative_components + self.scalar_features_effects(
                     inputs["events"]["multiplicative"], self.event_params["multiplicative"]
                 )
 
         if "regressors" in inputs:
             if "additive" in inputs["regressors"].keys():
-                additive_components += self.scalar_features_effects(
+                additive_components = additive_components + self.scalar_features_effects(
                     inputs["regressors"]["additive"], self.regressor_params["additive"]
                 )
             if "multiplicative" in inputs["regressors"].keys():
-                multiplicative_components += self.scalar_features_effects(
+                multiplicative_components = multiplicative_components + self.scalar_features_effects(
                     inputs["regressors"]["multiplicative"], self.regressor_params["multiplicative"]
                 )
 
@@ -558,6 +674,241 @@ class TimeNet(nn.Module):
         return components
 
 
+class FlatTimeNet(nn.Module):
+    """TimeNet with a flat, fixed input schema, e.g. for export to ONNX.
+
+    The nested input dict of TimeNet is replaced by positional tensors, in the order of ``input_names``.
+    Inputs which the model does not use are left out of the schema.
+        time (float): normalized time, dims: (batch, n_forecasts)
+        lags (float): previous normalized time series values, dims: (batch, len(ar_lags))
+        seasonalities (float): features of all seasonalities, concatenated in order of ``season_dims``,
+            dims: (batch, n_forecasts, sum of seasonality dims)
+        covariates (float): lagged values of all covariates, concatenated in order of ``config_covar``,
+            dims: (batch, sum of covariate windows)
+        events_additive, events_multiplicative (float): event features, dims: (batch, n_forecasts, n_features)
+        regressors_additive, regressors_multiplicative (float): regressor features,
+            dims: (batch, n_forecasts, n_features)
+    The output is the forecast of dims (batch, n_forecasts), denormalized if ``y_shift`` and ``y_scale`` are given.
+    """
+
+    def __init__(self, model, y_shift=0.0, y_scale=1.0):
+        """
+        Args:
+            model (TimeNet): fitted model to wrap
+            y_shift (float): shift of the target normalization
+            y_scale (float): scale of the target normalization
+        """
+        super(FlatTimeNet, self).__init__()
+        self.model = model
+        self.y_shift = float(y_shift)
+        self.y_scale = float(y_scale)
+        self.season_names = []
+        self.season_sizes = []
+        if model.season_dims is not None:
+            self.season_names = list(model.season_dims.keys())
+            self.season_sizes = list(model.season_dims.values())
+        self.covar_names = []
+        self.covar_sizes = []
+        if model.config_covar is not None:
+            self.covar_names = list(model.config_covar.keys())
+            self.covar_sizes = [len(model.config_covar[name].window_lags(model.n_lags)) for name in self.covar_names]
+
+        self.input_names = ["time"]
+        if model.n_lags > 0:
+            self.input_names.append("lags")
+        if len(self.season_names) > 0:
+            self.input_names.append("seasonalities")
+        if len(self.covar_names) > 0:
+            self.input_names.append("covariates")
+        for key, params in [("events", "event_params"), ("regressors", "regressor_params")]:
+            if hasattr(model, params):
+                for mode in ["additive", "multiplicative"]:
+                    if getattr(model, params)[mode].shape[0] > 0:
+                        self.input_names.append("{}_{}".format(key, mode))
+
+    def flatten_inputs(self, inputs):
+        """Convert nested TimeNet inputs to the flat input schema.
+
+        Args:
+            inputs (OrderedDict): model inputs as returned by TimeDataset
+
+        Returns:
+            OrderedDict of flat input tensors, keyed by ``input_names``
+        """
+        flat = OrderedDict({})
+        for name in self.input_names:
+            if name == "seasonalities":
+                flat[name] = torch.cat([inputs[name][season] for season in self.season_names], dim=-1)
+            elif name == "covariates":
+                flat[name] = torch.cat([inputs[name][covar] for covar in self.covar_names], dim=-1)
+            elif "_" in name:
+                key, mode = name.split("_")
+                flat[name] = inputs[key][mode]
+            else:
+                flat[name] = inputs[name]
+        return flat
+
+    def forward(self, *args):
+        """Forward pass with flat inputs.
+
+        Args:
+            *args (torch tensor, float): inputs in the order of ``input_names``
+
+        Returns:
+            forecast of dims (batch, n_forecasts)
+        """
+        inputs = OrderedDict({})
+        for name, x in zip(self.input_names, args):
+            if name == "seasonalities":
+                inputs[name] = OrderedDict(zip(self.season_names, torch.split(x, self.season_sizes, dim=-1)))
+            elif name == "covariates":
+                inputs[name] = OrderedDict(zip(self.covar_names, torch.split(x, self.covar_sizes, dim=-1)))
+            elif "_" in name:
+                key, mode = name.split("_")
+                inputs.setdefault(key, OrderedDict({}))[mode] = x
+            else:
+                inputs[name] = x
+        return self.model.forward(inputs) * self.y_scale + self.y_shift
+
+
+def _architecture(model):
+    """Summarize what must be identical for two TimeNets to be evaluated with the same forward pass."""
+    changepoints = getattr(model, "trend_changepoints_t", None)
+    return (
+        [(name, tuple(param.shape)) for name, param in model.named_parameters()],
+        model.n_forecasts,
+        model.n_lags,
+        model.ar_lags,
+        model.num_hidden_layers,
+        model.config_trend.growth,
+        getattr(model, "segmentwise_trend", None),
+        None if changepoints is None else changepoints.tolist(),
+        None if model.season_dims is None else (model.config_season.mode, dict(model.season_dims)),
+        model.events_dims,
+        model.regressors_dims,
+    )
+
+
+class StackedTimeNet(nn.Module):
+    """N TimeNets of identical architecture, evaluated in one vectorized forward pass.
+
+    The parameters of the models are stacked along a new leading dimension and the forward pass
+    is vectorized over it with torch.func (requires torch >= 2.0).
+    The stacked parameters are the parameters of this module, so that a single optimizer trains
+    the N models jointly, each with its own loss (see ``loss`` and ``fit``).
+    Note: regularization is not applied to the stacked models.
+    """
+
+    def __init__(self, models):
+        """
+        Args:
+            models (list of TimeNet): models with identical architecture and configuration
+        """
+        from torch.func import stack_module_state
+
+        super(StackedTimeNet, self).__init__()
+        if len(models) == 0:
+            raise ValueError("No models to stack.")
+        architecture = _architecture(models[0])
+        for model in models[1:]:
+            if _architecture(model) != architecture:
+                raise ValueError("Only models with identical architecture and configuration can be stacked.")
+        self.n_models = len(models)
+        params, _ = stack_module_state(models)
+        self.param_names = list(params.keys())
+        # ParameterDict keys may not contain dots
+        self.stacked_params = nn.ParameterDict(
+            {name.replace(".", "-"): nn.Parameter(param) for name, param in params.items()}
+        )
+        # not registered as submodule: its parameters are replaced by the stacked ones in forward
+        self.__dict__["base_model"] = copy.deepcopy(models[0])
+
+    def _params(self):
+        return OrderedDict({name: self.stacked_params[name.replace(".", "-")] for name in self.param_names})
+
+    def forward(self, inputs):
+        """Forward pass of all stacked models over a shared batch.
+
+        Args:
+            inputs (dict): model inputs, as for TimeNet.forward
+
+        Returns:
+            forecast of dims (n_models, batch, n_forecasts)
+        """
+        from torch.func import functional_call, vmap
+
+        def model_forward(params, x):
+            return functional_call(self.base_model, params, (x,))
+
+        return vmap(model_forward, in_dims=(0, None))(self._params(), inputs)
+
+    def loss(self, predicted, targets, loss_func):
+        """Compute the loss of each stacked model.
+
+        Args:
+            predicted (torch tensor, float): output of forward, dims: (n_models, batch, n_forecasts)
+            targets (torch tensor, float): targets shared by all models, dims: (batch, n_forecasts)
+            loss_func (callable): loss function reducing to a scalar, e.g. config_train.loss_func
+
+        Returns:
+            losses of dims (n_models). Their sum can be backpropagated to train all models independently.
+        """
+        from torch.func import vmap
+
+        return vmap(loss_func, in_dims=(0, None))(predicted, targets)
+
+    def fit(self, loader, config_train):
+        """Train all stacked models jointly, in one loop over a shared data loader.
+
+        Each step computes the forward pass of all models at once and backpropagates the sum of their losses,
+        so that each model receives the gradient of its own loss. The optimizer (AdamW or SGD) updates
+        every parameter element independently, hence this equals training the models one after the other
+        with the same batches.
+
+        Args:
+            loader (torch DataLoader): training samples shared by all models, e.g. from NeuralProphet._create_dataset
+            config_train (configure.Train): training configuration with epochs and learning_rate set,
+                provides loss function, optimizer and 1cycle scheduler
+
+        Returns:
+            np.array of the mean loss of each model in each epoch, dims: (epochs, n_models)
+        """
+        if config_train.epochs is None or config_train.learning_rate is None:
+            raise ValueError("Training stacked models requires epochs and learning_rate to be set.")
+        epochs = config_train.epochs
+        optimizer = config_train.get_optimizer(self.parameters())
+        scheduler = config_train.get_scheduler(optimizer, steps_per_epoch=len(loader))
+        epoch_losses = np.zeros((epochs, self.n_models))
+        for e in range(epochs):
+            n_samples = 0
+            for inputs, targets in loader:
+                losses = self.loss(self.forward(inputs), targets, config_train.loss_func)
+                optimizer.zero_grad()
+                losses.sum().backward()
+                optimizer.step()
+                scheduler.step()
+                epoch_losses[e] += losses.detach().numpy() * len(targets)
+                n_samples += len(targets)
+            epoch_losses[e] /= max(1, n_samples)
+        return epoch_losses
+
+    def unstack(self):
+        """Split the stacked parameters into separate TimeNets.
+
+        Returns:
+            list of TimeNet, one per stacked model
+        """
+        params = self._params()
+        models = []
+        for i in range(self.n_models):
+            model = copy.deepcopy(self.base_model)
+            with torch.no_grad():
+                for name, param in model.named_parameters():
+                    param.copy_(params[name][i])
+            models.append(model)
+        return models
+
+
 class FlatNet(nn.Module):
     """
     Linear regression fun
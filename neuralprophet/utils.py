@@ -300,6 +300,43 @@ def regressors_config_to_model_dims(regressors_config):
         return regressors_dims_dic
 
 
+def lags_to_list(lags):
+    """
+    Convert a lag specification to a sorted list of unique lags.
+    Args:
+        lags (int, range or list of int and range): lags, where lag 1 is the most recent value.
+            e.g. [range(1, 25), 168, 336] for the last day and the same hour one and two weeks ago,
+            or range(24, 8761, 24) for a dilated window.
+
+    Returns:
+        lags (list of int): ascending
+    """
+    if isinstance(lags, (int, np.integer, range)):
+        lags = [lags]
+    lag_list = []
+    for lag in lags:
+        if isinstance(lag, range):
+            lag_list.extend(lag)
+        else:
+            lag_list.append(int(lag))
+    if len(lag_list) == 0 or min(lag_list) < 1:
+        raise ValueError("Lags must be positive integers.")
+    return sorted(set(lag_list))
+
+
+def lags_to_window_positions(lags, n_lags):
+    """
+    Positions of lags in a window of the last n_lags values, ordered from oldest to most recent.
+    Args:
+        lags (list of int): ascending lags, where lag 1 is the most recent value.
+        n_lags (int): window length
+
+    Returns:
+        positions (np.array, int): window positions, in the order of the lagged model inputs
+    """
+    return n_lags - np.array(lags[::-1], dtype=int)
+
+
 def set_auto_seasonalities(df, season_config, local_modeling=False):
     """Set seasonalities that were left on auto or set by user.
 
@@ -405,7 +442,7 @@ def fcst_df_to_last_forecast(fcst, n_last=1):
     cols = list(range(n_forecast_steps))
     for i in range(n_last - 1, -1, -1):
         forecast_name = "yhat{}".format(i + 1)
-        df[forecast_name] = None
+        df[forecast_name] = np.nan
         rows = len(df) + np.arange(-n_forecast_steps - i, -i, 1)
         last = yhats.values[rows, cols]
         df.loc[rows, forecast_name] = last
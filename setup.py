@@ -28,6 +28,7 @@ setuptools.setup(
     extras_require={
         "dev": ["livelossplot>=0.5.3", "black", "twine", "wheel", "sphinx>=4.2.0"],
         "live": ["livelossplot>=0.5.3"],
+        "onnx": ["onnx", "onnxruntime"],
     },
     # setup_requires=[""],
     scripts=["scripts/neuralprophet_dev_setup"],
@@ -3,15 +3,20 @@
 import unittest
 import os
 import pathlib
+import tempfile
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import logging
 import math
 import torch
+from torch.utils.data import DataLoader
 
 from neuralprophet import NeuralProphet, set_random_seed
 from neuralprophet import df_utils
+from neuralprophet import time_dataset
+from neuralprophet.numpy_forecaster import NumpyForecaster
+from neuralprophet.time_net import StackedTimeNet, LowRankLinear
 
 log = logging.getLogger("NP.test")
 log.setLevel("WARNING")
@@ -556,6 +561,19 @@ class IntegrationTests(unittest.TestCase):
             fold_overlap_pct=0.5,
         )
 
+    def test_crossvalidate(self):
+        log.info("CV on a shared dataset")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        for num_processes in [1, 2]:
+            m = NeuralProphet(n_lags=5, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=0.1)
+            folds_metrics = m.crossvalidate(
+                df, freq="D", k=3, fold_pct=0.1, fold_overlap_pct=0.5, num_processes=num_processes
+            )
+            assert len(folds_metrics) == 3
+            assert all([len(metrics_df) == EPOCHS for metrics_df in folds_metrics])
+            assert all([np.isfinite(metrics_df["MAE_val"].values).all() for metrics_df in folds_metrics])
+            assert not m.fitted
+
     def test_loss_func(self):
         log.info("TEST setting torch.nn loss func")
         df = pd.read_csv(PEYTON_FILE, nrows=512)
@@ -832,3 +850,465 @@ class IntegrationTests(unittest.TestCase):
         metrics_df = m.fit(df, freq="D")
         assert metrics_df is not None
         forecast = m.predict(df)
+
+    def test_numpy_export(self):
+        log.info("testing: Numpy Export")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        # the numpy evaluator expects clean data without gaps
+        df, _ = df_utils.add_missing_dates_nan(df, freq="D")
+        df["y"] = df["y"].interpolate()
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        df["B"] = df["y"].rolling(30, min_periods=1).mean()
+        playoffs = pd.DataFrame({"event": "playoff", "ds": pd.to_datetime(["2008-01-13", "2009-01-03"])})
+        m = NeuralProphet(
+            n_lags=5,
+            n_forecasts=3,
+            seasonality_mode="multiplicative",
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+        )
+        m = m.add_lagged_regressor(names="A")
+        m = m.add_future_regressor(name="B")
+        m = m.add_events("playoff", lower_window=-1, upper_window=1)
+        m = m.add_country_holidays("US", mode="multiplicative")
+        history_df = m.create_df_with_events(df, playoffs)
+        m.fit(history_df, freq="D")
+        future = m.make_future_dataframe(
+            history_df,
+            events_df=playoffs,
+            regressors_df=pd.DataFrame({"B": df["B"].values[-3:]}),
+            n_historic_predictions=True,
+        )
+        forecast = m.predict(future, decompose=False)
+        np_model = m.export_numpy()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.npz")
+            np_model.save(path)
+            np_model = NumpyForecaster.load(path)
+        np_forecast = np_model.predict([future, future])
+        assert len(np_forecast) == 2
+        assert list(np_forecast[0].columns) == list(forecast.columns)
+        for i in range(1, m.n_forecasts + 1):
+            yhat = forecast["yhat{}".format(i)].values.astype(float)
+            np_yhat = np_forecast[1]["yhat{}".format(i)].values
+            assert np.allclose(yhat, np_yhat, rtol=1e-4, atol=1e-4, equal_nan=True)
+
+        m = NeuralProphet(n_lags=3, num_hidden_layers=1, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df[["ds", "y"]], freq="D")
+        self.assertRaises(ValueError, m.export_numpy)
+
+    def test_onnx_export(self):
+        log.info("testing: ONNX export")
+        try:
+            import onnxruntime
+        except ImportError:
+            self.skipTest("onnxruntime is not installed")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        df["B"] = df["y"].rolling(30, min_periods=1).mean()
+        m = NeuralProphet(n_lags=5, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A")
+        m = m.add_future_regressor("B", mode="multiplicative")
+        m = m.add_country_holidays("US", lower_window=-1)
+        m.fit(df, freq="D")
+        dates, predicted, _ = m._predict_raw(m._prepare_dataframe_to_predict(df))
+        flat_dates, inputs = m.make_flat_inputs(df)
+        assert (flat_dates.values == dates.values).all()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.onnx")
+            input_names = m.export_onnx(path)
+            session = onnxruntime.InferenceSession(path)
+        assert input_names == list(inputs.keys())
+        onnx_predicted = session.run(None, dict(inputs))[0]
+        assert np.allclose(predicted, onnx_predicted, rtol=1e-4, atol=1e-4)
+
+    def test_inference_precision(self):
+        log.info("testing: reduced-precision inference")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        m = NeuralProphet(n_lags=14, n_forecasts=7, num_hidden_layers=1, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df, freq="D")
+        forecast = m.predict(df)
+        for precision in ["bfloat16", "int8"]:
+            m.set_inference_precision(precision)
+            reduced = m.predict(df)
+            yhat = forecast["yhat7"].values.astype(float)
+            assert np.allclose(yhat, reduced["yhat7"].values.astype(float), rtol=0.1, equal_nan=True)
+        assert m.quantized_model is not None
+        m.set_inference_precision("float32")
+        assert m.quantized_model is None
+        self.assertRaises(ValueError, m.set_inference_precision, "float16")
+
+    def test_stacked_time_net(self):
+        log.info("testing: stacked TimeNet")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        models = []
+        for seed in range(3):
+            set_random_seed(seed)
+            m = NeuralProphet(n_lags=10, n_forecasts=3, num_hidden_layers=1, epochs=EPOCHS, batch_size=BATCH_SIZE)
+            m = m.add_country_holidays("US", mode="multiplicative")
+            m.fit(df, freq="D")
+            models.append(m)
+        stacked = StackedTimeNet([m.model for m in models])
+        dataset = models[0]._create_dataset(models[0]._prepare_dataframe_to_predict(df), predict_mode=False)
+        inputs, targets = next(iter(DataLoader(dataset, batch_size=BATCH_SIZE)))
+        with torch.no_grad():
+            predicted = stacked(inputs)
+            for i, m in enumerate(models):
+                assert torch.allclose(predicted[i], m.model(inputs), atol=1e-6)
+        assert predicted.shape == (3, BATCH_SIZE, 3)
+        # joint training with independent losses
+        loader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
+        losses = stacked.fit(loader, models[0].config_train)
+        assert losses.shape == (EPOCHS, 3)
+        assert np.isfinite(losses).all()
+        unstacked = stacked.unstack()
+        with torch.no_grad():
+            predicted = stacked(inputs)
+            for i, model in enumerate(unstacked):
+                assert torch.allclose(predicted[i], model(inputs), atol=1e-6)
+        m = NeuralProphet(n_lags=5, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df, freq="D")
+        self.assertRaises(ValueError, StackedTimeNet, [models[0].model, m.model])
+
+    def test_lowrank_ar(self):
+        log.info("testing: low-rank AR")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        df["B"] = df["y"].rolling(30, min_periods=1).mean()
+        m = NeuralProphet(n_lags=60, n_forecasts=7, ar_rank=3, ar_sparsity=0.1, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A")
+        m = m.add_lagged_regressor(names="B", only_last_value=True)
+        m.fit(df, freq="D")
+        assert isinstance(m.model.ar_net[0], LowRankLinear)
+        assert isinstance(m.model.covar_nets["A"][0], LowRankLinear)
+        assert isinstance(m.model.covar_nets["B"][0], torch.nn.Linear)
+        assert m.model.ar_weights.shape == (7, 60)
+        assert sum(p.numel() for p in m.model.ar_net.parameters()) == 3 * (60 + 7)
+        self.assertRaises(ValueError, NeuralProphet, n_lags=60, ar_rank=0)
+        self.assertRaises(ValueError, LowRankLinear, 60, 7, rank=7)
+        forecast = m.predict(df)
+        if self.plot:
+            m.plot(forecast)
+            m.plot_parameters()
+            plt.show()
+
+    def test_ar_lags(self):
+        log.info("testing: sparse AR lags")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        m = NeuralProphet(ar_lags=[range(1, 8), 14, 28], n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A", lags=[1, 7])
+        assert m.n_lags == 28
+        metrics_df = m.fit(df, freq="D")
+        assert m.model.ar_weights.shape == (3, 9)
+        assert m.model.get_covar_weights("A").shape == (3, 2)
+        future = m.make_future_dataframe(df, n_historic_predictions=True)
+        forecast = m.predict(future)
+        m = NeuralProphet(ar_lags=[1, 7, 14], epochs=EPOCHS, batch_size=BATCH_SIZE)
+        self.assertRaises(ValueError, m.add_lagged_regressor, "A", lags=[30])
+        if self.plot:
+            m.plot(forecast)
+            m.plot_parameters()
+            plt.show()
+
+    def test_prune_lags(self):
+        log.info("testing: pruning of lags")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        m = NeuralProphet(n_lags=14, n_forecasts=3, ar_sparsity=0.1, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A")
+        df_train, df_val = m.split_df(df, freq="D", valid_p=0.2)
+        m.fit(df_train, freq="D")
+        # pruning is equivalent to setting the removed weights to zero
+        for layer in [m.model.ar_net[0], m.model.covar_nets["A"][0]]:
+            importance = torch.max(torch.abs(layer.weight.detach()), dim=0).values
+            removed = importance < 0.3 * torch.max(importance)
+            with torch.no_grad():
+                layer.weight[:, removed] = 0
+        expected = m.predict(df_val)
+        report = m.prune_lags(threshold=0.3, validation_df=df_val)
+        log.debug(report)
+        assert len(m.config_covar["A"].lags) == int((~removed).sum())
+        assert m.model.ar_weights.shape == (3, len(m.model.ar_lags))
+        assert report.loc["after", "lagged_inputs"] < report.loc["before", "lagged_inputs"]
+        assert "MAE" in report.columns
+        forecast = m.predict(df_val)
+        for i in range(1, 4):
+            yhat = forecast["yhat{}".format(i)].values.astype(float)
+            assert np.allclose(yhat, expected["yhat{}".format(i)].values.astype(float), atol=1e-5, equal_nan=True)
+
+    def test_predict_latest(self):
+        log.info("testing: predict latest forecast")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        playoffs = pd.DataFrame(
+            {
+                "event": "playoff",
+                "ds": pd.to_datetime(["2008-01-13", "2009-01-03", "2010-01-16", "2010-01-24", "2010-02-07"]),
+            }
+        )
+        for n_lags, n_forecasts in [(14, 7), (0, 1)]:
+            m = NeuralProphet(n_lags=n_lags, n_forecasts=n_forecasts, epochs=EPOCHS, batch_size=BATCH_SIZE)
+            m = m.add_events("playoff", upper_window=1)
+            m = m.add_country_holidays("US")
+            history_df = m.create_df_with_events(df, playoffs)
+            m.fit(history_df, freq="D")
+            future = m.make_future_dataframe(history_df, events_df=playoffs)
+            forecast = m.predict(future)
+            latest = m.predict_latest(history_df, events_df=playoffs, decompose=True)
+            assert len(latest) == n_forecasts
+            assert (latest["ds"].values == forecast["ds"].values[-n_forecasts:]).all()
+            for i in range(1, n_forecasts + 1):
+                yhat = float(forecast["yhat{}".format(i)].iloc[-n_forecasts + i - 1])
+                assert np.isclose(latest["yhat"].iloc[i - 1], yhat, atol=1e-5)
+            assert "trend" in latest.columns
+        # without lags and events, only the datestamp of the last row is needed
+        m = NeuralProphet(n_lags=0, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df, freq="D")
+        forecast = m.predict(m.make_future_dataframe(df))
+        latest = m.predict_latest(df)
+        assert len(latest) == 1
+        assert latest["ds"].iloc[0] == forecast["ds"].iloc[-1]
+        assert np.isclose(latest["yhat"].iloc[0], forecast["yhat1"].iloc[-1], atol=1e-5)
+
+    def test_online_forecaster(self):
+        log.info("testing: online forecaster")
+        df = pd.read_csv(YOS_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(12, min_periods=1).mean()
+        m = NeuralProphet(n_lags=24, n_forecasts=6, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A", lags=[1, 2, 12])
+        m.fit(df.iloc[:400], freq="5min")
+        online = m.make_online_forecaster(df.iloc[:400])
+        for k in range(400, 410):
+            dates, yhat = online.update(df["ds"].iloc[k], df["y"].iloc[k], {"A": df["A"].iloc[k]})
+        latest = m.predict_latest(df.iloc[:410])
+        assert (latest["ds"].values == dates).all()
+        assert np.allclose(latest["yhat"].values, yhat, atol=1e-5)
+        self.assertRaises(ValueError, online.update, df["ds"].iloc[411], df["y"].iloc[411], {"A": 1.0})
+        # a locally normalized series, by its position among the fitted series
+        df_scaled = df.assign(y=df["y"] * 100.0, A=df["A"] * 100.0)
+        m = NeuralProphet(n_lags=24, n_forecasts=6, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A", lags=[1, 2, 12])
+        m.fit([df.iloc[:400], df_scaled.iloc[:400]], freq="5min", local_modeling=True)
+        online = m.make_online_forecaster(df_scaled.iloc[:400], series=1)
+        _, yhat = online.update(df_scaled["ds"].iloc[400], df_scaled["y"].iloc[400], {"A": df_scaled["A"].iloc[400]})
+        latest = m.predict_latest(df_scaled.iloc[:401], series=1)
+        assert np.allclose(latest["yhat"].values, yhat, rtol=1e-4)
+        # events, country holidays and future regressors, around new year and a playoff
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["ds"] = pd.to_datetime(df["ds"])
+        df["B"] = df["y"].rolling(7, min_periods=1).mean()
+        playoffs = pd.DataFrame({"event": "playoff", "ds": pd.to_datetime(["2008-01-13", "2009-01-03"])})
+        m = NeuralProphet(n_lags=7, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_events("playoff", upper_window=2)
+        m = m.add_country_holidays("US", mode="multiplicative")
+        m = m.add_future_regressor("B")
+        history_df = m.create_df_with_events(df, playoffs)
+        start = int(np.flatnonzero(df["ds"] == pd.Timestamp("2008-12-25"))[0])
+        m.fit(history_df.iloc[:start], freq="D")
+        for precision in ["float32", "bfloat16"]:
+            m.set_inference_precision(precision)
+            online = m.make_online_forecaster(history_df.iloc[:start], events_df=playoffs)
+            if precision == "float32":
+                # recompute the event features every few steps
+                online.events_block = 4
+            for k in range(start, start + 12):
+                future_b = df["B"].iloc[k + 1 : k + 4].values
+                dates, yhat = online.update(df["ds"].iloc[k], df["y"].iloc[k], regressors={"B": future_b})
+                latest = m.predict_latest(
+                    history_df.iloc[: k + 1], events_df=playoffs, regressors_df=df[["B"]].iloc[k + 1 : k + 4]
+                )
+                assert (latest["ds"].values == dates).all()
+                assert np.allclose(latest["yhat"].values, yhat, atol=1e-5 if precision == "float32" else 1e-1)
+        self.assertRaises(ValueError, online.update, df["ds"].iloc[start + 12], df["y"].iloc[start + 12])
+
+    def test_global_batched_predict(self):
+        log.info("testing: batched prediction of a list of series")
+        df = pd.read_csv(AIR_FILE)
+        df_list = [df.iloc[:60].copy(), df.iloc[40:144].copy(), df.iloc[80:].copy()]
+        m = NeuralProphet(n_lags=12, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df_list, freq="MS")
+        forecasts = m.predict(df_list)
+        assert len(forecasts) == len(df_list)
+        for df_i, forecast in zip(df_list, forecasts):
+            single = m.predict(df_i)
+            assert (forecast["ds"].values == single["ds"].values).all()
+            for col in ["yhat1", "yhat3", "trend", "ar1"]:
+                assert np.allclose(forecast[col].values.astype(float), single[col].values.astype(float), equal_nan=True)
+        raw = m.predict(df_list, raw=True)
+        assert [len(fcst) for fcst in raw] == [len(df_i) - 12 for df_i in df_list]
+
+    def test_local_normalization(self):
+        log.info("testing: global model with local normalization")
+        df = pd.read_csv(AIR_FILE)
+        df_scaled = df.copy()
+        df_scaled["y"] = df_scaled["y"] * 100.0
+        df_list = [df, df_scaled]
+        m = NeuralProphet(n_lags=12, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        metrics_df = m.fit(df_list, freq="MS", local_modeling=True)
+        assert np.isfinite(metrics_df["MAE"].values).all()
+        assert len(m.data_params["y"].scale) == 2
+        assert np.isclose(m.data_params["y"].scale[1], 100.0 * m.data_params["y"].scale[0])
+        # identical normalized series get identical forecasts, in their own scale
+        forecasts = m.predict(df_list)
+        assert np.allclose(forecasts[1]["yhat1"].values, 100.0 * forecasts[0]["yhat1"].values, equal_nan=True)
+        assert np.allclose(forecasts[1]["trend"].values, 100.0 * forecasts[0]["trend"].values, equal_nan=True)
+        test_metrics = m.test(df_list)
+        assert np.isfinite(test_metrics["MAE"].values).all()
+        self.assertRaises(ValueError, m.predict, df)
+        self.assertRaises(ValueError, m.predict_trend, df)
+        self.assertRaises(ValueError, m.predict, df, series=2)
+        # a single series, by its position among the fitted series
+        single = m.predict(df_scaled, series=1)
+        assert np.allclose(single["yhat1"].values, forecasts[1]["yhat1"].values, equal_nan=True)
+        trend = m.predict_trend(df_scaled, series=1)
+        assert np.allclose(trend["trend"].values[12:], forecasts[1]["trend"].values[12:], rtol=1e-4)
+        components = m.evaluate_trend_and_seasonality(df["ds"].values[12:], series=1)
+        assert np.allclose(components["yearly"], forecasts[1]["season_yearly"].values[12:], rtol=1e-4, atol=1e-2)
+        exported = m.export_numpy(series=1).predict(df_scaled)
+        assert np.allclose(exported["yhat1"].values[12:-2], forecasts[1]["yhat1"].values[12:-2], rtol=1e-4)
+        if self.plot:
+            m.plot_parameters(series=1)
+            plt.show()
+
+    def test_global_num_workers(self):
+        log.info("testing: parallel preparation of a list of series")
+        df = pd.read_csv(AIR_FILE)
+        df_list = [df.iloc[:60].copy(), df.iloc[40:144].copy(), df.iloc[80:].copy()]
+        # gaps to impute
+        df_list[1] = df_list[1].drop(df_list[1].index[[10, 11, 30]])
+        m = NeuralProphet(n_lags=12, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE, num_workers=3)
+        m.fit(df_list, freq="MS")
+        checked_parallel = m._check_dataframe(df_list)
+        handled_parallel = m.handle_missing_data(df_list, freq="MS")
+        normalized_parallel = df_utils.normalize([df.copy() for df in handled_parallel], m.data_params, num_workers=3)
+        forecasts_parallel = m.predict(m.make_future_dataframe(df_list, n_historic_predictions=True))
+        m.num_workers = 1
+        handled = m.handle_missing_data(df_list, freq="MS")
+        for results_parallel, results in [
+            (checked_parallel, m._check_dataframe(df_list)),
+            (handled_parallel, handled),
+            (normalized_parallel, df_utils.normalize([df.copy() for df in handled], m.data_params)),
+            (forecasts_parallel, m.predict(m.make_future_dataframe(df_list, n_historic_predictions=True))),
+        ]:
+            assert len(results_parallel) == len(df_list)
+            for df_parallel, df_i in zip(results_parallel, results):
+                pd.testing.assert_frame_equal(df_parallel, df_i)
+
+    def test_forecast_float_dtypes(self):
+        log.info("testing: forecast columns are float with NaN padding")
+        df = pd.read_csv(AIR_FILE)
+        m = NeuralProphet(n_lags=12, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df, freq="MS")
+        forecast = m.predict(m.make_future_dataframe(df, n_historic_predictions=True))
+        assert all(dtype == np.float64 for dtype in forecast.drop(columns=["ds", "y"]).dtypes)
+        assert np.isnan(forecast["yhat3"].values[: 12 + 2]).all()
+        assert not np.isnan(forecast["yhat3"].values[12 + 2 :]).any()
+        assert np.isnan(forecast["yhat1"].values[-2:]).all()
+        assert forecast["ar1"].notna().sum() == forecast["yhat1"].notna().sum()
+        assert np.isnan(forecast["trend"].values[:12]).all()
+
+    def test_predict_leaves_input(self):
+        log.info("testing: predict does not modify its input")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        m = NeuralProphet(n_lags=7, n_forecasts=3, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.add_lagged_regressor(names="A")
+        m.fit(df, freq="D")
+        df["unused"] = 1.0
+        df_before = df.copy(deep=True)
+        future = m.make_future_dataframe(df, n_historic_predictions=10)
+        assert len(future) == 7 + 10 + 3
+        assert future["y"].dtype == np.float64
+        forecast = m.predict(future)
+        forecast_all = m.predict(df)
+        pd.testing.assert_frame_equal(df, df_before)
+        assert "unused" not in forecast.columns
+        assert forecast_all["ds"].iloc[-1] == pd.Timestamp(df["ds"].iloc[-1])
+
+    def test_predict_cache(self):
+        log.info("testing: predict cache")
+        df = pd.read_csv(AIR_FILE)
+        m = NeuralProphet(n_lags=6, n_forecasts=2, epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m = m.set_predict_cache(max_size=2)
+        m.fit(df, freq="MS")
+        forecast = m.predict(df)
+        assert len(m.predict_cache) == 1
+        forecast["yhat1"] = 0.0
+        cached = m.predict(df.copy())
+        assert len(m.predict_cache) == 1
+        assert not (cached["yhat1"].dropna() == 0.0).any()
+        pd.testing.assert_frame_equal(cached, m.predict(df))
+        m.predict(df, decompose=False)
+        m.predict(df.iloc[:-1])
+        assert len(m.predict_cache) == 2
+        changed = df.copy()
+        changed.loc[changed.index[-1], "y"] += 1.0
+        assert m._predict_cache_key([changed], True, False, [None]) != m._predict_cache_key([df], True, False, [None])
+        m.fit(df, freq="MS")
+        assert len(m.predict_cache) == 0
+        assert not np.allclose(m.predict(df)["yhat1"].dropna(), cached["yhat1"].dropna())
+
+    def test_predict_rollout(self):
+        log.info("testing: recursive rollout beyond n_forecasts")
+        df = pd.read_csv(AIR_FILE)
+        df_list = [df.iloc[:100].copy(), df.iloc[30:].copy()]
+        m = NeuralProphet(n_lags=12, n_forecasts=4, ar_lags=[1, 2, 3, 12], epochs=EPOCHS, batch_size=BATCH_SIZE)
+        m.fit(df_list, freq="MS")
+        rollouts = m.predict_rollout(df_list, horizon=10)
+        assert len(rollouts) == 2
+        for df_i, rollout in zip(df_list, rollouts):
+            assert len(rollout) == 10
+            # each round equals the latest forecast after appending the previous rounds to the history
+            history = df_i.copy()
+            for start in range(0, 10, 4):
+                latest = m.predict_latest(history)
+                n = min(4, 10 - start)
+                assert (rollout["ds"].values[start : start + n] == latest["ds"].values[:n]).all()
+                assert np.allclose(rollout["yhat"].values[start : start + n], latest["yhat"].values[:n], atol=1e-4)
+                history = pd.concat((history, latest.rename(columns={"yhat": "y"})), ignore_index=True)
+        single = m.predict_rollout(df_list[1], horizon=10)
+        assert np.allclose(single["yhat"].values, rollouts[1]["yhat"].values, atol=1e-5)
+        self.assertRaises(ValueError, m.predict_rollout, df_list[0], 0)
+        # missing values of the history are imputed from the history alone
+        gap = df_list[1].copy()
+        gap.loc[gap.index[-2], "y"] = np.nan
+        rollout = m.predict_rollout(gap, horizon=4)
+        assert np.allclose(rollout["yhat"].values, m.predict_latest(gap)["yhat"].values, atol=1e-4)
+        gap.loc[gap.index[-1], "y"] = np.nan
+        self.assertRaises(ValueError, m.predict_rollout, gap, 4)
+
+    def test_evaluate_trend_and_seasonality(self):
+        log.info("testing: direct evaluation of trend and seasonality")
+        df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+        for growth, trend_reg, mode in [
+            ("linear", 0, "additive"),
+            ("linear", 1, "multiplicative"),
+            ("discontinuous", 0, "additive"),
+        ]:
+            m = NeuralProphet(
+                growth=growth,
+                trend_reg=trend_reg,
+                seasonality_mode=mode,
+                n_changepoints=5,
+                epochs=EPOCHS,
+                batch_size=BATCH_SIZE,
+            )
+            m.fit(df, freq="D")
+            forecast = m.predict(df)
+            components = m.evaluate_trend_and_seasonality(forecast["ds"].values)
+            assert list(components.keys()) == ["trend", "weekly"]
+            assert np.allclose(components["trend"], forecast["trend"].values, rtol=1e-4)
+            assert np.allclose(components["weekly"], forecast["season_weekly"].values, rtol=1e-4, atol=1e-4)
+            # unsorted dates, beyond the training data, against the components of the model's forward pass
+            dates = pd.date_range("1990-01-01", "2040-01-01", freq="D")[::-1]
+            components = m.evaluate_trend_and_seasonality(dates)
+            df_dates = df_utils.normalize(pd.DataFrame({"ds": dates}), m.data_params)
+            y_params = m.data_params["y"]
+            with torch.no_grad():
+                t = torch.from_numpy(df_dates["t"].values[None, :]).float()
+                trend = m.model.trend(t)[0].numpy() * y_params.scale + y_params.shift
+                features = time_dataset.seasonal_features_from_dates(df_dates["ds"], m.season_config)
+                weekly = m.model.seasonality(torch.from_numpy(features["weekly"][None, :, :]).float(), "weekly")
+            weekly = weekly[0].numpy() * (y_params.scale if mode == "additive" else 1.0)
+            assert np.allclose(components["trend"], trend, rtol=1e-4, atol=1e-4)
+            assert np.allclose(components["weekly"], weekly, rtol=1e-4, atol=1e-4)
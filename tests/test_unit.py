@@ -13,6 +13,8 @@ from neuralprophet import (
     df_utils,
     time_dataset,
     configure,
+    utils,
+    streaming_stats,
 )
 
 log = logging.getLogger("NP.test")
@@ -95,6 +97,20 @@ class UnitTests(unittest.TestCase):
             )
         )
 
+    def test_time_dataset_ar_lags(self):
+        df = pd.read_csv(AIR_FILE, index_col=False)
+        df = df_utils.check_dataframe(df)
+        data_params = df_utils.init_data_params(df, normalize="minmax")
+        df = df_utils.normalize(df, data_params)
+        ar_lags = utils.lags_to_list([range(1, 4), 12])
+        assert ar_lags == [1, 2, 3, 12]
+        inputs, targets = time_dataset.tabularize_univariate_datetime(df, n_lags=12, n_forecasts=2, ar_lags=ar_lags)
+        full_inputs, full_targets = time_dataset.tabularize_univariate_datetime(df, n_lags=12, n_forecasts=2)
+        assert inputs["lags"].shape == (len(df) - 12 - 1, 4)
+        # lags are ordered from oldest to most recent, like the full window
+        assert np.array_equal(inputs["lags"], full_inputs["lags"][:, [0, 9, 10, 11]])
+        assert np.array_equal(targets, full_targets)
+
     def test_normalize(self):
         for add in [0, -1, 0.00000001, -0.99999999]:
             length = 1000
@@ -115,6 +131,20 @@ class UnitTests(unittest.TestCase):
             )
             df_norm = df_utils.normalize(df, data_params)
 
+    def test_normalize_global(self):
+        df = pd.read_csv(PEYTON_FILE, nrows=480)
+        df["ds"] = pd.to_datetime(df["ds"])
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        df_list = [df.iloc[i * 40 : (i + 1) * 40].reset_index(drop=True) for i in range(12)]
+        m = NeuralProphet(n_lags=3)
+        m = m.add_lagged_regressor(names="A")
+        data_params = df_utils.init_data_params(df_list, normalize="soft", covariates_config=m.config_covar)
+        expected = df_utils._normalization(df.copy(), data_params)
+        df_norm = df_utils.normalize([x.copy() for x in df_list], data_params)
+        assert len(df_norm) == len(df_list)
+        for i, df_episode in enumerate(df_norm):
+            pd.testing.assert_frame_equal(df_episode, expected.iloc[i * 40 : (i + 1) * 40].reset_index(drop=True))
+
     def test_add_lagged_regressors(self):
         NROWS = 512
         EPOCHS = 3
@@ -284,6 +314,23 @@ class UnitTests(unittest.TestCase):
         df = pd.read_csv(YOS_FILE)
         check_split(df_in=df, df_len_expected=len(df) - 12, freq="5min", n_lags=0, n_forecasts=1)
 
+    def test_split_global(self):
+        df = pd.read_csv(PEYTON_FILE, nrows=480)
+        df["ds"] = pd.to_datetime(df["ds"])
+        # overlapping, disjoint and unsorted series
+        df_list = [df.iloc[:200], df.iloc[100:300], df.iloc[400:].sample(frac=1, random_state=0), df.iloc[:50]]
+        for valid_p in [0.1, 0.5]:
+            threshold = df_utils.find_time_threshold(df_list, n_lags=0, valid_p=valid_p, inputs_overbleed=True)
+            ds = np.sort(np.concatenate([df_i["ds"].values for df_i in df_list]))
+            n_train = len(ds) - max(1, int(len(ds) * valid_p))
+            assert threshold == pd.Timestamp(ds[n_train])
+            df_train, df_val = df_utils.split_df(df_list, n_lags=0, n_forecasts=1, valid_p=valid_p)
+            assert all([(df_i["ds"] < threshold).all() for df_i in df_train])
+            assert all([(df_i["ds"] >= threshold).all() for df_i in df_val])
+            # rows of other series at the threshold datestamp are validation data as well
+            assert sum([len(df_i) for df_i in df_train]) == (ds < np.datetime64(threshold)).sum()
+            assert sum([len(df_i) for df_i in df_train + df_val]) == len(ds)
+
     def test_cv(self):
         def check_folds(df, n_lags, n_forecasts, valid_fold_num, valid_fold_pct, fold_overlap_pct):
 
@@ -337,6 +384,65 @@ class UnitTests(unittest.TestCase):
             fold_overlap_pct=0.5,
         )
 
+    def test_cv_indices(self):
+        df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=1000), "y": np.arange(1000)})
+        for n_lags, n_forecasts in [(0, 1), (50, 10)]:
+            folds = df_utils.crossvalidation_split_df(df, n_lags, n_forecasts, k=5, fold_pct=0.1, fold_overlap_pct=0.5)
+            folds_idx = df_utils.crossvalidation_split_indices(
+                len(df), n_lags, n_forecasts, k=5, fold_pct=0.1, fold_overlap_pct=0.5
+            )
+            assert len(folds_idx) == len(folds)
+            for (df_train, df_val), (train_samples, val_samples) in zip(folds, folds_idx):
+                # sample i has its first target in row i + n_lags
+                assert len(train_samples) == len(df_train) - n_lags - n_forecasts + 1
+                assert len(val_samples) == len(df_val) - n_lags - n_forecasts + 1
+                assert df["y"].iloc[train_samples[-1] + n_lags + n_forecasts - 1] == df_train["y"].iloc[-1]
+                assert df["y"].iloc[val_samples[0] + n_lags] == df_val["y"].iloc[n_lags]
+                assert df["y"].iloc[val_samples[-1] + n_lags + n_forecasts - 1] == df_val["y"].iloc[-1]
+
+    def test_rescaled_subset(self):
+        df = pd.read_csv(PEYTON_FILE, nrows=512)
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        df["B"] = df["y"].rolling(30, min_periods=1).mean()
+        df["C"] = df["y"].rolling(3, min_periods=1).mean()
+        m = NeuralProphet(n_lags=5, n_forecasts=3)
+        m = m.add_lagged_regressor(names="C")
+        m = m.add_future_regressor(name="A")
+        m = m.add_future_regressor(name="B", mode="multiplicative")
+        df = df_utils.check_dataframe(df, covariates=["C"], regressors=["A", "B"])
+
+        def init_data_params(df):
+            return df_utils.init_data_params(
+                df, normalize="auto", covariates_config=m.config_covar, regressor_config=m.regressors_config
+            )
+
+        def make_dataset(data_params):
+            return time_dataset.TimeDataset(
+                df_utils.normalize(df.copy(), data_params),
+                n_lags=5,
+                n_forecasts=3,
+                covar_config=m.config_covar,
+                regressors_config=m.regressors_config,
+            )
+
+        # scaling values of the whole series and of the training rows of a fold
+        data_params, fold_data_params = init_data_params(df), init_data_params(df.iloc[:200])
+        samples = np.arange(150, 160)
+        rescaled = time_dataset.RescaledSubset(
+            make_dataset(data_params), samples, data_params, fold_data_params, m.regressors_config
+        )
+        expected = make_dataset(fold_data_params)
+        assert len(rescaled) == len(samples)
+        for i, sample in enumerate(samples):
+            inputs, targets = rescaled[i]
+            expected_inputs, expected_targets = expected[sample]
+            assert np.allclose(targets.numpy(), expected_targets.numpy(), atol=1e-5)
+            for key in ["time", "lags"]:
+                assert np.allclose(inputs[key].numpy(), expected_inputs[key].numpy(), atol=1e-5)
+            for key in ["covariates", "regressors"]:
+                for name, values in inputs[key].items():
+                    assert np.allclose(values.numpy(), expected_inputs[key][name].numpy(), atol=1e-5)
+
     def test_reg_delay(self):
         df = pd.read_csv(PEYTON_FILE, nrows=102)[:100]
         m = NeuralProphet(epochs=10)
@@ -404,3 +510,112 @@ class UnitTests(unittest.TestCase):
             ar_sparsity=0.5,
         )
         self.assertRaises(ValueError, m.fit, df, "D")
+
+    def test_check_dataframe(self):
+        df = pd.read_csv(PEYTON_FILE, nrows=100)
+        df["A"] = df["y"].astype(str)
+        df.loc[3, "y"] = np.inf
+        checked = df_utils.check_dataframe(df.copy(), check_y=True, covariates=["A"])
+        assert checked["A"].dtype == np.float64
+        assert np.isnan(checked.loc[3, "y"])
+        assert checked is not df
+        # unsorted dates are sorted, sorted dates are left as they are
+        shuffled = df_utils.check_dataframe(df.sample(frac=1.0, random_state=0), check_y=True, covariates=["A"])
+        pd.testing.assert_frame_equal(shuffled, checked)
+        assert (checked.index == np.arange(len(df))).all()
+        duplicated = pd.concat([df, df[8:9]])
+        self.assertRaises(ValueError, df_utils.check_dataframe, duplicated)
+        df["B"] = np.inf
+        self.assertRaises(ValueError, df_utils.check_dataframe, df, True, ["B"])
+
+    def test_impute_linear_then_rolling_avg(self):
+        rng = np.random.default_rng(0)
+        values = np.cumsum(rng.standard_normal((400, 6)), axis=0)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        values[100:130, 1] = np.nan
+        values[:20, 2] = np.nan
+        values[-15:, 3] = np.nan
+        values[:, 4] = np.nan
+        filled, remaining_na = df_utils.impute_linear_then_rolling_avg(values, limit_linear=5, rolling=20)
+        for i in range(values.shape[1]):
+            expected = pd.Series(values[:, i]).interpolate(method="linear", limit=5, limit_direction="both")
+            expected = expected.fillna(expected.rolling(30, min_periods=10, center=True).mean())
+            np.testing.assert_allclose(filled[:, i], expected.values, rtol=1e-12, atol=1e-12)
+            assert remaining_na[i] == expected.isnull().sum()
+        assert remaining_na[4] == len(values)
+        np.testing.assert_array_equal(df_utils.count_nan_at_end(values[:, 2:5]), [0, 15, 400])
+
+    def test_join_recover_dataframes(self):
+        df = pd.read_csv(PEYTON_FILE, nrows=480)
+        df_list = [df.iloc[i * 40 : (i + 1) * 40 - i] for i in range(12)]
+        df_joined, episodes = df_utils.join_dataframes(df_list)
+        assert len(df_joined) == sum(len(x) for x in df_list)
+        assert episodes[0] == 0 and episodes[-1] == len(df_joined)
+        recovered = df_utils.recover_dataframes(df_joined, episodes)
+        assert len(recovered) == len(df_list)
+        for original, df_rec in zip(df_list, recovered):
+            pd.testing.assert_frame_equal(df_rec, original)
+
+    def test_streaming_data_params(self):
+        df = pd.read_csv(PEYTON_FILE)
+        df["ds"] = pd.to_datetime(df["ds"])
+        df["A"] = df["y"].rolling(7, min_periods=1).mean()
+        m = NeuralProphet(n_lags=3)
+        m = m.add_lagged_regressor(names="A")
+        chunks = [df.iloc[i : i + 500] for i in range(0, len(df), 500)]
+        for normalize in ["soft", "soft1", "minmax", "standardize"]:
+            exact = df_utils.init_data_params(df.copy(), normalize=normalize, covariates_config=m.config_covar)
+            streamed = df_utils.init_data_params(iter(chunks), normalize=normalize, covariates_config=m.config_covar)
+            assert list(streamed.keys()) == list(exact.keys())
+            assert streamed["ds"] == exact["ds"]
+            for name in ["y", "A"]:
+                assert math.isclose(streamed[name].shift, exact[name].shift, rel_tol=1e-9)
+                # quantiles are approximate beyond the capacity of the sketch
+                assert math.isclose(streamed[name].scale, exact[name].scale, rel_tol=1e-2)
+        # exact quantile as long as the sketch did not compact
+        values = np.random.RandomState(0).lognormal(size=1000)
+        stats = streaming_stats.StreamingStats()
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+        assert stats.quantile(0.95) == np.quantile(values, 0.95, interpolation="higher")
+        assert math.isclose(stats.std(), np.std(values))
+        # rank error of the sketch stays within its documented bound
+        values = np.random.RandomState(1).standard_normal(200000)
+        sketch = streaming_stats.QuantileSketch()
+        for chunk in np.array_split(values, 13):
+            sketch.update(chunk)
+        for q in [0.1, 0.5, 0.9, 0.95]:
+            rank = np.sum(values < sketch.quantile(q))
+            assert abs(rank - q * len(values)) <= 0.002 * len(values)
+
+    def test_data_params_wide(self):
+        length = 1000
+        rng = np.random.RandomState(0)
+        df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=length), "y": rng.lognormal(size=length)})
+        m = NeuralProphet()
+        for i in range(30):
+            name = "reg_{}".format(i)
+            if i % 3 == 0:
+                df[name] = (rng.rand(length) > 0.5).astype(float) * (i + 1)
+            else:
+                df[name] = rng.standard_normal(length) * (i + 1)
+            m = m.add_future_regressor(name=name, normalize="standardize" if i % 5 == 1 else "auto")
+        df.loc[0, "reg_3"] = 0.5  # not binary, detected within the first rows
+        # not binary, only detectable beyond the first rows, and with its 95th quantile below the maximum
+        df["reg_9"] = 0.0
+        df.loc[:9, "reg_9"] = 10.0
+        df.loc[500:599, "reg_9"] = 0.5
+        data_params = df_utils.init_data_params(df, normalize="soft", regressor_config=m.regressors_config)
+        assert list(data_params.keys()) == ["ds", "y"] + list(m.regressors_config.keys())
+        for name, params in data_params.items():
+            if name == "ds":
+                continue
+            values = df[name].values
+            if name != "y" and m.regressors_config[name].normalize == "standardize":
+                expected = (np.mean(values), np.std(values))
+            elif len(np.unique(values)) == 2:
+                expected = (np.min(values), np.max(values) - np.min(values))
+            else:
+                expected = (np.min(values), np.quantile(values, 0.95, interpolation="higher") - np.min(values))
+            assert (params.shift, params.scale) == expected, name
+        assert df["reg_9"].iloc[500] == 0.5  # input is left as is